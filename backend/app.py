@@ -2,9 +2,11 @@ from flask import Flask, send_from_directory
 from flask_cors import CORS
 from dotenv import load_dotenv
 import os
-from spotipy.oauth2 import SpotifyClientCredentials
-import spotipy
-from flask_cors import CORS
+
+# 서비스 모듈이 import 시점에 환경변수를 읽으므로 Blueprint import 전에 로드
+load_dotenv()
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+load_dotenv(os.path.join(BASE_DIR, ".env"))
 
 from routes.auth import auth_bp
 from routes.notice import notice_bp
@@ -12,12 +14,21 @@ from routes.user import user_bp
 from routes.playlist import playlist_bp          
 from routes.music_list import music_list_bp   
 from routes.music import music_bp   
+from services import import_job as import_job_service
+from services import spotify_client
+from services import music as music_service
+from services import enrichment as enrichment_service
+from services import top50 as top50_service
+from services import gateway
+from services import track_filter
+from services import catalog_index
+from services import catalog_search
+from services import fuzzy_index
+from services import hangul_index
+from services import suggest_index
+from model import catalog_cache
 
 
-load_dotenv()
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-load_dotenv(os.path.join(BASE_DIR, ".env"))
-
 app = Flask(__name__)
 CORS(app, resources={
     r"/*": {
@@ -36,12 +47,14 @@ app.register_blueprint(playlist_bp)
 app.register_blueprint(music_list_bp) 
 app.register_blueprint(music_bp)
 
-# Spotify 인증
-client_credentials_manager = SpotifyClientCredentials(
-    client_id=os.getenv('SPOTIFY_CLIENT_ID'),
-    client_secret=os.getenv('SPOTIFY_CLIENT_SECRET')
-)
-sp = spotipy.Spotify(client_credentials_manager=client_credentials_manager)
+# 중단된 bulk import 작업 / 남은 지연 보강 재개, Top 50 스냅샷 스케줄러, 트랙 필터 / 로컬 검색 색인 warm-up
+import_job_service.start_job_runner()
+enrichment_service.start_pending_poller()
+top50_service.start_scheduler()
+track_filter.start_warm_up()
+catalog_index.register(catalog_search, fuzzy_index, hangul_index, suggest_index)
+if catalog_index.CATALOG_INDEX_WARM_UP == "eager":
+    catalog_index.start_warm_up()  # 기본(lazy)은 첫 로컬 검색 / 자동완성 요청 때 시작
 
 # 기본 라우트
 @app.route('/')
@@ -90,7 +103,16 @@ def health():
             return {
                 'status': 'healthy',
                 'database': 'connected',
-                'spotify': sp is not None,
+                'spotify': spotify_client.get_stats(),
+                'search_cache': music_service.SEARCH_CACHE.stats(),
+                'catalog_cache': catalog_cache.stats(),
+                'gateways': gateway.get_state(),
+                'track_filter': track_filter.stats(),
+                'catalog_index': catalog_index.stats(),
+                'catalog_search': catalog_search.stats(),
+                'fuzzy_index': fuzzy_index.stats(),
+                'hangul_index': hangul_index.stats(),
+                'suggest_index': suggest_index.stats(),
                 'version': version['VERSION()']
             }, 200
         except Exception as e:
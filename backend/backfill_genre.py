@@ -0,0 +1,23 @@
+# backfill_genre.py - genre_no가 NULL인 music 행을 장르 분류 규칙으로 채우기
+# 실행: python backfill_genre.py
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from services import genre as genre_service
+from services import spotify_client
+
+
+def main():
+    print("🏷️  장르 backfill 시작...")
+    print("=" * 50)
+
+    sp = spotify_client.get_client()
+    stats = genre_service.backfill_missing_genres(sp)
+
+    print("\n" + "=" * 50)
+    print(f"🎉 완료! {stats['scanned']}곡 중 {stats['updated']}곡 장르 지정")
+
+
+if __name__ == "__main__":
+    main()
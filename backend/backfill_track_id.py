@@ -0,0 +1,42 @@
+# backfill_track_id.py - spotify_track_id가 NULL인 music 행을 spotify_url에서 추출해 채우기
+# 실행: python backfill_track_id.py
+# (python migrate.py 로 uq_music_spotify_track_id 인덱스를 만든 뒤 한 번 실행)
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from model import music as music_model
+from services import spotify_client
+
+
+def main(batch_size=1000):
+    print("🔑 spotify_track_id backfill 시작...")
+    print("=" * 50)
+
+    scanned = updated = skipped = 0
+    after_music_no = 0
+    while True:
+        rows = music_model.find_missing_track_id(after_music_no, batch_size)
+        if not rows:
+            break
+        after_music_no = rows[-1]['music_no']
+        scanned += len(rows)
+
+        updates = []
+        for row in rows:
+            track_id = spotify_client.track_id_from_url(row['spotify_url'])
+            if track_id:
+                updates.append((row['music_no'], track_id))
+            else:
+                skipped += 1
+        updated += music_model.update_track_id_many(updates)
+        print(f"  ✅ {updated}/{scanned}곡")
+
+    print("\n" + "=" * 50)
+    print(f"🎉 완료! {scanned}곡 중 {updated}곡 track id 저장 (URL 형식 오류 {skipped}곡)")
+    if scanned - updated - skipped:
+        print(f"  ⚠️  {scanned - updated - skipped}곡은 같은 track id 행이 이미 있어 건너뜀")
+
+
+if __name__ == "__main__":
+    main()
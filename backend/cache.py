@@ -0,0 +1,81 @@
+# backend/cache.py
+"""
+프로세스 내 LRU + TTL 캐시 (thread-safe, model / services 공용)
+- maxsize 초과 시 가장 오래 사용하지 않은 항목부터 제거
+- ttl 이내: fresh / ttl ~ ttl + stale_ttl: stale (stale-while-revalidate 용)
+- 만료된 항목도 제거되기 전까지 peek()으로 꺼낼 수 있음 (upstream 장애 시 fallback)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    def __init__(self, maxsize, ttl, stale_ttl=0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key, record=True):
+        """
+        반환: (value, is_fresh) / 없거나 stale 구간도 지났으면 (None, False)
+        record=False: 통계/LRU 순서에 반영하지 않음 (쓰기 전 확인용)
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                if record:
+                    self._stats["misses"] += 1
+                return None, False
+
+            value, stored_at = entry
+            age = time.monotonic() - stored_at
+            if age <= self.ttl:
+                if record:
+                    self._data.move_to_end(key)
+                    self._stats["hits"] += 1
+                return value, True
+            if age <= self.ttl + self.stale_ttl:
+                if record:
+                    self._data.move_to_end(key)
+                    self._stats["stale_hits"] += 1
+                return value, False
+
+            if record:
+                self._stats["misses"] += 1
+            return None, False
+
+    def peek(self, key):
+        """만료 여부와 관계없이 남아 있는 값 (통계에 반영하지 않음)"""
+        with self._lock:
+            entry = self._data.get(key)
+            return entry[0] if entry else None
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._data)
+            stats["maxsize"] = self.maxsize
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["hits"] + stats["stale_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
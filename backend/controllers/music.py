@@ -1,5 +1,10 @@
-from flask import request, jsonify
+import json
+
+from flask import Response, request, jsonify, stream_with_context
 from services import music as music_service
+from services import import_job as import_job_service
+from services import enrichment as enrichment_service
+from services import top50 as top50_service
 
 
 def search_music():
@@ -8,13 +13,29 @@ def search_music():
 
     page = int(request.args.get('page', 1))
     size = int(request.args.get('size', 12))
+    # defer=true: preview/장르 보강 없이 바로 응답 (/music/enrichment 로 폴링)
+    defer = request.args.get('defer', '').lower() in ('1', 'true')
 
     if not keyword:
         return jsonify({"success": False, "message": "검색어(q)가 필요합니다."}), 400
 
-    musics, total, error = music_service.search_and_save_music(
-        keyword, category, page, size
-    )
+    # fields=card(기본) / detail / 쉼표로 구분한 컬럼 이름
+    columns, error = music_service.resolve_fields(request.args.get('fields'))
+    if error:
+        return jsonify({"success": False, "message": error}), 400
+
+    # mode=local: 저장된 카탈로그에서 먼저 검색 (→ 오타 허용 검색), 결과가 적으면 Spotify 검색
+    if request.args.get('mode') == 'local':
+        # source: 이전 페이지 응답의 source (다음 페이지도 같은 출처에서 조회)
+        musics, total, source, error = music_service.search_local_first(
+            keyword, category, page, size, defer_enrichment=defer, columns=columns,
+            source=request.args.get('source')
+        )
+    else:
+        musics, total, error = music_service.search_and_save_music(
+            keyword, category, page, size, defer_enrichment=defer, columns=columns
+        )
+        source = "spotify"
     if error:
         return jsonify({"success": False, "message": error}), 500
 
@@ -23,52 +44,200 @@ def search_music():
         "data": musics,
         "page": page,
         "size": size,
-        "total": total
+        "total": total,
+        "source": source
     }), 200
 
 
+def suggest_music():
+    keyword = request.args.get('q')
+    category = request.args.get('category')
+    limit = request.args.get('limit', 10, type=int)
+
+    suggestions, error = music_service.suggest_music(keyword, category, limit)
+    if error:
+        return jsonify({"success": False, "message": error}), 400
+
+    return jsonify({"success": True, "data": suggestions}), 200
+
+
 def get_music_list():
     category = request.args.get('category')
     value = request.args.get('value')
 
-    musics, error = music_service.get_music_list(category, value)
+    # keyset 페이지: 응답의 next_cursor를 다음 요청의 cursor로 전달 (null이면 마지막 페이지)
+    cursor = request.args.get('cursor')
+    size = request.args.get('size', type=int)
+    with_total = request.args.get('count', '').lower() in ('1', 'true')
+
+    # fields=card(기본) / detail / 쉼표로 구분한 컬럼 이름
+    columns, error = music_service.resolve_fields(request.args.get('fields'))
+    if error:
+        return jsonify({"success": False, "message": error}), 400
+
+    page, error = music_service.get_music_list(category, value, cursor, size, with_total, columns)
     if error:
         return jsonify({"success": False, "message": error}), 400
 
-    return jsonify({"success": True, "data": musics}), 200
+    body = {
+        "success": True,
+        "data": page["items"],
+        "size": page["size"],
+        "next_cursor": page["next_cursor"]
+    }
+    if with_total:
+        body["total"] = page["total"]
+        body["total_approx"] = page["total_approx"]
+    return jsonify(body), 200
 
 
-def get_global_top_50():
-    musics, error = music_service.get_global_top_50()
+def get_genres():
+    top = request.args.get('top', 0, type=int)
+    columns, error = music_service.resolve_fields(request.args.get('fields'))
+    if error:
+        return jsonify({"success": False, "message": error}), 400
+
+    genres, error = music_service.get_genre_facets(top, columns)
     if error:
         return jsonify({"success": False, "message": error}), 500
 
-    new_count = sum(1 for m in musics if m.get('is_new'))
-    
-    return jsonify({
+    return jsonify({"success": True, "data": genres}), 200
+
+
+def _snapshot_response(snapshot, musics):
+    resp = jsonify({
         "success": True,
-        "message": f"총 {len(musics)}곡 (신규 {new_count}곡 저장)",
+        "message": f"총 {len(musics)}곡",
+        "snapshot": snapshot,
         "data": musics
-    }), 200
+    })
+    resp.set_etag(snapshot['etag'])
+    return resp.make_conditional(request)
+
+
+def get_global_top_50():
+    """저장된 최신 Top 50 스냅샷 (If-None-Match 일치 시 304)"""
+    snapshot, musics, error = top50_service.get_latest()
+    if error:
+        # 시작 직후 갱신이 기다린 시간보다 오래 걸림 → 잠시 후 다시 요청
+        status = 503 if error == top50_service.TOP50_NOT_READY else 500
+        return jsonify({"success": False, "message": error}), status
+
+    return _snapshot_response(snapshot, musics)
+
+
+def get_top50_snapshots():
+    try:
+        limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+        offset = max(int(request.args.get('offset', 0)), 0)
+    except ValueError:
+        return jsonify({"success": False, "message": "limit / offset은 숫자여야 합니다."}), 400
+
+    snapshots, error = top50_service.list_snapshots(limit, offset)
+    if error:
+        return jsonify({"success": False, "message": error}), 500
+
+    return jsonify({"success": True, "data": snapshots}), 200
+
+
+def get_top50_snapshot(snapshot_no):
+    snapshot, musics, error = top50_service.get_snapshot(snapshot_no)
+    if error:
+        status = 404 if error == "존재하지 않는 스냅샷" else 500
+        return jsonify({"success": False, "message": error}), status
+
+    return _snapshot_response(snapshot, musics)
     
+STREAM_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+
+def _stream_events(events, fmt):
+    """이벤트 generator → NDJSON 줄 / SSE 이벤트로 바로 흘려보냄"""
+    for event in events:
+        payload = json.dumps(event, ensure_ascii=False, default=str)
+        if fmt == "sse":
+            yield f"event: {event['type']}\ndata: {payload}\n\n"
+        else:
+            yield payload + "\n"
+
+
 def bulk_import():
-    data = request.get_json()
+    """
+    bulk import 작업 등록 → job_no 즉시 반환 (진행 상황은 /music/import-jobs/<job_no>)
+    ?stream=ndjson | sse: 작업 등록 대신 이 요청에서 바로 실행하며 곡/진행 상황을 스트리밍
+    """
+    data = request.get_json(silent=True) or {}
     query = data.get('query', 'kpop')
     count = data.get('count', 100)
+    stream = request.args.get('stream')
     
     if count > 200:
         return jsonify({"success": False, "message": "최대 200개까지 가능합니다."}), 400
     
-    musics, error = music_service.bulk_import_music(query, count)
+    if stream:
+        if stream not in STREAM_FORMATS:
+            return jsonify({"success": False, "message": "stream은 ndjson 또는 sse만 가능합니다."}), 400
+        events = music_service.iter_bulk_import_events(query, count)
+        return Response(
+            stream_with_context(_stream_events(events, stream)),
+            mimetype=STREAM_FORMATS[stream],
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    
+    job_no, error = import_job_service.create_bulk_import_job(query, count)
     if error:
         return jsonify({"success": False, "message": error}), 500
     
-    new_count = sum(1 for m in musics if m.get('is_new'))
-    
     return jsonify({
         "success": True,
-        "message": f"총 {len(musics)}곡 가져옴 (신규 {new_count}곡 저장)",
-        "data": musics
+        "message": "bulk import 작업이 등록되었습니다.",
+        "data": {
+            "job_no": job_no,
+            "status": "queued",
+            "status_url": f"/music/import-jobs/{job_no}"
+        }
+    }), 202
+
+
+def get_import_job(job_no):
+    job, error = import_job_service.get_job(job_no)
+    if error:
+        status = 404 if error == "존재하지 않는 작업" else 500
+        return jsonify({"success": False, "message": error}), status
+
+    return jsonify({"success": True, "data": job}), 200
+
+
+def retry_import_job(job_no):
+    success, message = import_job_service.retry_job(job_no)
+    if not success:
+        return jsonify({"success": False, "message": message}), 400
+
+    return jsonify({"success": True, "message": message}), 202
+
+
+def get_enrichment():
+    """지연 보강된 preview_url / genre_no 조회 (?music_nos=1,2,3)"""
+    raw = request.args.get('music_nos', '')
+    try:
+        music_nos = [int(no) for no in raw.split(',') if no.strip()]
+    except ValueError:
+        return jsonify({"success": False, "message": "music_nos는 쉼표로 구분된 숫자여야 합니다."}), 400
+
+    if not music_nos:
+        return jsonify({"success": False, "message": "music_nos 파라미터가 필요합니다."}), 400
+
+    rows, error = enrichment_service.get_enrichment(music_nos)
+    if error:
+        return jsonify({"success": False, "message": error}), 400
+
+    return jsonify({
+        "success": True,
+        "data": rows,
+        "pending": [r['music_no'] for r in rows if not r['is_enriched']]
     }), 200
 
 
@@ -1,5 +1,6 @@
 import pymysql
 import os
+from contextlib import contextmanager
 from dotenv import load_dotenv
 from dbutils.pooled_db import PooledDB
 
@@ -41,6 +42,39 @@ def get_connection():
     return DatabaseManager.get_connection()
 
 
+# 트랜잭션 전체를 다시 실행하면 되는 오류 (1213 deadlock, 1205 lock wait timeout)
+RETRYABLE_ERRORS = (1213, 1205)
+TRANSACTION_RETRIES = int(os.getenv("DB_TRANSACTION_RETRIES", 3))
+
+
+def is_retryable(e):
+    """deadlock / lock wait timeout → 롤백 후 트랜잭션 재시도 가능"""
+    return isinstance(e, pymysql.err.OperationalError) and bool(e.args) and e.args[0] in RETRYABLE_ERRORS
+
+
+@contextmanager
+def named_lock(name, timeout=0):
+    """
+    MySQL GET_LOCK 기반 분산 잠금 (여러 worker/노드 중 하나만 실행)
+    - with named_lock("이름") as acquired: ...
+    - Pool 연결이 잠금을 쥔 채 반환되지 않도록 블록 종료 시 RELEASE_LOCK
+    """
+    conn = get_connection()
+    acquired = False
+    try:
+        with conn.cursor() as c:
+            c.execute("SELECT GET_LOCK(%s, %s) AS acquired", (name, timeout))
+            acquired = (c.fetchone() or {}).get('acquired') == 1
+        yield acquired
+    finally:
+        try:
+            if acquired:
+                with conn.cursor() as c:
+                    c.execute("SELECT RELEASE_LOCK(%s)", (name,))
+        finally:
+            conn.close()
+
+
 # 기존 호환성 유지용 함수 (deprecated)
 def connect_to_mysql(host, port, user, password, database):
     """
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+Spotify Web API / Deezer 검색 API 로컬 대역 서버 (부하 테스트·벤치마크용)
+실행: python fake_upstream.py --port 5055 --latency-ms 80 --error-rate 0.01 --rate-429 0.02
+
+백엔드를 이 서버로 연결 (.env):
+    SPOTIFY_API_BASE=http://localhost:5055/v1/
+    SPOTIFY_TOKEN_URL=http://localhost:5055/api/token
+    DEEZER_API_BASE=http://localhost:5055/deezer
+    SPOTIFY_CLIENT_ID=fake
+    SPOTIFY_CLIENT_SECRET=fake
+
+- 응답은 요청 값(query/offset/id)으로 시드한 합성 데이터 → 같은 요청은 항상 같은 결과
+- --fixtures 로 녹화한 응답(JSON)을 지정하면 일치하는 요청은 녹화본으로 응답
+  형식: {"GET /v1/search?limit=12&market=KR&offset=0&q=kpop&type=track": {...응답 본문...}}
+- 지연(--latency-ms, --jitter-ms), 500 오류율(--error-rate), 429 비율(--rate-429, Retry-After 포함) 조절 가능
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import string
+import threading
+import time
+
+from flask import Flask, jsonify, request
+
+app = Flask(__name__)
+
+CONFIG = {
+    "latency_ms": int(os.getenv("FAKE_LATENCY_MS", 0)),
+    "jitter_ms": int(os.getenv("FAKE_JITTER_MS", 0)),
+    "error_rate": float(os.getenv("FAKE_ERROR_RATE", 0)),
+    "rate_429": float(os.getenv("FAKE_RATE_429", 0)),
+    "retry_after": int(os.getenv("FAKE_RETRY_AFTER", 1)),
+    "search_total": int(os.getenv("FAKE_SEARCH_TOTAL", 1000)),
+    "preview_miss_rate": float(os.getenv("FAKE_PREVIEW_MISS_RATE", 0.2)),
+}
+FIXTURES = {}
+
+GENRE_POOL = [
+    "k-pop", "korean pop", "dance pop", "pop", "hip hop", "korean r&b", "r&b",
+    "jazz", "edm", "modern rock", "rock", "metal", "indie", "k-indie", "lo-fi",
+]
+BASE62 = string.digits + string.ascii_letters
+
+_stats = {"requests": 0, "errors_500": 0, "errors_429": 0}
+_stats_lock = threading.Lock()
+
+
+def _rng(*parts):
+    seed = hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return random.Random(int(seed[:16], 16))
+
+
+def _base62_id(*parts):
+    rng = _rng("id", *parts)
+    return "".join(rng.choice(BASE62) for _ in range(22))
+
+
+def _fixture_key():
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.args.items()))
+    return f"{request.method} {request.path}" + (f"?{query}" if query else "")
+
+
+@app.before_request
+def inject_faults():
+    """지연 / 429 / 500 주입 후, 녹화본이 있으면 그대로 응답"""
+    with _stats_lock:
+        _stats["requests"] += 1
+
+    if request.path == "/_stats":
+        return None
+
+    delay = CONFIG["latency_ms"] + random.uniform(0, CONFIG["jitter_ms"])
+    if delay:
+        time.sleep(delay / 1000)
+
+    roll = random.random()
+    if roll < CONFIG["rate_429"]:
+        with _stats_lock:
+            _stats["errors_429"] += 1
+        resp = jsonify({"error": {"status": 429, "message": "API rate limit exceeded"}})
+        resp.status_code = 429
+        resp.headers["Retry-After"] = str(CONFIG["retry_after"])
+        return resp
+    if roll < CONFIG["rate_429"] + CONFIG["error_rate"]:
+        with _stats_lock:
+            _stats["errors_500"] += 1
+        return jsonify({"error": {"status": 500, "message": "fake upstream error"}}), 500
+
+    fixture = FIXTURES.get(_fixture_key())
+    if fixture is not None:
+        return jsonify(fixture)
+    return None
+
+
+# ---------- Spotify ----------
+
+def _artist(artist_id):
+    rng = _rng("artist", artist_id)
+    return {
+        "id": artist_id,
+        "name": f"Artist {artist_id[:6]}",
+        "genres": rng.sample(GENRE_POOL, rng.randint(0, 3)),
+        "popularity": rng.randint(10, 100),
+        "type": "artist",
+    }
+
+
+def _track(*seed):
+    rng = _rng("track", *seed)
+    track_id = _base62_id("track", *seed)
+    # 아티스트 수를 제한해 캐시 적중률이 실제와 비슷하게 나오도록 함
+    artist_id = _base62_id("artist", rng.randint(0, 300))
+    album_id = _base62_id("album", track_id)
+    return {
+        "id": track_id,
+        "name": f"Track {track_id[:8]}",
+        "duration_ms": rng.randint(120000, 300000),
+        "popularity": rng.randint(0, 100),
+        "external_urls": {"spotify": f"https://open.spotify.com/track/{track_id}"},
+        "artists": [{"id": artist_id, "name": f"Artist {artist_id[:6]}", "type": "artist"}],
+        "album": {
+            "id": album_id,
+            "name": f"Album {album_id[:6]}",
+            "release_date": f"20{rng.randint(10, 25)}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}",
+            "images": [{"url": f"https://i.scdn.co/image/{album_id}", "height": 640, "width": 640}],
+        },
+        "type": "track",
+    }
+
+
+@app.route("/api/token", methods=["POST"])
+def token():
+    return jsonify({"access_token": "fake-token", "token_type": "Bearer", "expires_in": 3600})
+
+
+@app.route("/v1/search", methods=["GET"])
+def search():
+    q = request.args.get("q", "")
+    limit = min(int(request.args.get("limit", 10)), 50)
+    offset = int(request.args.get("offset", 0))
+    total = CONFIG["search_total"]
+    items = [_track(q.lower(), i) for i in range(offset, min(offset + limit, total))]
+    return jsonify({"tracks": {
+        "items": items, "total": total, "limit": limit, "offset": offset,
+    }})
+
+
+@app.route("/v1/artists", methods=["GET"], strict_slashes=False)
+def artists():
+    ids = [i for i in request.args.get("ids", "").split(",") if i]
+    return jsonify({"artists": [_artist(i) for i in ids[:50]]})
+
+
+@app.route("/v1/artists/<artist_id>", methods=["GET"])
+def artist(artist_id):
+    return jsonify(_artist(artist_id))
+
+
+@app.route("/v1/playlists/<playlist_id>/tracks", methods=["GET"])
+def playlist_tracks(playlist_id):
+    limit = min(int(request.args.get("limit", 100)), 100)
+    # 날짜가 바뀌면 순위가 바뀌도록 날짜를 시드에 포함
+    day = time.strftime("%Y-%m-%d")
+    rng = _rng("playlist", playlist_id, day)
+    order = rng.sample(range(200), 50)[:limit]
+    return jsonify({"items": [{"track": _track("chart", i)} for i in order], "total": len(order)})
+
+
+# ---------- Deezer ----------
+
+@app.route("/deezer/search", methods=["GET"])
+def deezer_search():
+    q = request.args.get("q", "")
+    rng = _rng("deezer", q.lower())
+    if rng.random() < CONFIG["preview_miss_rate"]:
+        return jsonify({"data": [], "total": 0})
+
+    track_id = rng.randint(10 ** 8, 10 ** 9)
+    exp = int(time.time()) + 60 * 60 * 24
+    preview = (
+        f"https://cdnt-preview.dzcdn.net/api/1/1/fake/{track_id}.mp3"
+        f"?hdnea=exp={exp}~acl=/api/1/1/fake/{track_id}.mp3*~hmac=fake"
+    )
+    return jsonify({"data": [{"id": track_id, "title": q, "preview": preview}], "total": 1})
+
+
+@app.route("/_stats", methods=["GET"])
+def stats():
+    with _stats_lock:
+        return jsonify({**_stats, "config": CONFIG})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spotify/Deezer fake upstream server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--latency-ms", type=int, default=CONFIG["latency_ms"])
+    parser.add_argument("--jitter-ms", type=int, default=CONFIG["jitter_ms"])
+    parser.add_argument("--error-rate", type=float, default=CONFIG["error_rate"])
+    parser.add_argument("--rate-429", type=float, default=CONFIG["rate_429"])
+    parser.add_argument("--retry-after", type=int, default=CONFIG["retry_after"])
+    parser.add_argument("--search-total", type=int, default=CONFIG["search_total"])
+    parser.add_argument("--preview-miss-rate", type=float, default=CONFIG["preview_miss_rate"])
+    parser.add_argument("--fixtures", help="녹화 응답 JSON 파일 경로")
+    args = parser.parse_args()
+
+    for key in CONFIG:
+        CONFIG[key] = getattr(args, key)
+    if args.fixtures:
+        with open(args.fixtures, encoding="utf-8") as f:
+            FIXTURES.update(json.load(f))
+
+    print(f"🧪 fake upstream: http://{args.host}:{args.port} ({len(FIXTURES)} fixtures)")
+    print(f"   SPOTIFY_API_BASE=http://{args.host}:{args.port}/v1/")
+    print(f"   SPOTIFY_TOKEN_URL=http://{args.host}:{args.port}/api/token")
+    print(f"   DEEZER_API_BASE=http://{args.host}:{args.port}/deezer")
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
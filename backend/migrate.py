@@ -0,0 +1,356 @@
+# backend/migrate.py
+"""
+버전 관리 스키마 마이그레이션
+실행:
+    python migrate.py            # 적용 안 된 마이그레이션 순서대로 적용
+    python migrate.py status     # 버전별 적용 여부
+    python migrate.py explain    # 모델 주요 쿼리 EXPLAIN → full scan / filesort 표시
+
+- 적용한 버전은 schema_migrations 테이블에 기록 → 한 번 적용된 버전은 다시 실행하지 않음
+- 인덱스 추가는 ALGORITHM=INPLACE, LOCK=NONE (테이블 잠금 없이 온라인으로 생성)
+- 이미 있는 컬럼/인덱스 오류는 무시 (예전 setup_railway_db.py로 일부 적용된 DB 호환)
+- 새 테이블은 CREATE TABLE IF NOT EXISTS로 자기 버전에서 생성 (setup_railway_db.py SCHEMA에는 기본 테이블만)
+- DDL은 암묵적으로 commit되어 롤백할 수 없음 → 모든 SQL은 다시 실행해도 같은 결과가 되게 작성
+  (실패하면 원인을 고친 뒤 다시 실행 → 기록되지 않은 버전을 처음부터 다시 적용)
+- 새 스키마 변경은 MIGRATIONS 끝에 다음 버전으로 추가
+"""
+
+import argparse
+
+import pymysql
+from dotenv import load_dotenv
+
+ONLINE = "ALGORITHM=INPLACE, LOCK=NONE"
+
+
+def _if_table(table, sql):
+    """table이 있을 때만 실행 (뒤 버전에서 만드는 테이블 → 아직 없는 DB에서는 옮길/정리할 행도 없음)"""
+    return (table, sql)
+
+
+def _dedupe_music(column):
+    """
+    column 값이 같은 music 행을 가장 작은 music_no 하나로 합치는 SQL (UNIQUE KEY 추가 전, 1062 방지)
+    - 예전 check-then-insert 경합으로 생긴 중복 행 정리
+    - music_list / top50_snapshot_item은 남길 music_no로 옮김, 옮기면 PK가 겹치는 music_list 행은 삭제
+    """
+    keep = "music_dedupe"
+    return [
+        f"DROP TEMPORARY TABLE IF EXISTS {keep}",
+        f"""
+        CREATE TEMPORARY TABLE {keep} AS
+        SELECT m.music_no, d.keep_no
+        FROM music m
+        JOIN (
+          SELECT {column}, MIN(music_no) AS keep_no FROM music
+          WHERE {column} IS NOT NULL GROUP BY {column} HAVING COUNT(*) > 1
+        ) d ON m.{column} = d.{column} AND m.music_no <> d.keep_no
+        """,
+        f"UPDATE IGNORE music_list ml JOIN {keep} k ON ml.music_no = k.music_no SET ml.music_no = k.keep_no",
+        f"DELETE ml FROM music_list ml JOIN {keep} k ON ml.music_no = k.music_no",
+        _if_table(
+            "top50_snapshot_item",
+            f"UPDATE top50_snapshot_item i JOIN {keep} k ON i.music_no = k.music_no SET i.music_no = k.keep_no"
+        ),
+        f"DELETE m FROM music m JOIN {keep} k ON m.music_no = k.music_no",
+        f"DROP TEMPORARY TABLE {keep}",
+    ]
+
+
+# (버전, 설명, SQL 목록)
+MIGRATIONS = [
+    (1, "music 중복 키 / 보강 컬럼", [
+        *_dedupe_music("spotify_url"),
+        "ALTER TABLE music ADD UNIQUE KEY uq_music_spotify_url (spotify_url)",
+        "ALTER TABLE music ADD COLUMN spotify_artist_id VARCHAR(50)",
+        "ALTER TABLE music ADD COLUMN is_enriched TINYINT(1) NOT NULL DEFAULT 1",
+        "ALTER TABLE music MODIFY spotify_track_id CHAR(22) CHARACTER SET ascii COLLATE ascii_bin",
+        *_dedupe_music("spotify_track_id"),
+        "ALTER TABLE music ADD UNIQUE KEY uq_music_spotify_track_id (spotify_track_id)",
+        "UPDATE music SET popularity = 0 WHERE popularity IS NULL",
+        "ALTER TABLE music MODIFY popularity INT NOT NULL DEFAULT 0",
+    ]),
+    (2, "조회 경로 인덱스", [
+        # GET /music 목록 (popularity DESC, music_no DESC keyset)
+        f"ALTER TABLE music ADD INDEX idx_music_popularity (popularity, music_no), {ONLINE}",
+        # 장르 필터 목록 / 장르 backfill (genre_no IS NULL)
+        f"ALTER TABLE music ADD INDEX idx_music_genre_popularity (genre_no, popularity, music_no), {ONLINE}",
+        # 보강 대기 목록 (is_enriched = 0 ORDER BY music_no)
+        f"ALTER TABLE music ADD INDEX idx_music_is_enriched (is_enriched), {ONLINE}",
+        # 음악이 포함된 플레이리스트 (PK는 playlist_no 선두)
+        f"ALTER TABLE music_list ADD INDEX idx_music_list_music_no (music_no), {ONLINE}",
+        f"ALTER TABLE playlist ADD INDEX idx_playlist_user_created (user_no, created_at), {ONLINE}",
+        f"ALTER TABLE playlist ADD INDEX idx_playlist_created (created_at), {ONLINE}",
+        f"ALTER TABLE notice ADD INDEX idx_notice_created (created_at), {ONLINE}",
+        # 로그인/가입 이메일 조회 (기존 중복 데이터가 있을 수 있어 UNIQUE는 아님)
+        f"ALTER TABLE user ADD INDEX idx_user_email (email), {ONLINE}",
+        _if_table("import_job", f"ALTER TABLE import_job ADD INDEX idx_import_job_status (status, updated_at), {ONLINE}"),
+    ]),
+    (3, "장르별 곡 수 / popularity 상위 music_no 집계", [
+        # model/genre_stats.py가 곡 수는 music 쓰기 트랜잭션 안에서, 상위 목록은 commit 직후 갱신
+        """
+        CREATE TABLE IF NOT EXISTS genre_stats (
+          genre_no INT PRIMARY KEY,
+          track_count INT NOT NULL DEFAULT 0,
+          top_music_nos TEXT,
+          min_popularity INT NOT NULL DEFAULT 0,
+          updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        )
+        """,
+        # 초기 집계: 상위 100개 (GENRE_TOP_N 기본값), min_popularity는 첫 증분 갱신 때 채움
+        "SET SESSION group_concat_max_len = 1048576",
+        """
+        INSERT INTO genre_stats (genre_no, track_count, top_music_nos)
+        SELECT g.genre_no, COUNT(m.music_no),
+               SUBSTRING_INDEX(GROUP_CONCAT(m.music_no ORDER BY m.popularity DESC, m.music_no DESC), ',', 100)
+        FROM genre g
+        LEFT JOIN music m ON m.genre_no = g.genre_no
+        GROUP BY g.genre_no
+        ON DUPLICATE KEY UPDATE track_count = VALUES(track_count), top_music_nos = VALUES(top_music_nos)
+        """,
+    ]),
+    (4, "Spotify artist → 장르 캐시", [
+        """
+        CREATE TABLE IF NOT EXISTS artist_genre_cache (
+          artist_id VARCHAR(50) PRIMARY KEY,
+          genres TEXT,
+          genre_no INT,
+          fetched_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+    (5, "Deezer preview URL 캐시", [
+        """
+        CREATE TABLE IF NOT EXISTS preview_cache (
+          cache_key CHAR(40) PRIMARY KEY,
+          track_name VARCHAR(500),
+          artist_name VARCHAR(500),
+          preview_url VARCHAR(500),
+          miss_count INT DEFAULT 0,
+          expires_at DATETIME NOT NULL,
+          updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+    (6, "비동기 bulk import 작업", [
+        """
+        CREATE TABLE IF NOT EXISTS import_job (
+          job_no INT PRIMARY KEY AUTO_INCREMENT,
+          query VARCHAR(200) NOT NULL,
+          total_count INT NOT NULL,
+          status VARCHAR(20) NOT NULL DEFAULT 'queued',
+          next_offset INT NOT NULL DEFAULT 0,
+          processed_count INT NOT NULL DEFAULT 0,
+          new_count INT NOT NULL DEFAULT 0,
+          existing_count INT NOT NULL DEFAULT 0,
+          errors TEXT,
+          created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+          updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+          finished_at DATETIME
+        )
+        """,
+        # 2번이 테이블이 없어서 건너뛴 DB
+        f"ALTER TABLE import_job ADD INDEX idx_import_job_status (status, updated_at), {ONLINE}",
+    ]),
+    (7, "글로벌 Top 50 스냅샷", [
+        """
+        CREATE TABLE IF NOT EXISTS top50_snapshot (
+          snapshot_no INT PRIMARY KEY AUTO_INCREMENT,
+          playlist_id VARCHAR(50) NOT NULL,
+          track_count INT NOT NULL DEFAULT 0,
+          fetched_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+    (8, "글로벌 Top 50 스냅샷별 순위", [
+        """
+        CREATE TABLE IF NOT EXISTS top50_snapshot_item (
+          snapshot_no INT,
+          rank_no INT,
+          music_no INT,
+          PRIMARY KEY (snapshot_no, rank_no)
+        )
+        """,
+    ]),
+    (9, "bulk import 작업 실행권 토큰", [
+        # services/import_job.py: claim 때 새 토큰, heartbeat / 진행 저장 / 종료는 토큰이 같을 때만
+        "ALTER TABLE import_job ADD COLUMN lease_token CHAR(32)",
+    ]),
+]
+
+# 이미 적용된 변경으로 보고 무시할 오류: Duplicate column / Duplicate key name / Can't DROP
+IGNORED_ERRORS = (1060, 1061, 1091)
+
+# model/music.py MUSIC_CARD_COLUMNS / MUSIC_DETAIL_COLUMNS (db 연결 설정 전이라 import하지 않음)
+CARD_COLUMNS = ("music_no, track_name, artist_name, album_name, album_image_url,"
+                " duration_ms, popularity, spotify_url, preview_url, genre_no")
+DETAIL_COLUMNS = CARD_COLUMNS + ", spotify_track_id, spotify_artist_id, release_date, release_year, is_enriched"
+
+# EXPLAIN 대상: (모델 함수, SQL, 예시 파라미터) - model/*.py 쿼리와 같은 형태 유지
+EXPLAIN_QUERIES = [
+    ("music.find_by_spotify_track_ids",
+     f"SELECT {DETAIL_COLUMNS} FROM music WHERE spotify_track_id IN (%s, %s)", ("0" * 22, "1" * 22)),
+    ("music.find_all",
+     f"SELECT {CARD_COLUMNS} FROM music ORDER BY popularity DESC, music_no DESC LIMIT %s", (51,)),
+    ("music.find_all (cursor)",
+     f"SELECT {CARD_COLUMNS} FROM music WHERE (popularity < %s OR (popularity = %s AND music_no < %s))"
+     " ORDER BY popularity DESC, music_no DESC LIMIT %s", (50, 50, 1000, 51)),
+    ("music.find_all (genre)",
+     f"SELECT {CARD_COLUMNS} FROM music WHERE genre_no = %s ORDER BY popularity DESC, music_no DESC LIMIT %s",
+     (1, 51)),
+    ("music.find_all (fields=music_no,popularity, covering)",
+     "SELECT music_no, popularity FROM music ORDER BY popularity DESC, music_no DESC LIMIT %s", (51,)),
+    ("genre_stats.refresh_top (top)",
+     "SELECT music_no, popularity FROM music WHERE genre_no = %s"
+     " ORDER BY popularity DESC, music_no DESC LIMIT %s", (1, 100)),
+    ("music.count_by_genre_no",
+     "SELECT COUNT(*) AS cnt FROM music WHERE genre_no = %s", (1,)),
+    ("music.find_pending_enrichment_music_nos",
+     "SELECT music_no FROM music WHERE is_enriched = 0 AND music_no > %s ORDER BY music_no LIMIT %s", (0, 200)),
+    ("music.find_missing_genre",
+     "SELECT music_no, spotify_url, spotify_track_id, spotify_artist_id FROM music"
+     " WHERE genre_no IS NULL AND music_no > %s ORDER BY music_no LIMIT %s", (0, 200)),
+    ("music_list.find_by_playlist_no",
+     "SELECT ml.playlist_no, ml.music_no, m.track_name FROM music_list ml"
+     " LEFT JOIN music m ON ml.music_no = m.music_no WHERE ml.playlist_no = %s", (1,)),
+    ("music_list.find_by_music_no",
+     "SELECT ml.playlist_no, ml.music_no, p.title FROM music_list ml"
+     " LEFT JOIN playlist p ON ml.playlist_no = p.playlist_no WHERE ml.music_no = %s", (1,)),
+    ("playlist.list_by_user_no",
+     "SELECT playlist_no, title FROM playlist WHERE user_no = %s ORDER BY created_at DESC", (1,)),
+    ("playlist.list_all_with_user",
+     "SELECT p.playlist_no, u.nickname FROM playlist p LEFT JOIN user u ON p.user_no = u.user_no"
+     " ORDER BY p.created_at DESC", ()),
+    ("notice.list_all_with_user",
+     "SELECT n.notice_no, u.nickname FROM notice n LEFT JOIN user u ON n.user_no = u.user_no"
+     " ORDER BY n.created_at DESC", ()),
+    ("auth.find_user_by_email",
+     "SELECT user_no FROM user WHERE email = %s AND is_deleted = FALSE", ("a@b.c",)),
+    ("import_job.find_resumable_job_nos",
+     "SELECT job_no FROM import_job WHERE status = 'queued'"
+     " OR (status = 'running' AND updated_at < NOW() - INTERVAL %s SECOND) ORDER BY job_no", (300,)),
+    ("top50_snapshot.find_items",
+     "SELECT i.rank_no, m.music_no, m.track_name FROM top50_snapshot_item i JOIN music m ON i.music_no = m.music_no"
+     " WHERE i.snapshot_no = %s ORDER BY i.rank_no", (1,)),
+]
+
+
+def _ensure_table(c):
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+          version INT PRIMARY KEY,
+          description VARCHAR(200),
+          applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+
+
+def _table_exists(c, table):
+    c.execute(
+        "SELECT COUNT(*) FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s",
+        (table,)
+    )
+    return c.fetchone()[0] > 0
+
+
+def applied_versions(conn):
+    with conn.cursor(pymysql.cursors.DictCursor) as c:
+        _ensure_table(c)
+        c.execute("SELECT version FROM schema_migrations")
+        return {row['version'] for row in c.fetchall()}
+
+
+def migrate(conn, target=None):
+    """적용 안 된 마이그레이션을 버전 순서대로 적용 (target 지정 시 해당 버전까지), 반환: 적용한 버전 목록"""
+    done = applied_versions(conn)
+    applied = []
+    for version, description, statements in sorted(MIGRATIONS):
+        if version in done or (target is not None and version > target):
+            continue
+
+        print(f"⬆️  {version:03d} {description}")
+        with conn.cursor(pymysql.cursors.Cursor) as c:
+            for statement in statements:
+                if isinstance(statement, tuple):
+                    table, statement = statement
+                    if not _table_exists(c, table):
+                        print(f"    ({table} 없음, 건너뜀) {statement.strip()[:60]}...")
+                        continue
+                try:
+                    c.execute(statement)
+                except pymysql.err.OperationalError as e:
+                    # DDL은 이미 commit됨 → 롤백하지 않고 그대로 중단, 다시 실행하면 이 버전을 처음부터 적용
+                    if e.args[0] not in IGNORED_ERRORS:
+                        raise
+                    print(f"    (이미 적용됨) {statement[:60]}...")
+            c.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                (version, description)
+            )
+        conn.commit()
+        applied.append(version)
+    return applied
+
+
+def status(conn):
+    done = applied_versions(conn)
+    return [(version, description, version in done) for version, description, _ in sorted(MIGRATIONS)]
+
+
+def explain(conn):
+    """
+    EXPLAIN_QUERIES 실행 계획 확인
+    반환: [(이름, [(table, type, key, rows, extra), ...], 경고 목록), ...]
+    type=ALL → full scan, Extra에 filesort → 정렬용 인덱스 없음
+    """
+    reports = []
+    with conn.cursor(pymysql.cursors.DictCursor) as c:
+        for name, sql, params in EXPLAIN_QUERIES:
+            c.execute("EXPLAIN " + sql, params)
+            plan, warnings = [], []
+            for row in c.fetchall():
+                extra = row.get('Extra') or ''
+                plan.append((row.get('table'), row.get('type'), row.get('key'), row.get('rows'), extra))
+                if row.get('type') == 'ALL':
+                    warnings.append(f"full scan: {row.get('table')} (rows≈{row.get('rows')})")
+                if 'filesort' in extra:
+                    warnings.append(f"filesort: {row.get('table')}")
+            reports.append((name, plan, warnings))
+    return reports
+
+
+def main():
+    load_dotenv()
+    from db import get_connection
+
+    parser = argparse.ArgumentParser(description="스키마 마이그레이션")
+    parser.add_argument("command", nargs="?", default="up", choices=["up", "status", "explain"])
+    parser.add_argument("--target", type=int, help="이 버전까지만 적용")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        if args.command == "up":
+            applied = migrate(conn, args.target)
+            print(f"✅ {len(applied)}개 적용" if applied else "✅ 최신 상태")
+        elif args.command == "status":
+            for version, description, is_applied in status(conn):
+                print(f"  {'✅' if is_applied else '⬜'} {version:03d} {description}")
+        else:
+            flagged = 0
+            for name, plan, warnings in explain(conn):
+                print(f"{'⚠️ ' if warnings else '✅'} {name}")
+                for table, access, key, rows, extra in plan:
+                    print(f"    {table or '-':20} type={access or '-':8} key={key or '-':30} rows={rows} {extra}")
+                for warning in warnings:
+                    print(f"    → {warning}")
+                flagged += bool(warnings)
+            print(f"\n📋 {len(EXPLAIN_QUERIES)}개 쿼리 중 {flagged}개 확인 필요")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
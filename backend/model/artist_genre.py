@@ -0,0 +1,58 @@
+import json
+from db import get_connection
+
+
+def find_fresh_by_artist_ids(artist_ids, ttl_seconds):
+    """TTL 이내에 캐시된 artist 장르 조회 → {artist_id: {"genres": [...], "genre_no": ...}}"""
+    if not artist_ids:
+        return {}
+
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            placeholders = ",".join(["%s"] * len(artist_ids))
+            sql = f"""
+            SELECT artist_id, genres, genre_no
+            FROM artist_genre_cache
+            WHERE artist_id IN ({placeholders})
+              AND fetched_at >= NOW() - INTERVAL %s SECOND
+            """
+            c.execute(sql, (*artist_ids, ttl_seconds))
+            return {
+                row['artist_id']: {
+                    "genres": json.loads(row['genres'] or "[]"),
+                    "genre_no": row['genre_no'],
+                }
+                for row in c.fetchall()
+            }
+    finally:
+        conn.close()
+
+
+def upsert_many(entries):
+    """artist 장르 캐시 일괄 저장 (entries: [(artist_id, genres, genre_no), ...])"""
+    if not entries:
+        return 0
+
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            sql = """
+            INSERT INTO artist_genre_cache (artist_id, genres, genre_no, fetched_at)
+            VALUES (%s, %s, %s, NOW())
+            ON DUPLICATE KEY UPDATE
+              genres = VALUES(genres),
+              genre_no = VALUES(genre_no),
+              fetched_at = VALUES(fetched_at)
+            """
+            c.executemany(sql, [
+                (artist_id, json.dumps(genres, ensure_ascii=False), genre_no)
+                for artist_id, genres, genre_no in entries
+            ])
+            conn.commit()
+            return len(entries)
+    except Exception as e:
+        print(f"  ❌ artist 장르 캐시 저장 실패: {e}")
+        return 0
+    finally:
+        conn.close()
@@ -0,0 +1,115 @@
+# backend/model/catalog_cache.py
+"""
+music 카탈로그 읽기 캐시 (프로세스 메모리, LRU)
+- 행 캐시: music_no → music 행 (조회한 컬럼만 들어 있을 수 있음, 같은 행을 다른 컬럼으로 읽으면 합침)
+- 페이지 캐시: 목록 조회 조건 → music_no 목록 (행은 행 캐시에서 조립)
+- 장르 집계 캐시: genre_stats 조회 결과 (장르 곡 수 / 상위 목록, 페이지와 함께 무효화)
+- 쓰기 시 무효화: 행 변경(preview_url 등)은 해당 music_no만, 행 추가/순서·장르 변경은 페이지 전체
+- 무효화와 동시에 진행 중이던 조회 결과는 캐시에 넣지 않음 (generation 비교)
+- 다른 프로세스(시드/backfill 스크립트)의 쓰기는 TTL로 반영
+"""
+
+import os
+import threading
+
+from cache import LRUCache
+
+ROW_CACHE = LRUCache(
+    maxsize=int(os.getenv("CATALOG_ROW_CACHE_MAXSIZE", 50000)),
+    ttl=int(os.getenv("CATALOG_CACHE_TTL_SECONDS", 300))
+)
+PAGE_CACHE = LRUCache(
+    maxsize=int(os.getenv("CATALOG_PAGE_CACHE_MAXSIZE", 2000)),
+    ttl=int(os.getenv("CATALOG_CACHE_TTL_SECONDS", 300))
+)
+GENRE_CACHE = LRUCache(
+    maxsize=256,
+    ttl=int(os.getenv("CATALOG_CACHE_TTL_SECONDS", 300))
+)
+
+_generation = 0
+_lock = threading.Lock()
+
+
+def generation():
+    """DB 조회 전에 읽어 두고 put_*()에 전달"""
+    return _generation
+
+
+def _bump():
+    global _generation
+    with _lock:
+        _generation += 1
+
+
+def get_rows(music_nos, columns=None):
+    """
+    반환: ({music_no: row 복사본}, 캐시에 없는 music_no 목록)
+    columns 지정 시 해당 컬럼만 복사, 캐시 행에 없는 컬럼이 있으면 없는 것으로 처리
+    """
+    found, missing = {}, []
+    for music_no in music_nos:
+        row, is_fresh = ROW_CACHE.get(music_no)
+        if is_fresh and (columns is None or all(col in row for col in columns)):
+            found[music_no] = dict(row) if columns is None else {col: row[col] for col in columns}
+        else:
+            missing.append(music_no)
+    return found, missing
+
+
+def put_rows(rows, gen):
+    with _lock:
+        if gen != _generation:
+            return
+        for row in rows:
+            cached, is_fresh = ROW_CACHE.get(row['music_no'], record=False)
+            # 같은 generation 안에서 읽은 다른 컬럼은 유지
+            merged = dict(cached) if is_fresh else {}
+            merged.update(row)
+            ROW_CACHE.set(row['music_no'], merged)
+
+
+def get_page(key):
+    music_nos, is_fresh = PAGE_CACHE.get(key)
+    return music_nos if is_fresh else None
+
+
+def put_page(key, music_nos, gen):
+    with _lock:
+        if gen == _generation:
+            PAGE_CACHE.set(key, list(music_nos))
+
+
+def get_genre_stats(key):
+    value, is_fresh = GENRE_CACHE.get(key)
+    return value if is_fresh else None
+
+
+def put_genre_stats(key, value, gen):
+    with _lock:
+        if gen == _generation:
+            GENRE_CACHE.set(key, value)
+
+
+def invalidate_rows(music_nos):
+    """행 내용만 바뀐 경우 (목록 순서/구성은 그대로)"""
+    _bump()
+    for music_no in music_nos:
+        if music_no:
+            ROW_CACHE.invalidate(music_no)
+
+
+def invalidate_pages():
+    """행 추가, popularity/genre_no 변경 → 목록 구성이 바뀔 수 있음"""
+    _bump()
+    PAGE_CACHE.clear()
+    GENRE_CACHE.clear()
+
+
+def stats():
+    return {
+        "rows": ROW_CACHE.stats(),
+        "pages": PAGE_CACHE.stats(),
+        "genres": GENRE_CACHE.stats(),
+        "generation": _generation,
+    }
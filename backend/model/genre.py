@@ -9,4 +9,14 @@ def find_genre_no_by_name(name):
             row = c.fetchone()
             return row["genre_no"] if row else None
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+
+def find_all():
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute("SELECT genre_no, name FROM genre ORDER BY genre_no")
+            return c.fetchall()
+    finally:
+        conn.close()
@@ -0,0 +1,163 @@
+import os
+
+from db import get_connection
+from model import catalog_cache
+
+# 장르별로 유지할 popularity 상위 곡 수 (migrate.py 3번 초기 집계와 같은 값)
+GENRE_TOP_N = int(os.getenv("GENRE_TOP_N", 100))
+
+
+def parse_top(value):
+    """top_music_nos ("12,7,3") → [12, 7, 3]"""
+    return [int(no) for no in (value or "").split(",") if no]
+
+
+def apply_changes(c, changes):
+    """
+    music 쓰기 트랜잭션 안에서 장르 곡 수 갱신 (c: 쓰기 중인 커서, commit은 호출한 쪽에서)
+    changes: [(music_no, genre_no, popularity, is_added), ...]
+      is_added: 새 행이거나 genre_no가 새로 채워져서 장르 곡 수가 1 늘어난 경우
+    - 곡 수: 증감분만 더함 (장르 집계 행을 genre_no 순서로 잠가서 동시 import끼리 순서대로 반영)
+    - music 행은 읽지도 잠그지도 않음 → music X 잠금 → genre_stats 잠금 → music 공유 잠금 순환이 생기지 않음
+    반환: commit 후 refresh_top()으로 다시 계산할 genre_no 목록
+      (집계 행이 없던 장르, 바뀐 곡이 상위 목록 안에 있었거나 목록 최저 popularity 이상인 장르)
+    """
+    changes = [change for change in changes if change[1] is not None]
+    if not changes:
+        return []
+
+    genre_nos = sorted({genre_no for _, genre_no, _, _ in changes})
+    placeholders = ",".join(["%s"] * len(genre_nos))
+    c.execute(
+        f"""
+        SELECT genre_no, top_music_nos, min_popularity FROM genre_stats
+        WHERE genre_no IN ({placeholders}) ORDER BY genre_no FOR UPDATE
+        """,
+        tuple(genre_nos)
+    )
+    current = {row['genre_no']: row for row in c.fetchall()}
+
+    stale = []
+    for genre_no in genre_nos:
+        genre_changes = [change for change in changes if change[1] == genre_no]
+        added = sum(1 for change in genre_changes if change[3])
+        row = current.get(genre_no)
+
+        if row is None:
+            # 곡 수는 refresh_top()에서 COUNT로 채움
+            stale.append(genre_no)
+            continue
+        if added:
+            c.execute(
+                "UPDATE genre_stats SET track_count = track_count + %s WHERE genre_no = %s",
+                (added, genre_no)
+            )
+        top = set(parse_top(row['top_music_nos']))
+        is_full = len(top) >= GENRE_TOP_N
+        if any(
+            music_no in top or not is_full or popularity >= row['min_popularity']
+            for music_no, _, popularity, _ in genre_changes
+        ):
+            stale.append(genre_no)
+    return stale
+
+
+def refresh_top(conn, genre_nos):
+    """
+    music 쓰기 commit 후 같은 연결에서 장르별 상위 목록 다시 계산 (장르마다 짧은 트랜잭션)
+    - 집계 행을 먼저 X 잠금(없으면 생성) → 그 뒤 비잠금 읽기로 상위 GENRE_TOP_N개 / 곡 수 조회
+      스냅샷이 잠금 이후에 만들어지므로 먼저 커밋된 다른 import의 변경도 반영, music 잠금 없음
+    - 실패해도 music 쓰기는 이미 커밋됨 → 다음 변경 때 다시 계산
+    반환: 다시 계산한 genre_no 목록
+    """
+    refreshed = []
+    for genre_no in sorted(set(genre_nos)):
+        try:
+            with conn.cursor() as c:
+                c.execute(
+                    """
+                    INSERT INTO genre_stats (genre_no, track_count) VALUES (%s, -1)
+                    ON DUPLICATE KEY UPDATE genre_no = genre_no
+                    """,
+                    (genre_no,)
+                )
+                c.execute("SELECT track_count FROM genre_stats WHERE genre_no = %s FOR UPDATE", (genre_no,))
+                if c.fetchone()['track_count'] < 0:
+                    # 방금 만든 집계 행 → 인덱스 범위 COUNT
+                    c.execute("SELECT COUNT(*) AS cnt FROM music WHERE genre_no = %s", (genre_no,))
+                    c.execute(
+                        "UPDATE genre_stats SET track_count = %s WHERE genre_no = %s",
+                        (c.fetchone()['cnt'], genre_no)
+                    )
+                c.execute(
+                    """
+                    SELECT music_no, popularity FROM music WHERE genre_no = %s
+                    ORDER BY popularity DESC, music_no DESC LIMIT %s
+                    """,
+                    (genre_no, GENRE_TOP_N)
+                )
+                top_rows = c.fetchall()
+                c.execute(
+                    "UPDATE genre_stats SET top_music_nos = %s, min_popularity = %s WHERE genre_no = %s",
+                    (
+                        ",".join(str(r['music_no']) for r in top_rows),
+                        top_rows[-1]['popularity'] if len(top_rows) >= GENRE_TOP_N else 0,
+                        genre_no,
+                    )
+                )
+            conn.commit()
+            refreshed.append(genre_no)
+        except Exception as e:
+            conn.rollback()
+            print(f"장르 상위 목록 갱신 실패 (genre_no={genre_no}): {e}")
+    if refreshed:
+        catalog_cache.invalidate_pages()
+    return refreshed
+
+
+def find_all():
+    """장르별 곡 수 (곡 수 많은 순), 집계 행이 없는 장르는 0 (catalog_cache 우선)"""
+    cached = catalog_cache.get_genre_stats("all")
+    if cached is not None:
+        return [dict(row) for row in cached]
+
+    gen = catalog_cache.generation()
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute(
+                """
+                SELECT g.genre_no, g.name, COALESCE(s.track_count, 0) AS track_count,
+                       s.top_music_nos, s.updated_at
+                FROM genre g
+                LEFT JOIN genre_stats s ON s.genre_no = g.genre_no
+                ORDER BY track_count DESC, g.genre_no
+                """
+            )
+            rows = c.fetchall()
+    finally:
+        conn.close()
+    catalog_cache.put_genre_stats("all", [dict(row) for row in rows], gen)
+    return rows
+
+
+def find_by_genre_no(genre_no):
+    """장르 집계 행 (PK 조회, catalog_cache 우선), 없으면 None"""
+    cached = catalog_cache.get_genre_stats(genre_no)
+    if cached is not None:
+        return dict(cached) if cached else None
+
+    gen = catalog_cache.generation()
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute(
+                "SELECT genre_no, track_count, top_music_nos, updated_at FROM genre_stats WHERE genre_no = %s",
+                (genre_no,)
+            )
+            row = c.fetchone()
+    finally:
+        conn.close()
+    # 집계 행이 없는 장르도 빈 dict로 캐시
+    catalog_cache.put_genre_stats(genre_no, dict(row) if row else {}, gen)
+    return row
@@ -0,0 +1,158 @@
+import json
+from db import get_connection
+
+
+def _decode(row):
+    if row:
+        row['errors'] = json.loads(row['errors'] or "[]")
+    return row
+
+
+def insert_job(query, total_count):
+    """bulk import 작업 생성, job_no 반환"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute(
+                "INSERT INTO import_job (query, total_count, status, errors) VALUES (%s, %s, 'queued', '[]')",
+                (query, total_count)
+            )
+            conn.commit()
+            return c.lastrowid
+    finally:
+        conn.close()
+
+
+def find_by_job_no(job_no):
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute("SELECT * FROM import_job WHERE job_no = %s", (job_no,))
+            return _decode(c.fetchone())
+    finally:
+        conn.close()
+
+
+def claim_job(job_no, stale_seconds, lease_token):
+    """
+    작업 실행권 획득 (queued 이거나, running 인데 stale_seconds 동안 heartbeat가 없던 작업)
+    여러 worker/프로세스 중 하나만 성공, 성공하면 lease_token 저장 → 이후 쓰기는 이 토큰으로만 가능
+    """
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute(
+                """
+                UPDATE import_job SET status = 'running', lease_token = %s, updated_at = NOW()
+                WHERE job_no = %s
+                  AND (status = 'queued'
+                       OR (status = 'running' AND updated_at < NOW() - INTERVAL %s SECOND))
+                """,
+                (lease_token, job_no, stale_seconds)
+            )
+            conn.commit()
+            return c.rowcount > 0
+    finally:
+        conn.close()
+
+
+def _owns(c, job_no, lease_token):
+    """
+    UPDATE 영향 행이 0일 때 실행권 확인
+    (값이 같아서 바뀌지 않은 행도 0으로 세므로 토큰을 다시 읽어서 판단)
+    """
+    c.execute("SELECT lease_token FROM import_job WHERE job_no = %s", (job_no,))
+    row = c.fetchone()
+    return bool(row) and row['lease_token'] == lease_token
+
+
+def heartbeat(job_no, lease_token):
+    """실행 중 표시 갱신, 반환: 아직 실행권이 있는지 (다른 worker가 가져갔으면 False)"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute(
+                "UPDATE import_job SET updated_at = NOW() WHERE job_no = %s AND lease_token = %s",
+                (job_no, lease_token)
+            )
+            conn.commit()
+            return c.rowcount > 0 or _owns(c, job_no, lease_token)
+    finally:
+        conn.close()
+
+
+def requeue_job(job_no):
+    """실패한 작업을 다시 대기 상태로 (next_offset은 유지 → 마지막 완료 페이지부터 재개)"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute(
+                "UPDATE import_job SET status = 'queued', finished_at = NULL WHERE job_no = %s AND status = 'failed'",
+                (job_no,)
+            )
+            conn.commit()
+            return c.rowcount > 0
+    finally:
+        conn.close()
+
+
+def find_resumable_job_nos(stale_seconds):
+    """재시작 후 이어서 실행할 작업 목록 (대기 중 또는 멈춘 running 작업)"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute(
+                """
+                SELECT job_no FROM import_job
+                WHERE status = 'queued'
+                   OR (status = 'running' AND updated_at < NOW() - INTERVAL %s SECOND)
+                ORDER BY job_no
+                """,
+                (stale_seconds,)
+            )
+            return [row['job_no'] for row in c.fetchall()]
+    finally:
+        conn.close()
+
+
+def update_progress(job_no, lease_token, next_offset, processed_count, new_count, existing_count, errors):
+    """
+    페이지 하나 완료 시 진행 상황 저장 (재시작 시 next_offset부터 이어서 실행)
+    반환: 저장 여부 (실행권을 잃었으면 False → 호출한 쪽에서 중단)
+    """
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute(
+                """
+                UPDATE import_job
+                SET next_offset = %s, processed_count = %s, new_count = %s,
+                    existing_count = %s, errors = %s, updated_at = NOW()
+                WHERE job_no = %s AND lease_token = %s
+                """,
+                (next_offset, processed_count, new_count, existing_count,
+                 json.dumps(errors, ensure_ascii=False), job_no, lease_token)
+            )
+            conn.commit()
+            return c.rowcount > 0 or _owns(c, job_no, lease_token)
+    finally:
+        conn.close()
+
+
+def finish_job(job_no, lease_token, status, errors):
+    """작업 종료 (status: done / failed), 실행권이 있을 때만 → 반환: 저장 여부"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute(
+                """
+                UPDATE import_job
+                SET status = %s, errors = %s, finished_at = NOW(), lease_token = NULL
+                WHERE job_no = %s AND lease_token = %s
+                """,
+                (status, json.dumps(errors, ensure_ascii=False), job_no, lease_token)
+            )
+            conn.commit()
+            return c.rowcount > 0
+    finally:
+        conn.close()
@@ -1,105 +1,411 @@
-from db import get_connection
+import random
+import time
 
+from db import TRANSACTION_RETRIES, get_connection, is_retryable
+from model import catalog_cache
+from model import genre_stats
+
+# 화면별 조회 컬럼 (SELECT * 대신 사용, DictCursor가 만드는 dict / 응답 크기를 화면에 맞춤)
+# card: 목록/검색 결과 카드, detail: 곡 상세 / 내부 처리(보강, 중복 체크)
+MUSIC_CARD_COLUMNS = (
+    "music_no", "track_name", "artist_name", "album_name", "album_image_url",
+    "duration_ms", "popularity", "spotify_url", "preview_url", "genre_no",
+)
+MUSIC_DETAIL_COLUMNS = MUSIC_CARD_COLUMNS + (
+    "spotify_track_id", "spotify_artist_id", "release_date", "release_year", "is_enriched",
+)
+MUSIC_VIEWS = {"card": MUSIC_CARD_COLUMNS, "detail": MUSIC_DETAIL_COLUMNS}
+# 목록 keyset cursor / 행 캐시 키에 필요 → 항상 조회
+MUSIC_KEY_COLUMNS = ("music_no", "popularity")
+
+
+def resolve_columns(fields=None, default="card"):
+    """
+    ?fields= 값 → 조회 컬럼 튜플
+    - "card" / "detail" 또는 쉼표로 구분한 컬럼 이름 ("track_name,artist_name")
+    - music_no, popularity는 항상 포함, 모르는 컬럼이면 ValueError
+    """
+    fields = (fields or default).strip()
+    if fields in MUSIC_VIEWS:
+        return MUSIC_VIEWS[fields]
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in MUSIC_DETAIL_COLUMNS]
+    if unknown:
+        raise ValueError(f"알 수 없는 fields: {', '.join(unknown)}")
+    return tuple(dict.fromkeys(MUSIC_KEY_COLUMNS + tuple(requested)))
+
+
+def _select_list(columns, alias=None):
+    """검증된 컬럼 튜플 → SELECT 목록 (컬럼 이름은 MUSIC_DETAIL_COLUMNS 안에서만 사용)"""
+    prefix = f"{alias}." if alias else ""
+    return ", ".join(prefix + col for col in columns)
+
+
+def find_by_spotify_track_ids(track_ids):
+    """spotify_track_id 목록 중복 체크 (유니크 인덱스 IN 조회 한 번) → {spotify_track_id: row}"""
+    if not track_ids:
+        return {}
 
-def find_by_spotify_url(spotify_url):
-    """spotify_url로 중복 체크"""
     conn = get_connection()
     try:
         with conn.cursor() as c:
-            c.execute("SELECT * FROM music WHERE spotify_url = %s", (spotify_url,))
-            return c.fetchone()
+            placeholders = ",".join(["%s"] * len(track_ids))
+            c.execute(
+                f"SELECT {_select_list(MUSIC_DETAIL_COLUMNS)} FROM music WHERE spotify_track_id IN ({placeholders})",
+                tuple(track_ids)
+            )
+            return {row['spotify_track_id']: row for row in c.fetchall()}
     finally:
         conn.close()
 
 
-def insert_music(m):
+def iter_spotify_track_ids(batch_size=5000, after_music_no=0):
+    """after_music_no 이후 (music_no, spotify_track_id) 행을 music_no 순서로 batch_size개씩 (keyset)"""
+    while True:
+        conn = get_connection()
+        try:
+            with conn.cursor() as c:
+                c.execute(
+                    """
+                    SELECT music_no, spotify_track_id FROM music
+                    WHERE music_no > %s AND spotify_track_id IS NOT NULL
+                    ORDER BY music_no LIMIT %s
+                    """,
+                    (after_music_no, batch_size)
+                )
+                rows = c.fetchall()
+        finally:
+            conn.close()
+
+        if not rows:
+            return
+        after_music_no = rows[-1]['music_no']
+        yield rows
+
+
+def iter_catalog_text(batch_size=5000, after_music_no=0):
+    """검색 색인용 (music_no, 이름 필드, popularity)을 after_music_no 이후 music_no 순서로 batch_size개씩 (keyset)"""
+    while True:
+        conn = get_connection()
+        try:
+            with conn.cursor() as c:
+                c.execute(
+                    """
+                    SELECT music_no, track_name, artist_name, album_name, popularity
+                    FROM music WHERE music_no > %s
+                    ORDER BY music_no LIMIT %s
+                    """,
+                    (after_music_no, batch_size)
+                )
+                rows = c.fetchall()
+        finally:
+            conn.close()
+
+        if not rows:
+            return
+        after_music_no = rows[-1]['music_no']
+        yield rows
+
+
+def find_missing_track_id(after_music_no=0, limit=1000):
+    """spotify_track_id가 비어 있는 행 (music_no 순 keyset 조회)"""
     conn = get_connection()
     try:
         with conn.cursor() as c:
-            sql = """
-            INSERT INTO music
-            (track_name, artist_name, album_name, album_image_url,
-             duration_ms, popularity, spotify_url, genre_no, preview_url)
-            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)
-            """
-            c.execute(sql, (
-                m['track_name'],
-                m['artist_name'],
-                m['album_name'],
-                m['album_image_url'],
-                m['duration_ms'],
-                m['popularity'],
-                m['spotify_url'],
-                m['genre_no'],
-                m.get('preview_url')
-            ))
-            conn.commit()
-            print(f"  ✅ 저장: {m['track_name']}")
-            return c.lastrowid
-    except Exception as e:
-        print(f"  ❌ 저장 실패: {m['track_name']} - {e}")
-        return None
+            c.execute(
+                """
+                SELECT music_no, spotify_url
+                FROM music
+                WHERE spotify_track_id IS NULL AND music_no > %s
+                ORDER BY music_no
+                LIMIT %s
+                """,
+                (after_music_no, limit)
+            )
+            return c.fetchall()
     finally:
         conn.close()
 
 
-def find_all(category=None, value=None):
+def update_track_id_many(rows):
+    """
+    spotify_track_id backfill 결과 반영 (rows: [(music_no, spotify_track_id), ...])
+    같은 track id를 가진 행이 이미 있으면 (유니크 키 충돌) 건너뜀, 반환: 변경된 행 수
+    """
+    if not rows:
+        return 0
+
     conn = get_connection()
     try:
         with conn.cursor() as c:
-            if category == "genre":
-                sql = """
-                SELECT m.*
-                FROM music m
-                JOIN genre g ON m.genre_no = g.genre_no
-                WHERE g.name = %s
-                ORDER BY m.popularity DESC
-                """
-                c.execute(sql, (value,))
-            else:
-                c.execute("SELECT * FROM music ORDER BY popularity DESC")
-            return c.fetchall()
+            updated = c.executemany(
+                "UPDATE IGNORE music SET spotify_track_id = %s WHERE music_no = %s AND spotify_track_id IS NULL",
+                [(track_id, music_no) for music_no, track_id in rows]
+            )
+            conn.commit()
+            catalog_cache.invalidate_rows([music_no for music_no, _ in rows])
+            return updated or 0
     finally:
         conn.close()
 
 
-def find_by_genre(genre_name):
+MUSIC_UPSERT_COLUMNS = (
+    "track_name", "artist_name", "album_name", "album_image_url",
+    "duration_ms", "popularity", "spotify_url", "genre_no", "preview_url",
+    "spotify_track_id", "spotify_artist_id", "is_enriched",
+)
+MUSIC_UPSERT_DEFAULTS = {"is_enriched": 1}
+
+
+def _match_upsert_rows(rows, track_ids, url_track_ids):
+    """
+    spotify_track_id / spotify_url로 찾은 행 → {입력 spotify_track_id: row}
+    track id가 아직 없는 예전 행(backfill 전)은 spotify_url 유니크 키로 같은 곡에 대응
+    """
+    matched = {}
+    for row in rows:
+        if row['spotify_track_id'] in track_ids:
+            matched[row['spotify_track_id']] = row
+    for row in rows:
+        track_id = url_track_ids.get(row['spotify_url'])
+        if track_id is not None:
+            matched.setdefault(track_id, row)
+    return matched
+
+
+def upsert_music_many(musics):
+    """
+    한 페이지 분량 음악 일괄 upsert (spotify_track_id / spotify_url 유니크 키 기준)
+    - 트랜잭션 하나에서 multi-row INSERT ... ON DUPLICATE KEY UPDATE 실행 (spotify_track_id 순서로 잠금)
+    - 기존 행: popularity/앨범 이미지 갱신, genre_no/preview_url/spotify_track_id는 비어 있을 때만 채움
+      is_enriched는 입력이 보강 완료(1)일 때만 올림
+    - 같은 트랜잭션에서 장르 곡 수(genre_stats) 갱신, 상위 목록은 commit 후 refresh_top()으로 다시 계산
+    - deadlock(1213) / lock wait timeout(1205) → 롤백 후 트랜잭션 전체 재시도 (DB_TRANSACTION_RETRIES회)
+    - 반환: 입력 순서대로 [{"music_no": ..., "is_new": bool, "preview_url": 저장된 값}, ...]
+    """
+    if not musics:
+        return []
+
+    attempt = 0
+    while True:
+        conn = get_connection()
+        try:
+            music_nos, inserted, saved, changes = _upsert_music_page(conn, musics)
+            break
+        except Exception as e:
+            conn.rollback()
+            if not is_retryable(e) or attempt >= TRANSACTION_RETRIES:
+                raise
+            attempt += 1
+            print(f"  ⚠️ upsert 재시도 {attempt}/{TRANSACTION_RETRIES}: {e}")
+            time.sleep(random.uniform(0, 0.05 * (2 ** attempt)))
+        finally:
+            conn.close()
+
+    # 신규 행 / 장르 채움 / popularity 변경(changes) → 목록 페이지, 기존 행 내용 → 해당 행만
+    if changes:
+        catalog_cache.invalidate_pages()
+    catalog_cache.invalidate_rows(music_nos.values())
+
+    print(f"  ✅ upsert: {len(music_nos)}곡 (신규 {len(inserted)}곡)")
+
+    results = []
+    for m in musics:
+        track_id = m['spotify_track_id']
+        results.append({
+            "music_no": music_nos.get(track_id),
+            "is_new": track_id in inserted,
+            "preview_url": (saved.get(track_id) or {}).get('preview_url'),
+        })
+        inserted.discard(track_id)  # 같은 입력 안의 중복은 첫 번째만 신규
+    return results
+
+
+def _upsert_music_page(conn, musics):
+    """
+    upsert_music_many 트랜잭션 한 번 → (music_nos, 새로 INSERT된 track id 집합, 저장된 행, genre_stats 변경)
+    - 이전 값은 비잠금 읽기 (FOR UPDATE는 없는 키에 gap 잠금 → 겹치는 동시 import끼리 INSERT 의도 잠금과 deadlock)
+    - 신규 판정은 이번 INSERT가 받은 AUTO_INCREMENT 구간 (innodb_autoinc_lock_mode 0/1: 한 문장의 id는 연속)
+      → 읽은 뒤 다른 import가 먼저 넣은 행은 기존 행으로 처리 (곡 수를 두 번 세지 않음)
+    """
+    track_ids = sorted(set(m['spotify_track_id'] for m in musics))
+    url_track_ids = {}
+    for m in musics:
+        url_track_ids.setdefault(m['spotify_url'], m['spotify_track_id'])
+    lookup_sql = f"""
+        WHERE spotify_track_id IN ({",".join(["%s"] * len(track_ids))})
+           OR spotify_url IN ({",".join(["%s"] * len(url_track_ids))})
+    """
+    lookup_params = (*track_ids, *url_track_ids)
+
+    first = {}
+    for m in musics:
+        first.setdefault(m['spotify_track_id'], m)  # INSERT 값과 같이 첫 번째 입력 기준
+
+    with conn.cursor() as c:
+        # spotify_url로도 찾음 → track id backfill 전 행과 충돌(ODKU)해도 신규로 세지 않음
+        c.execute(
+            f"SELECT spotify_track_id, spotify_url, genre_no, popularity FROM music {lookup_sql}",
+            lookup_params
+        )
+        before = _match_upsert_rows(c.fetchall(), set(track_ids), url_track_ids)
+
+        rows = [
+            tuple(first[track_id].get(col, MUSIC_UPSERT_DEFAULTS.get(col)) for col in MUSIC_UPSERT_COLUMNS)
+            for track_id in track_ids
+        ]
+        row_placeholder = "(" + ",".join(["%s"] * len(MUSIC_UPSERT_COLUMNS)) + ")"
+        sql = f"""
+        INSERT INTO music ({", ".join(MUSIC_UPSERT_COLUMNS)})
+        VALUES {", ".join([row_placeholder] * len(rows))}
+        ON DUPLICATE KEY UPDATE
+          popularity = VALUES(popularity),
+          album_image_url = VALUES(album_image_url),
+          genre_no = COALESCE(genre_no, VALUES(genre_no)),
+          preview_url = COALESCE(preview_url, VALUES(preview_url)),
+          spotify_track_id = COALESCE(spotify_track_id, VALUES(spotify_track_id)),
+          is_enriched = GREATEST(is_enriched, VALUES(is_enriched))
+        """
+        c.execute(sql, tuple(v for row in rows for v in row))
+        first_insert_id = c.lastrowid or 0  # 이번 문장에서 처음 INSERT된 행의 id (없으면 0)
+
+        c.execute(
+            f"SELECT music_no, spotify_track_id, spotify_url, preview_url FROM music {lookup_sql}",
+            lookup_params
+        )
+        saved = _match_upsert_rows(c.fetchall(), set(track_ids), url_track_ids)
+        music_nos = {track_id: row['music_no'] for track_id, row in saved.items()}
+        inserted = {
+            track_id for track_id, music_no in music_nos.items()
+            if track_id not in before and first_insert_id and
+            first_insert_id <= music_no < first_insert_id + len(rows)
+        }
+
+        changes = []
+        for track_id, m in first.items():
+            popularity = m.get('popularity') or 0
+            if track_id in inserted:
+                changes.append((music_nos.get(track_id), m.get('genre_no'), popularity, True))
+                continue
+            old = before.get(track_id)
+            if old is None:
+                # 읽은 뒤 다른 import가 넣은 행 → 곡 수는 그쪽에서 셈, 상위 목록만 다시 확인
+                changes.append((music_nos.get(track_id), m.get('genre_no'), popularity, False))
+                continue
+            is_added = old['genre_no'] is None and m.get('genre_no') is not None
+            if is_added or old['popularity'] != popularity:
+                genre_no = old['genre_no'] if old['genre_no'] is not None else m.get('genre_no')
+                changes.append((music_nos.get(track_id), genre_no, popularity, is_added))
+        stale_genres = genre_stats.apply_changes(c, changes)
+        conn.commit()
+        genre_stats.refresh_top(conn, stale_genres)
+    return music_nos, inserted, saved, changes
+
+
+def find_all(genre_no=None, after=None, limit=50, columns=MUSIC_CARD_COLUMNS):
+    """
+    popularity DESC, music_no DESC 순 keyset 페이지 조회
+    - after: 이전 페이지 마지막 행의 (popularity, music_no), None이면 첫 페이지
+    - genre_no 지정 시 해당 장르만
+    - columns: 조회 컬럼 (resolve_columns 결과), music_no / popularity는 항상 포함
+    - 페이지 구성(music_no 목록)과 행은 catalog_cache에서 먼저 찾음
+    """
+    columns = tuple(dict.fromkeys(MUSIC_KEY_COLUMNS + tuple(columns)))
+    page_key = (genre_no, tuple(after) if after else None, limit)
+    music_nos = catalog_cache.get_page(page_key)
+    if music_nos is not None:
+        return find_by_music_nos(music_nos, columns)
+
+    conditions, params = [], []
+    if genre_no is not None:
+        conditions.append("genre_no = %s")
+        params.append(genre_no)
+    if after is not None:
+        popularity, music_no = after
+        conditions.append("(popularity < %s OR (popularity = %s AND music_no < %s))")
+        params.extend([popularity, popularity, music_no])
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    gen = catalog_cache.generation()
     conn = get_connection()
     try:
         with conn.cursor() as c:
-            sql = """
-            SELECT m.*
-            FROM music m
-            JOIN genre g ON m.genre_no = g.genre_no
-            WHERE g.name = %s
-            ORDER BY m.popularity DESC
-            """
-            c.execute(sql, (genre_name,))
-            return c.fetchall()
+            c.execute(
+                f"SELECT {_select_list(columns)} FROM music {where}"
+                " ORDER BY popularity DESC, music_no DESC LIMIT %s",
+                (*params, limit)
+            )
+            rows = c.fetchall()
     finally:
         conn.close()
 
+    catalog_cache.put_rows(rows, gen)
+    catalog_cache.put_page(page_key, [row['music_no'] for row in rows], gen)
+    return rows
 
-def find_genre_no_by_name(name):
+
+def count_all_approx():
+    """전체 곡 수 추정치 (information_schema 통계, COUNT(*) 스캔 없음)"""
     conn = get_connection()
     try:
         with conn.cursor() as c:
             c.execute(
-                "SELECT genre_no FROM genre WHERE name = %s",
-                (name,)
+                """
+                SELECT TABLE_ROWS AS cnt FROM information_schema.TABLES
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'music'
+                """
             )
             row = c.fetchone()
-            return row['genre_no'] if row else None
+            return int(row['cnt'] or 0) if row else 0
     finally:
         conn.close()
 
 
-def find_by_spotify_track_id(track_id):
+def count_by_genre_no(genre_no):
+    """장르별 곡 수 (genre_no 인덱스 범위 COUNT)"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute("SELECT COUNT(*) AS cnt FROM music WHERE genre_no = %s", (genre_no,))
+            return c.fetchone()['cnt']
+    finally:
+        conn.close()
+
+
+def find_by_music_nos(music_nos, columns=MUSIC_CARD_COLUMNS):
+    """
+    music_no 목록으로 조회 (입력 순서 유지, 없는 번호는 제외, catalog_cache 우선)
+    - columns: 조회 컬럼, 캐시 행에 없는 컬럼이 있으면 DB에서 다시 조회
+    """
+    if not music_nos:
+        return []
+
+    columns = tuple(dict.fromkeys(MUSIC_KEY_COLUMNS + tuple(columns)))
+    rows, missing = catalog_cache.get_rows(music_nos, columns)
+    if missing:
+        gen = catalog_cache.generation()
+        conn = get_connection()
+        try:
+            with conn.cursor() as c:
+                placeholders = ",".join(["%s"] * len(missing))
+                c.execute(
+                    f"SELECT {_select_list(columns)} FROM music WHERE music_no IN ({placeholders})",
+                    tuple(missing)
+                )
+                fetched = c.fetchall()
+        finally:
+            conn.close()
+        catalog_cache.put_rows(fetched, gen)
+        rows.update((row['music_no'], row) for row in fetched)
+    return [rows[no] for no in music_nos if no in rows]
+
+
+def find_by_spotify_track_id(track_id, columns=MUSIC_DETAIL_COLUMNS):
     conn = get_connection()
     try:
         with conn.cursor() as c:
             c.execute(
-                "SELECT * FROM music WHERE spotify_track_id = %s",
+                f"SELECT {_select_list(columns)} FROM music WHERE spotify_track_id = %s",
                 (track_id,)
             )
             return c.fetchone()
@@ -117,9 +423,158 @@ def update_preview_url(music_no, preview_url):
                 (preview_url, music_no)
             )
             conn.commit()
+            catalog_cache.invalidate_rows([music_no])
             return True
     except Exception as e:
         print(f"preview_url 업데이트 실패: {e}")
         return False
     finally:
         conn.close()
+
+
+def find_enrichment_by_music_nos(music_nos):
+    """보강(preview/장르) 상태 조회 (입력 순서 유지)"""
+    if not music_nos:
+        return []
+
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            placeholders = ",".join(["%s"] * len(music_nos))
+            c.execute(
+                f"""
+                SELECT music_no, genre_no, preview_url, is_enriched
+                FROM music WHERE music_no IN ({placeholders})
+                """,
+                tuple(music_nos)
+            )
+            rows = {row['music_no']: row for row in c.fetchall()}
+            return [rows[no] for no in music_nos if no in rows]
+    finally:
+        conn.close()
+
+
+def find_pending_enrichment_music_nos(limit=200, after_music_no=0):
+    """보강 대기 중인 music_no 목록 (music_no 순 keyset 조회)"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute(
+                "SELECT music_no FROM music WHERE is_enriched = 0 AND music_no > %s ORDER BY music_no LIMIT %s",
+                (after_music_no, limit)
+            )
+            return [row['music_no'] for row in c.fetchall()]
+    finally:
+        conn.close()
+
+
+def _lock_without_genre(c, music_nos):
+    """genre_no가 비어 있는 행 잠금 → {music_no: popularity} (장르가 새로 채워지는 행 판별용)"""
+    if not music_nos:
+        return {}
+    placeholders = ",".join(["%s"] * len(music_nos))
+    c.execute(
+        f"SELECT music_no, popularity FROM music WHERE music_no IN ({placeholders}) AND genre_no IS NULL FOR UPDATE",
+        tuple(music_nos)
+    )
+    return {row['music_no']: row['popularity'] for row in c.fetchall()}
+
+
+def _genre_added(rows, without_genre):
+    """(music_no, genre_no, ...) 목록 중 genre_no가 새로 채워지는 행 → genre_stats 변경 목록 (행마다 첫 값)"""
+    added = {}
+    for music_no, genre_no, *_ in rows:
+        if genre_no and music_no in without_genre:
+            added.setdefault(music_no, genre_no)
+    return [(music_no, genre_no, without_genre[music_no], True) for music_no, genre_no in added.items()]
+
+
+def update_enrichment_many(rows):
+    """
+    보강 결과 일괄 반영 (rows: [(music_no, genre_no, preview_url, is_done), ...])
+    이미 값이 있는 컬럼은 덮어쓰지 않음
+    is_done이 거짓인 행(조회 실패)은 is_enriched를 그대로 두어 다음 재등록 때 다시 보강
+    """
+    if not rows:
+        return 0
+
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            without_genre = _lock_without_genre(c, [music_no for music_no, *_ in rows])
+            c.executemany(
+                """
+                UPDATE music
+                SET genre_no = COALESCE(genre_no, %s),
+                    preview_url = COALESCE(preview_url, %s),
+                    is_enriched = GREATEST(is_enriched, %s)
+                WHERE music_no = %s
+                """,
+                [
+                    (genre_no, preview_url, 1 if is_done else 0, music_no)
+                    for music_no, genre_no, preview_url, is_done in rows
+                ]
+            )
+            stale_genres = genre_stats.apply_changes(c, _genre_added(rows, without_genre))
+            conn.commit()
+            genre_stats.refresh_top(conn, stale_genres)
+            # genre_no가 채워지면 장르별 목록 구성이 바뀜
+            catalog_cache.invalidate_pages()
+            catalog_cache.invalidate_rows([music_no for music_no, *_ in rows])
+            return len(rows)
+    except Exception as e:
+        print(f"보강 결과 저장 실패: {e}")
+        return 0
+    finally:
+        conn.close()
+
+
+def find_missing_genre(after_music_no=0, limit=200):
+    """genre_no가 비어 있는 행 (music_no 순 keyset 조회)"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute(
+                """
+                SELECT music_no, spotify_url, spotify_track_id, spotify_artist_id
+                FROM music
+                WHERE genre_no IS NULL AND music_no > %s
+                ORDER BY music_no
+                LIMIT %s
+                """,
+                (after_music_no, limit)
+            )
+            return c.fetchall()
+    finally:
+        conn.close()
+
+
+def update_genre_many(rows):
+    """
+    장르 backfill 결과 반영 (rows: [(music_no, genre_no, spotify_artist_id), ...])
+    genre_no를 찾지 못한 행도 spotify_artist_id는 저장, 반환: genre_no가 채워진 행 수
+    """
+    if not rows:
+        return 0
+
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            without_genre = _lock_without_genre(c, [music_no for music_no, _, _ in rows])
+            c.executemany(
+                """
+                UPDATE music
+                SET genre_no = COALESCE(genre_no, %s),
+                    spotify_artist_id = COALESCE(spotify_artist_id, %s)
+                WHERE music_no = %s
+                """,
+                [(genre_no, artist_id, music_no) for music_no, genre_no, artist_id in rows]
+            )
+            stale_genres = genre_stats.apply_changes(c, _genre_added(rows, without_genre))
+            conn.commit()
+            genre_stats.refresh_top(conn, stale_genres)
+            catalog_cache.invalidate_pages()
+            catalog_cache.invalidate_rows([music_no for music_no, _, _ in rows])
+            return sum(1 for _, genre_no, _ in rows if genre_no)
+    finally:
+        conn.close()
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from db import get_connection
+from model import music as music_model
 
 
 def insert_music_to_playlist(playlist_no: int, music_no: int) -> bool:
@@ -43,23 +44,28 @@ def delete_all_music_from_playlist(playlist_no: int) -> bool:
         conn.close()
 
 
+MUSIC_LIST_COLUMNS = ("track_name", "artist_name", "album_name", "album_image_url", "duration_ms")
+
+
 def find_by_playlist_no(playlist_no: int):
-    """플레이리스트의 음악 목록 조회"""
+    """플레이리스트의 음악 목록 조회 (곡 정보는 music 행 캐시에서 조립)"""
     conn = get_connection()
     try:
         with conn.cursor() as cursor:
-            sql = """
-                SELECT ml.playlist_no, ml.music_no, m.track_name, m.artist_name, 
-                       m.album_name, m.album_image_url, m.duration_ms
-                FROM music_list ml
-                LEFT JOIN music m ON ml.music_no = m.music_no
-                WHERE ml.playlist_no = %s
-            """
+            sql = "SELECT playlist_no, music_no FROM music_list WHERE playlist_no = %s"
             cursor.execute(sql, (playlist_no,))
-            return cursor.fetchall()
+            items = cursor.fetchall()
     finally:
         conn.close()
 
+    musics = {m['music_no']: m for m in music_model.find_by_music_nos(
+        [item['music_no'] for item in items], MUSIC_LIST_COLUMNS
+    )}
+    for item in items:
+        music = musics.get(item['music_no']) or {}
+        item.update({col: music.get(col) for col in MUSIC_LIST_COLUMNS})
+    return items
+
 
 def find_by_music_no(music_no: int):
     """특정 음악이 포함된 플레이리스트 목록 조회"""
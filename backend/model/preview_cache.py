@@ -0,0 +1,51 @@
+from db import get_connection
+
+
+def find_by_keys(cache_keys):
+    """cache_key 목록으로 preview 캐시 조회 → {cache_key: row}"""
+    if not cache_keys:
+        return {}
+
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            placeholders = ",".join(["%s"] * len(cache_keys))
+            sql = f"""
+            SELECT cache_key, preview_url, miss_count, expires_at
+            FROM preview_cache
+            WHERE cache_key IN ({placeholders})
+            """
+            c.execute(sql, tuple(cache_keys))
+            return {row['cache_key']: row for row in c.fetchall()}
+    finally:
+        conn.close()
+
+
+def upsert_many(entries):
+    """
+    preview 캐시 일괄 저장
+    entries: [(cache_key, track_name, artist_name, preview_url, miss_count, expires_at), ...]
+    """
+    if not entries:
+        return 0
+
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            sql = """
+            INSERT INTO preview_cache
+            (cache_key, track_name, artist_name, preview_url, miss_count, expires_at)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+              preview_url = VALUES(preview_url),
+              miss_count = VALUES(miss_count),
+              expires_at = VALUES(expires_at)
+            """
+            c.executemany(sql, entries)
+            conn.commit()
+            return len(entries)
+    except Exception as e:
+        print(f"  ❌ preview 캐시 저장 실패: {e}")
+        return 0
+    finally:
+        conn.close()
@@ -0,0 +1,93 @@
+from db import get_connection
+from model.music import MUSIC_CARD_COLUMNS
+
+
+def insert_snapshot(playlist_id, ranked_music_nos):
+    """
+    스냅샷 + 순위 목록을 한 트랜잭션으로 저장, snapshot_no 반환
+    ranked_music_nos: [(차트 순위, music_no), ...] (저장 못 한 곡의 순위는 비어 있음)
+    """
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute(
+                "INSERT INTO top50_snapshot (playlist_id, track_count, fetched_at) VALUES (%s, %s, NOW())",
+                (playlist_id, len(ranked_music_nos))
+            )
+            snapshot_no = c.lastrowid
+            c.executemany(
+                "INSERT INTO top50_snapshot_item (snapshot_no, rank_no, music_no) VALUES (%s, %s, %s)",
+                [(snapshot_no, rank, music_no) for rank, music_no in ranked_music_nos]
+            )
+            conn.commit()
+            return snapshot_no
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def find_latest():
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute("SELECT * FROM top50_snapshot ORDER BY snapshot_no DESC LIMIT 1")
+            return c.fetchone()
+    finally:
+        conn.close()
+
+
+def find_by_snapshot_no(snapshot_no):
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute("SELECT * FROM top50_snapshot WHERE snapshot_no = %s", (snapshot_no,))
+            return c.fetchone()
+    finally:
+        conn.close()
+
+
+def find_items(snapshot_no):
+    """스냅샷 순위대로 음악 조회"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            columns = ", ".join(f"m.{col}" for col in MUSIC_CARD_COLUMNS)
+            sql = f"""
+            SELECT i.rank_no, {columns}
+            FROM top50_snapshot_item i
+            JOIN music m ON i.music_no = m.music_no
+            WHERE i.snapshot_no = %s
+            ORDER BY i.rank_no
+            """
+            c.execute(sql, (snapshot_no,))
+            return c.fetchall()
+    finally:
+        conn.close()
+
+
+def list_snapshots(limit=20, offset=0):
+    """지난 스냅샷 목록 (최신순)"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute(
+                "SELECT * FROM top50_snapshot ORDER BY snapshot_no DESC LIMIT %s OFFSET %s",
+                (limit, offset)
+            )
+            return c.fetchall()
+    finally:
+        conn.close()
+
+
+def seconds_since_latest():
+    """가장 최근 스냅샷 이후 경과 시간(초), 스냅샷이 없으면 None"""
+    conn = get_connection()
+    try:
+        with conn.cursor() as c:
+            c.execute("SELECT TIMESTAMPDIFF(SECOND, MAX(fetched_at), NOW()) AS age FROM top50_snapshot")
+            row = c.fetchone()
+            return row['age'] if row else None
+    finally:
+        conn.close()
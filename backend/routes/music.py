@@ -9,19 +9,49 @@ def search_music():
     return music_controller.search_music()
 
 
+@music_bp.route('/suggest', methods=['GET'])
+def suggest_music():
+    return music_controller.suggest_music()
+
+
 @music_bp.route('', methods=['GET'])
 def get_music_list():
     return music_controller.get_music_list()
 
 
+@music_bp.route('/genres', methods=['GET'])
+def get_genres():
+    return music_controller.get_genres()
+
+
 @music_bp.route('/top50', methods=['GET'])
 def get_global_top_50():
     return music_controller.get_global_top_50()
 
+@music_bp.route('/top50/snapshots', methods=['GET'])
+def get_top50_snapshots():
+    return music_controller.get_top50_snapshots()
+
+@music_bp.route('/top50/snapshots/<int:snapshot_no>', methods=['GET'])
+def get_top50_snapshot(snapshot_no):
+    return music_controller.get_top50_snapshot(snapshot_no)
+
 @music_bp.route('/bulk-import', methods=['POST'])
 def bulk_import():
     return music_controller.bulk_import()
 
+@music_bp.route('/import-jobs/<int:job_no>', methods=['GET'])
+def get_import_job(job_no):
+    return music_controller.get_import_job(job_no)
+
+@music_bp.route('/import-jobs/<int:job_no>/retry', methods=['POST'])
+def retry_import_job(job_no):
+    return music_controller.retry_import_job(job_no)
+
+@music_bp.route('/enrichment', methods=['GET'])
+def get_enrichment():
+    return music_controller.get_enrichment()
+
 @music_bp.route('/preview', methods=['GET'])
 def get_preview_url():
     return music_controller.get_preview_url()
@@ -1,135 +1,218 @@
-# seed_music.py - Spotify API를 사용한 music 테이블 테스트 데이터 삽입
+# seed_music.py - Spotify API를 사용한 music 테이블 스테이징 카탈로그 생성
+# 실행: python seed_music.py --per-query 1000 --workers 4
+#   - 장르 × 연도 구간별 검색을 worker pool에서 동시에 실행, 각 검색은 50곡씩 페이지 조회
+#   - 페이지마다 upsert_music_many()로 한 트랜잭션에 저장 (spotify_track_id 유니크 키로 중복 처리)
+#   - 저장 실패한 페이지는 재시도 후에도 실패하면 해당 쿼리만 멈춤 (다른 쿼리는 계속, 다음 실행에서 재개)
+#   - 진행 상황을 상태 파일에 저장 → 중단 후 다시 실행하면 이어서 진행 (--reset으로 처음부터)
+import argparse
+import json
 import os
-import spotipy
-from spotipy.oauth2 import SpotifyClientCredentials
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from dotenv import load_dotenv
-from db import connect_to_mysql
 
 load_dotenv()
 
-# Spotify 클라이언트 설정
-sp = spotipy.Spotify(auth_manager=SpotifyClientCredentials(
-    client_id=os.getenv('SPOTIFY_CLIENT_ID'),
-    client_secret=os.getenv('SPOTIFY_CLIENT_SECRET')
-))
-
-# DB 연결
-def get_conn():
-    return connect_to_mysql(
-        os.getenv("DB_HOST"),
-        int(os.getenv("DB_PORT")),
-        os.getenv("DB_USER"),
-        os.getenv("DB_PASSWORD"),
-        os.getenv("DB_DATABASE")
-    )
-
-# 장르별 검색 키워드 (다양한 음악 수집)
-SEARCH_QUERIES = [
-    ("K-pop", 15),      # K-pop 15곡
-    ("Pop", 15),        # Pop 15곡
-    ("Hip hop", 10),    # Hip hop 10곡
-    ("R&B", 10),        # R&B 10곡
-    ("Rock", 10),       # Rock 10곡
-    ("Jazz", 5),        # Jazz 5곡
-    ("Electronic", 5),  # Electronic 5곡
+from db import get_connection
+from model import music as music_model
+from services import gateway, spotify_client
+
+# (우리 장르 이름, Spotify genre 검색 태그)
+SEED_GENRES = [
+    ("K-Pop", "k-pop"),
+    ("Pop", "pop"),
+    ("Hip-Hop", "hip-hop"),
+    ("R&B", "r&b"),
+    ("Rock", "rock"),
+    ("Jazz", "jazz"),
+    ("Electronic", "edm"),
+    ("Metal", "metal"),
+    ("Indie", "indie"),
+    ("Classical", "classical"),
 ]
 
-def get_or_create_genre(conn, genre_name):
-    """장르 번호 조회 (없으면 생성)"""
-    with conn.cursor() as c:
-        c.execute("SELECT genre_no FROM genre WHERE name = %s", (genre_name,))
-        row = c.fetchone()
-        if row:
-            return row['genre_no']
-        
-        # 장르 생성
-        c.execute("INSERT INTO genre (name) VALUES (%s)", (genre_name,))
-        conn.commit()
-        return c.lastrowid
-
-def fetch_tracks_from_spotify(query, limit):
-    """Spotify에서 트랙 검색"""
-    results = sp.search(q=query, type='track', limit=limit, market='KR')
-    tracks = []
-    
-    for item in results['tracks']['items']:
-        tracks.append({
-            'track_name': item['name'],
-            'artist_name': ', '.join([a['name'] for a in item['artists']]),
-            'album_name': item['album']['name'],
-            'album_image_url': item['album']['images'][0]['url'] if item['album']['images'] else None,
-            'duration_ms': item['duration_ms'],
-            'popularity': item['popularity'],
-            'spotify_url': item['external_urls']['spotify']
-        })
-    
-    return tracks
-
-def insert_music(conn, music_data, genre_no):
-    """음악 데이터 삽입 (중복 체크)"""
-    with conn.cursor() as c:
-        # 중복 체크
-        c.execute("SELECT music_no FROM music WHERE spotify_url = %s", (music_data['spotify_url'],))
-        if c.fetchone():
-            print(f"  ⏭️  중복 스킵: {music_data['track_name']}")
-            return False
-        
-        sql = """
-        INSERT INTO music 
-        (track_name, artist_name, album_name, album_image_url, duration_ms, popularity, spotify_url, genre_no)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        c.execute(sql, (
-            music_data['track_name'],
-            music_data['artist_name'],
-            music_data['album_name'],
-            music_data['album_image_url'],
-            music_data['duration_ms'],
-            music_data['popularity'],
-            music_data['spotify_url'],
-            genre_no
-        ))
-        conn.commit()
-        print(f"  ✅ 저장: {music_data['track_name']} - {music_data['artist_name']}")
-        return True
+# Spotify 검색은 쿼리당 offset 1000까지만 가능 → 연도 구간으로 나눠서 더 많이 수집
+YEAR_RANGES = ["2020-2025", "2015-2019", "2010-2014", "2000-2009", "1990-1999"]
 
-def main():
-    print("🎵 Spotify 음악 데이터 삽입 시작...")
-    print("=" * 50)
-    
-    conn = get_conn()
-    if not conn:
-        print("❌ DB 연결 실패")
-        return
-    
-    total_inserted = 0
-    
+PAGE_SIZE = 50
+MAX_SEARCH_OFFSET = 1000
+SAVE_RETRIES = 2  # 페이지 저장 실패 시 재시도 횟수
+DEFAULT_STATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".seed_state.json")
+
+
+def get_or_create_genre(genre_name):
+    """장르 번호 조회 (없으면 생성)"""
+    conn = get_connection()
     try:
-        for genre_name, count in SEARCH_QUERIES:
-            print(f"\n📂 [{genre_name}] {count}곡 수집 중...")
-            
-            # 장르 번호 가져오기/생성
-            genre_no = get_or_create_genre(conn, genre_name)
-            
-            # Spotify에서 트랙 가져오기
-            tracks = fetch_tracks_from_spotify(genre_name, count)
-            
-            for track in tracks:
-                if insert_music(conn, track, genre_no):
-                    total_inserted += 1
-                
-                # 70개 도달 시 종료
-                if total_inserted >= 70:
-                    break
-            
-            if total_inserted >= 70:
-                break
-    
+        with conn.cursor() as c:
+            c.execute("SELECT genre_no FROM genre WHERE name = %s", (genre_name,))
+            row = c.fetchone()
+            if row:
+                return row['genre_no']
+
+            # 장르 생성
+            c.execute("INSERT INTO genre (name) VALUES (%s)", (genre_name,))
+            conn.commit()
+            return c.lastrowid
     finally:
         conn.close()
-    
+
+
+def to_music(item, genre_no):
+    """Spotify track → music 행"""
+    artists = item.get('artists') or []
+    images = (item.get('album') or {}).get('images') or []
+    return {
+        'track_name': item['name'],
+        'artist_name': ', '.join([a['name'] for a in artists]),
+        'album_name': item['album']['name'],
+        'album_image_url': images[0]['url'] if images else None,
+        'duration_ms': item['duration_ms'],
+        'popularity': item['popularity'],
+        'spotify_url': item['external_urls']['spotify'],
+        'spotify_track_id': item['id'],
+        'spotify_artist_id': artists[0]['id'] if artists else None,
+        'genre_no': genre_no,
+    }
+
+
+class SeedState:
+    """작업 단위(쿼리)별 다음 offset / 완료 여부를 파일에 저장"""
+
+    def __init__(self, path, reset=False):
+        self.path = path
+        self.lock = threading.Lock()
+        self.units = {}
+        if not reset and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.units = json.load(f)
+
+    def get(self, query):
+        with self.lock:
+            return dict(self.units.get(query) or {"offset": 0, "done": False})
+
+    def update(self, query, offset, done):
+        with self.lock:
+            self.units[query] = {"offset": offset, "done": done}
+            tmp = self.path + ".tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.units, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.path)
+
+
+class SeedStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pages = self.fetched = self.inserted = self.existing = self.failed_pages = 0
+
+    def add_page(self, fetched, inserted):
+        with self.lock:
+            self.pages += 1
+            self.fetched += fetched
+            self.inserted += inserted
+            self.existing += fetched - inserted
+
+
+def save_page(query, offset, musics):
+    """
+    페이지 저장, DB 오류는 SAVE_RETRIES회까지 다시 시도 (deadlock은 upsert_music_many 안에서도 재시도)
+    반환: upsert 결과, 끝내 실패하면 None
+    """
+    for attempt in range(SAVE_RETRIES + 1):
+        try:
+            return music_model.upsert_music_many(musics)
+        except Exception as e:
+            print(f"  ❌ [{query}] offset {offset} 저장 실패 ({attempt + 1}/{SAVE_RETRIES + 1}): {e}")
+            if attempt < SAVE_RETRIES:
+                time.sleep(2 ** attempt)
+    return None
+
+
+def seed_query(sp, query, genre_no, per_query, state, stats):
+    """쿼리 하나를 페이지 단위로 끝까지 수집 (state의 offset부터 이어서)"""
+    unit = state.get(query)
+    if unit["done"]:
+        return
+    offset = unit["offset"]
+    limit = min(per_query, MAX_SEARCH_OFFSET)
+
+    while offset < limit:
+        try:
+            results = sp.search(q=query, type='track', limit=PAGE_SIZE, offset=offset, market='KR')
+        except Exception as e:
+            with stats.lock:
+                stats.failed_pages += 1
+            print(f"  ❌ [{query}] offset {offset} 조회 실패: {e}")
+            return  # state에 offset이 남아 있으므로 다음 실행에서 재개
+
+        items = [i for i in ((results.get('tracks') or {}).get('items') or []) if i]
+        if not items:
+            break
+
+        musics = [to_music(item, genre_no) for item in items]
+        rows = save_page(query, offset, musics)
+        if rows is None:
+            with stats.lock:
+                stats.failed_pages += 1
+            return  # offset을 올리지 않음 → 다음 실행에서 이 페이지부터 재개
+        inserted = sum(1 for row in rows if row['is_new'])
+        stats.add_page(len(musics), inserted)
+
+        offset += PAGE_SIZE
+        state.update(query, offset, done=False)
+        print(f"  ✅ [{query}] offset {offset}: {len(musics)}곡 (신규 {inserted}곡)")
+
+    state.update(query, offset, done=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spotify 검색으로 music 카탈로그 시드")
+    parser.add_argument("--per-query", type=int, default=MAX_SEARCH_OFFSET,
+                        help="쿼리(장르×연도 구간)당 최대 곡 수 (최대 1000)")
+    parser.add_argument("--workers", type=int, default=4, help="동시에 실행할 쿼리 수")
+    parser.add_argument("--state-file", default=DEFAULT_STATE_FILE)
+    parser.add_argument("--reset", action="store_true", help="진행 상황을 무시하고 처음부터")
+    args = parser.parse_args()
+
+    print("🎵 Spotify 음악 데이터 시드 시작...")
+    print("=" * 50)
+
+    sp = spotify_client.get_client()
+    state = SeedState(args.state_file, reset=args.reset)
+    stats = SeedStats()
+
+    units = []
+    for genre_name, tag in SEED_GENRES:
+        genre_no = get_or_create_genre(genre_name)
+        for years in YEAR_RANGES:
+            units.append((f'genre:"{tag}" year:{years}', genre_no))
+
+    pending = [(q, g) for q, g in units if not state.get(q)["done"]]
+    print(f"📂 쿼리 {len(units)}개 중 {len(pending)}개 진행 (workers {args.workers})")
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = [
+            executor.submit(seed_query, sp, query, genre_no, args.per_query, state, stats)
+            for query, genre_no in pending
+        ]
+        for future in as_completed(futures):
+            future.result()
+    elapsed = time.monotonic() - started
+
     print("\n" + "=" * 50)
-    print(f"🎉 완료! 총 {total_inserted}개 음악 데이터 삽입됨")
+    print(f"🎉 완료! {elapsed:.1f}초")
+    print(f"  페이지 {stats.pages}개 (실패 {stats.failed_pages}개)")
+    print(f"  가져온 곡 {stats.fetched}곡 → 신규 {stats.inserted}곡 / 기존 {stats.existing}곡")
+    if elapsed > 0:
+        print(f"  처리량 {stats.fetched / elapsed:.1f}곡/초 (신규 저장 {stats.inserted / elapsed:.1f}곡/초)")
+    print(f"  Spotify: {spotify_client.get_stats()}")
+    print(f"  Gateway: {gateway.get_state().get('spotify')}")
+    if stats.failed_pages:
+        print("  ⚠️  실패한 쿼리는 다시 실행하면 이어서 진행됩니다.")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,322 @@
+# backend/services/catalog_index.py
+"""
+로컬 검색 색인 공용 레지스트리 (프로세스 메모리)
+- music 테이블을 한 번만 읽어서 등록된 색인(catalog_search / fuzzy_index / hangul_index / suggest_index)에 전달
+- 공용 popularity 표: music_no → popularity (bytearray, 곡 하나당 1바이트, 0 = 색인 안 됨)
+- 공용 이름 표: track / artist 이름(중복 제거)마다 id, 표시용 이름, KIND 비트, 곡 목록, 최고 popularity / 대표 곡
+  → 이름 기반 색인은 자기 키 구조에 이름 id만 저장
+- add(): 신규 곡 색인 + 이미 색인된 곡의 popularity 갱신 (저장 경로 save_tracks에서 호출)
+  바뀐 이름은 색인의 update_names()로 알림, 이름 안 곡 순서(ranked_musics)는 다음 조회 때 다시 정렬
+- warm-up 시점 (CATALOG_INDEX_WARM_UP)
+    lazy(기본)  첫 로컬 검색 / 자동완성 요청 때 시작 (ensure_started()) → 검색하지 않는 worker는 메모리/DB 부하 없음
+    eager       프로세스 시작 시 (app.py)
+    off         사용 안 함 → 색인이 준비되지 않은 상태 그대로, 검색은 Spotify로 처리
+  준비 전에는 각 색인의 is_ready()가 False → 검색 경로가 Spotify 검색으로 대체
+- warm-up 뒤에는 CATALOG_INDEX_REFRESH_SECONDS마다 다른 프로세스가 저장한 곡도 추가
+  AUTO_INCREMENT 순서와 commit 순서는 다름 → 직전 갱신 시작 때의 마지막 music_no와
+  CATALOG_INDEX_REFRESH_OVERLAP개 아래 중 더 앞에서부터 다시 읽음 (이미 색인된 곡은 popularity만 갱신)
+
+색인 모듈 hook (없으면 건너뜀, 레지스트리 잠금 안에서 호출)
+    begin_bulk() / end_bulk(ok)   warm-up 시작 / 끝 (ok=False면 색인을 준비되지 않은 상태로 둠)
+    index_musics(musics)          새로 색인할 music 행
+    index_names(name_ids)         새로 만든 이름
+    update_names(name_ids)        KIND 비트나 최고 popularity가 바뀐 기존 이름
+"""
+
+from array import array
+import os
+import threading
+import time
+
+from model import music as music_model
+from services import hangul
+
+CATALOG_INDEX_REFRESH_SECONDS = int(os.getenv("CATALOG_INDEX_REFRESH_SECONDS", 300))
+CATALOG_INDEX_REFRESH_OVERLAP = int(os.getenv("CATALOG_INDEX_REFRESH_OVERLAP", 1000))
+CATALOG_INDEX_WARM_UP = os.getenv("CATALOG_INDEX_WARM_UP", "lazy").lower()
+
+KIND_TRACK = 1
+KIND_ARTIST = 2
+
+_indexes = []
+_popularity = bytearray()  # music_no → popularity + 1 (0 = 색인 안 됨)
+_count = 0                 # 색인된 곡 수
+_max_music_no = 0          # 색인된 가장 큰 music_no
+_rescan_after = 0          # 다음 갱신 시작 위치 후보 (직전 갱신 시작 때의 _max_music_no)
+_name_ids = {}             # 정규화 이름 → 이름 id
+_name_texts = []           # 이름 id → 화면 표시용 이름 (처음 저장된 표기)
+_name_kinds = bytearray()  # 이름 id → KIND 비트
+_name_musics = []          # 이름 id → array("I", [music_no, ...])
+_name_popularity = bytearray()  # 이름 id → 해당 이름 곡들의 최고 popularity
+_name_music = array("I")   # 이름 id → 최고 popularity 곡 music_no
+_ranked = {}               # 이름 id → popularity 순 music_no 목록 (조회 시 생성, 곡/popularity 변경 시 삭제)
+_lock = threading.RLock()
+_ranked_lock = threading.Lock()  # _ranked 전용 (다른 잠금을 잡지 않음 → 색인 잠금 안에서도 사용)
+_bulk = False
+_warm_started = False
+_stats = {"added": 0, "popularity_updates": 0, "refreshes": 0}
+
+
+def register(*indexes):
+    """색인 모듈 등록 (warm-up 시작 전에 호출)"""
+    with _lock:
+        for index in indexes:
+            if index not in _indexes:
+                _indexes.append(index)
+
+
+def _call(hook, *args):
+    for index in _indexes:
+        fn = getattr(index, hook, None)
+        if fn is not None:
+            fn(*args)
+
+
+def name_key(text):
+    """이름 중복 제거 키: 정규화 후 기호/공백을 공백 하나로 ("AC/DC" = "ac dc")"""
+    return " ".join(hangul.words(text))
+
+
+def music_names(music):
+    """music 행 → [(이름 표기, KIND), ...] (시드 데이터는 "A, B" 형태로 여러 아티스트 저장)"""
+    names = []
+    if (music.get("track_name") or "").strip():
+        names.append((music["track_name"].strip(), KIND_TRACK))
+    for artist in (music.get("artist_name") or "").split(","):
+        if artist.strip():
+            names.append((artist.strip(), KIND_ARTIST))
+    return names
+
+
+def popularity(music_no):
+    """색인된 곡의 popularity (색인 안 된 곡은 0)"""
+    return _popularity[music_no] - 1 if music_no < len(_popularity) and _popularity[music_no] else 0
+
+
+def is_indexed(music_no):
+    return music_no < len(_popularity) and _popularity[music_no] > 0
+
+
+def count():
+    return _count
+
+
+def name_text(name_id):
+    return _name_texts[name_id]
+
+
+def name_kinds(name_id):
+    return _name_kinds[name_id]
+
+
+def name_popularity(name_id):
+    return _name_popularity[name_id]
+
+
+def name_music(name_id):
+    """이름의 최고 popularity 곡 music_no"""
+    return _name_music[name_id]
+
+
+def name_music_count(name_id):
+    return len(_name_musics[name_id])
+
+
+def ranked_musics(name_id):
+    """이름의 곡 목록 popularity 순 (캐시)"""
+    with _ranked_lock:
+        ranked = _ranked.get(name_id)
+        if ranked is None:
+            ranked = sorted(_name_musics[name_id], key=lambda no: -popularity(no))
+            _ranked[name_id] = ranked
+        return ranked
+
+
+def _forget_ranked(name_ids=None):
+    """name_ids=None → 전체"""
+    with _ranked_lock:
+        if name_ids is None:
+            _ranked.clear()
+        for name_id in name_ids or ():
+            _ranked.pop(name_id, None)
+
+
+def _set_popularity(music_no, value):
+    if music_no >= len(_popularity):
+        _popularity.extend(bytes(music_no + 1 - len(_popularity) + 1024))
+    _popularity[music_no] = value + 1
+
+
+def _add_name(text, kind, music_no, value, created, changed, reordered):
+    key = name_key(text)
+    if not key:
+        return
+    name_id = _name_ids.get(key)
+    if name_id is None:
+        name_id = len(_name_texts)
+        _name_ids[key] = name_id
+        _name_texts.append(text)
+        _name_kinds.append(kind)
+        _name_musics.append(array("I", [music_no]))
+        _name_popularity.append(value)
+        _name_music.append(music_no)
+        created.append(name_id)
+        return
+
+    if _name_musics[name_id][-1] != music_no:  # 곡 이름 = 아티스트 이름인 곡은 한 번만
+        _name_musics[name_id].append(music_no)
+    is_changed = not _name_kinds[name_id] & kind
+    _name_kinds[name_id] |= kind
+    if value > _name_popularity[name_id]:
+        _name_popularity[name_id] = value
+        _name_music[name_id] = music_no
+        is_changed = True
+    if is_changed:
+        changed.add(name_id)
+    reordered.add(name_id)
+
+
+def _update_name_popularity(text, music_no, value, changed, reordered):
+    name_id = _name_ids.get(name_key(text))
+    if name_id is None:
+        return
+    reordered.add(name_id)
+    if value > _name_popularity[name_id]:
+        _name_popularity[name_id] = value
+        _name_music[name_id] = music_no
+        changed.add(name_id)
+    elif _name_music[name_id] == music_no and value < _name_popularity[name_id]:
+        # 대표 곡 popularity가 내려감 → 이름의 곡 전체에서 최고값 다시 계산
+        best = max(_name_musics[name_id], key=popularity)
+        _name_popularity[name_id] = popularity(best)
+        _name_music[name_id] = best
+        changed.add(name_id)
+
+
+def add(musics):
+    """
+    music 행 목록 반영 (music_no, track_name, artist_name, album_name, popularity)
+    - 색인 안 된 곡 → 공용 표에 추가 후 색인들에 전달
+    - 이미 색인된 곡 → popularity만 갱신 (이름은 저장 후 바뀌지 않음)
+    """
+    global _count, _max_music_no
+    with _lock:
+        new_musics, created, changed, reordered = [], [], set(), set()
+        for music in musics:
+            music_no = music.get("music_no")
+            if not music_no:
+                continue
+            value = min(max(int(music.get("popularity") or 0), 0), 100)
+            if is_indexed(music_no):
+                if popularity(music_no) == value:
+                    continue
+                _set_popularity(music_no, value)
+                _stats["popularity_updates"] += 1
+                for text, _ in music_names(music):
+                    _update_name_popularity(text, music_no, value, changed, reordered)
+                continue
+
+            _set_popularity(music_no, value)
+            _count += 1
+            _max_music_no = max(_max_music_no, music_no)
+            new_musics.append(music)
+            for text, kind in music_names(music):
+                _add_name(text, kind, music_no, value, created, changed, reordered)
+
+        _stats["added"] += len(new_musics)
+        if not _bulk:
+            _forget_ranked(reordered)
+        changed.difference_update(created)
+        if new_musics:
+            _call("index_musics", new_musics)
+        if created:
+            _call("index_names", created)
+        if changed:
+            _call("update_names", sorted(changed))
+
+
+def warm_up(batch_size=5000):
+    """music 테이블 전체를 한 번 읽어 등록된 색인 모두 채움 → 완료 후 각 색인 사용 시작"""
+    global _bulk, _rescan_after
+    loaded = 0
+    ok = False
+    with _lock:
+        _bulk = True
+        _call("begin_bulk")
+    try:
+        for rows in music_model.iter_catalog_text(batch_size):
+            add(rows)
+            loaded += len(rows)
+        ok = True
+    except Exception as e:
+        # 준비되지 않은 상태 → 검색은 Spotify로 처리 (기존 동작)
+        print(f"로컬 검색 색인 warm-up 실패: {e}")
+    with _lock:
+        _bulk = False
+        _rescan_after = _max_music_no
+        _forget_ranked()
+        _call("end_bulk", ok)
+    if ok:
+        print(f"✅ 로컬 검색 색인 warm-up 완료: {loaded}곡, 이름 {len(_name_texts)}개")
+    return ok
+
+
+def refresh(batch_size=5000):
+    """warm-up 이후 다른 프로세스(시드/backfill 스크립트, 다른 worker)가 저장한 곡 추가 (겹치는 구간은 다시 읽음)"""
+    global _rescan_after
+    loaded = 0
+    try:
+        started_at = _max_music_no
+        after = max(min(_rescan_after, started_at - CATALOG_INDEX_REFRESH_OVERLAP), 0)
+        for rows in music_model.iter_catalog_text(batch_size, after):
+            add(rows)
+            loaded += len(rows)
+        with _lock:
+            _rescan_after = started_at
+            _stats["refreshes"] += 1
+    except Exception as e:
+        print(f"로컬 검색 색인 갱신 실패: {e}")
+    return loaded
+
+
+def _refresh_loop():
+    ready = warm_up()
+    while True:
+        time.sleep(CATALOG_INDEX_REFRESH_SECONDS)
+        if ready:
+            refresh()
+        else:
+            ready = warm_up()  # 시작 시 warm-up이 실패했으면 다시 시도
+
+
+def start_warm_up():
+    """warm-up 스레드 시작 (register() 이후, 여러 번 호출해도 한 번만, warm-up 후 주기적으로 갱신)"""
+    global _warm_started
+    if _warm_started:
+        return
+    with _lock:
+        if _warm_started:
+            return
+        _warm_started = True
+    threading.Thread(target=_refresh_loop, name="catalog-index-warmup", daemon=True).start()
+
+
+def ensure_started():
+    """검색 경로에서 호출: lazy 모드면 첫 요청 때 warm-up 시작 (off면 아무것도 하지 않음)"""
+    if CATALOG_INDEX_WARM_UP != "off":
+        start_warm_up()
+
+
+def stats():
+    with _lock:
+        result = dict(_stats)
+        result.update({
+            "warm_up": CATALOG_INDEX_WARM_UP,
+            "started": _warm_started,
+            "musics": _count,
+            "names": len(_name_texts),
+            "max_music_no": _max_music_no,
+            "popularity_bytes": len(_popularity),
+            "ranked_cached": len(_ranked),
+        })
+    return result
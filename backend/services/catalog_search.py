@@ -0,0 +1,121 @@
+# backend/services/catalog_search.py
+"""
+저장된 카탈로그 로컬 전문 검색 (프로세스 메모리 역색인)
+- track_name / artist_name / album_name 토큰 → music_no (필드별 가중치)
+- 곡 목록 / popularity는 services/catalog_index 공용 표 사용 (warm-up, 저장 시 추가도 catalog_index가 전달)
+- 점수: 토큰 일치(IDF × 필드 가중치)를 정규화한 값과 popularity를 섞어서 정렬
+- 검색어의 모든 토큰이 일치하는 곡만 결과 (AND)
+"""
+
+import heapq
+import math
+import os
+import re
+import threading
+import unicodedata
+
+from services import catalog_index
+
+# 최종 점수에서 popularity 비중 (0 ~ 1)
+LOCAL_SEARCH_POPULARITY_WEIGHT = float(os.getenv("LOCAL_SEARCH_POPULARITY_WEIGHT", 0.3))
+
+FIELDS = ("track_name", "artist_name", "album_name")
+# 필드별 비트 / 가중치 (posting 값은 일치한 필드 비트 합)
+FIELD_BITS = {"track_name": 1, "artist_name": 2, "album_name": 4}
+FIELD_WEIGHTS = {1: 3.0, 2: 2.0, 4: 1.0}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_postings = {}     # token → {music_no: 필드 비트}
+_lock = threading.RLock()
+_ready = False
+_stats = {"queries": 0, "indexed": 0}
+
+
+def normalize(text):
+    """NFKC + casefold (전각/반각, 대소문자 차이 제거)"""
+    return unicodedata.normalize("NFKC", text or "").casefold()
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def is_ready():
+    return _ready
+
+
+def index_musics(musics):
+    """catalog_index hook: 새 music 행 색인 (music_no 필요, popularity는 공용 표에서 읽음)"""
+    with _lock:
+        for music in musics:
+            music_no = music["music_no"]
+            for field in FIELDS:
+                bit = FIELD_BITS[field]
+                for token in set(tokenize(music.get(field))):
+                    posting = _postings.setdefault(token, {})
+                    posting[music_no] = posting.get(music_no, 0) | bit
+            _stats["indexed"] += 1
+
+
+def _field_weight(bits, fields_mask):
+    return sum(w for bit, w in FIELD_WEIGHTS.items() if bits & bit & fields_mask)
+
+
+def search(query, fields=FIELDS, limit=12, offset=0):
+    """
+    반환: (music_no 목록, 전체 일치 수)
+    fields: 검색할 필드 (category=artist → ("artist_name",))
+    """
+    tokens = list(dict.fromkeys(tokenize(query)))
+    if not tokens:
+        return [], 0
+    fields_mask = sum(FIELD_BITS[f] for f in fields)
+
+    with _lock:
+        _stats["queries"] += 1
+        postings = [_postings.get(token) or {} for token in tokens]
+        if not all(postings):
+            return [], 0
+
+        # 가장 짧은 posting부터 교집합
+        postings.sort(key=len)
+        candidates = [
+            music_no for music_no in postings[0]
+            if all(music_no in posting for posting in postings[1:])
+        ]
+
+        doc_count = max(catalog_index.count(), 1)
+        idfs = [math.log(1 + doc_count / len(posting)) for posting in postings]
+        # 모든 토큰이 가장 높은 가중치 필드에서 일치할 때 1.0
+        max_text = sum(idfs) * max(FIELD_WEIGHTS[FIELD_BITS[f]] for f in fields)
+
+        scored = []
+        for music_no in candidates:
+            text = 0.0
+            for idf, posting in zip(idfs, postings):
+                weight = _field_weight(posting[music_no], fields_mask)
+                if not weight:
+                    break
+                text += idf * weight
+            else:
+                popularity = catalog_index.popularity(music_no) / 100
+                score = ((1 - LOCAL_SEARCH_POPULARITY_WEIGHT) * min(text / max_text, 1.0)
+                         + LOCAL_SEARCH_POPULARITY_WEIGHT * popularity)
+                scored.append((score, music_no))
+
+    top = heapq.nlargest(offset + limit, scored)
+    return [music_no for _, music_no in top[offset:]], len(scored)
+
+
+def end_bulk(ok):
+    """catalog_index hook: warm-up 완료 → 검색 사용 시작"""
+    global _ready
+    _ready = _ready or ok
+
+
+def stats():
+    with _lock:
+        result = dict(_stats)
+        result.update({"ready": _ready, "documents": _stats["indexed"], "tokens": len(_postings)})
+    return result
@@ -2,30 +2,101 @@
 """
 Deezer API를 사용하여 30초 미리듣기 URL을 가져오는 서비스
 Spotify에서 곡 정보를 가져온 후, Deezer에서 preview URL만 추출
+모든 호출은 services/gateway 의 "deezer" 게이트웨이를 거침
 """
 
-import requests
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote
 
-DEEZER_API_BASE = "https://api.deezer.com"
+import requests
+from requests.adapters import HTTPAdapter
+
+from services import gateway
+
+# 부하 테스트 시 fake_upstream.py 주소로 지정 (예: http://localhost:5055/deezer)
+DEEZER_API_BASE = os.getenv("DEEZER_API_BASE", "https://api.deezer.com").rstrip("/")
+
+# 동시 preview 조회 worker 수 (= 커넥션 풀 크기)
+DEEZER_MAX_WORKERS = int(os.getenv("DEEZER_MAX_WORKERS", 8))
+
+# Deezer는 호출량 초과 시에도 HTTP 200 + {"error": {"code": 4}} 로 응답
+DEEZER_QUOTA_ERROR_CODE = 4
+DEEZER_QUOTA_RETRY_AFTER_SECONDS = 5
+
+_session = None
+_session_lock = threading.Lock()
+# 프로세스 단위 worker pool (요청마다 스레드를 만들지 않음, 동시 요청 전체의 Deezer 동시 호출 수 = 커넥션 풀 크기)
+_executor = ThreadPoolExecutor(max_workers=DEEZER_MAX_WORKERS, thread_name_prefix="deezer")
+
+
+class DeezerQuotaError(Exception):
+    pass
+
+
+def _classify_error(e):
+    """gateway 재시도 판단: 호출량 초과(429/code 4), 5xx, 네트워크 오류만 재시도"""
+    if isinstance(e, DeezerQuotaError):
+        return True, DEEZER_QUOTA_RETRY_AFTER_SECONDS
+    if isinstance(e, requests.HTTPError) and e.response is not None:
+        if e.response.status_code == 429:
+            return True, gateway.parse_retry_after(e.response.headers, DEEZER_QUOTA_RETRY_AFTER_SECONDS)
+        return e.response.status_code >= 500, None
+    if isinstance(e, (requests.ConnectionError, requests.Timeout)):
+        return True, None
+    return False, None
+
+
+_gateway = gateway.register("deezer", _classify_error, "DEEZER")
+
+
+def get_session() -> requests.Session:
+    """keep-alive 커넥션 풀을 공유하는 프로세스 단위 Session"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=DEEZER_MAX_WORKERS
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def _search_first(track_name: str, artist_name: str) -> dict | None:
+    """Deezer 검색 첫 번째 결과 (네트워크/HTTP 오류는 예외로 전달)"""
+    query = f"{track_name} {artist_name}"
+    url = f"{DEEZER_API_BASE}/search?q={quote(query)}&limit=1"
+
+    def request():
+        response = get_session().get(url, timeout=5)
+        response.raise_for_status()
+        body = response.json()
+        error = body.get("error") or {}
+        if error.get("code") == DEEZER_QUOTA_ERROR_CODE:
+            raise DeezerQuotaError(error.get("message") or "Quota limit exceeded")
+        return body
+
+    data = _gateway.call(request)
+    if data.get("data") and len(data["data"]) > 0:
+        return data["data"][0]
+    return None
 
 
 def search_track(track_name: str, artist_name: str) -> dict | None:
     """
     Deezer에서 곡 검색 후 첫 번째 결과 반환
     """
-    query = f"{track_name} {artist_name}"
-    url = f"{DEEZER_API_BASE}/search?q={quote(query)}&limit=1"
-    
     try:
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("data") and len(data["data"]) > 0:
-                return data["data"][0]
+        return _search_first(track_name, artist_name)
     except Exception as e:
         print(f"Deezer API 오류: {e}")
-    
+
     return None
 
 
@@ -39,5 +110,41 @@ def get_preview_url(track_name: str, artist_name: str) -> str | None:
         if preview:
             print(f"  🎵 Deezer preview: {track_name}")
             return preview
-    
+
     return None
+
+
+def _resolve_one(pair) -> dict:
+    track_name, artist_name = pair
+    result = {
+        "track_name": track_name,
+        "artist_name": artist_name,
+        "preview_url": None,
+        "error": None,
+    }
+    try:
+        track = _search_first(track_name, artist_name)
+        if track:
+            result["preview_url"] = track.get("preview") or None
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def resolve_preview_urls(pairs) -> list[dict]:
+    """
+    (track_name, artist_name) 목록의 preview URL을 동시에 조회
+    - 하나의 커넥션 풀 Session과 프로세스 단위 worker pool(DEEZER_MAX_WORKERS) 공유
+    - 개별 실패는 해당 항목의 "error"에 기록 (배치 전체는 실패하지 않음)
+    - 반환: 입력 순서대로 [{"track_name", "artist_name", "preview_url", "error"}, ...]
+    """
+    pairs = list(pairs)
+    if not pairs:
+        return []
+
+    results = list(_executor.map(_resolve_one, pairs))
+
+    failed = sum(1 for r in results if r["error"])
+    found = sum(1 for r in results if r["preview_url"])
+    print(f"  🎵 Deezer preview: {found}/{len(results)}곡 조회 (실패 {failed})")
+    return results
@@ -0,0 +1,136 @@
+# backend/services/enrichment.py
+"""
+지연 보강(deferred enrichment)
+- 빠른 응답 모드에서는 트랙 기본 정보만 저장하고 is_enriched = 0 으로 표시
+- 백그라운드 worker가 preview_url(Deezer)과 genre_no(Spotify artist 장르)를 나중에 채움
+- 클라이언트는 /music/enrichment?music_nos=... 로 보강된 값을 폴링
+- 조회가 실패한 행(Spotify / Deezer 오류)은 is_enriched = 0 으로 남고
+  백그라운드 poller가 ENRICHMENT_PENDING_INTERVAL_SECONDS마다 대기 행 전체를 다시 등록
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from model import music as music_model
+from services import genre as genre_service
+from services import preview_cache
+from services import spotify_client
+
+ENRICHMENT_WORKERS = int(os.getenv("ENRICHMENT_WORKERS", 2))
+# 폴링 한 번에 조회할 수 있는 최대 music_no 수
+ENRICHMENT_POLL_LIMIT = 100
+# 보강 대기 행(is_enriched = 0) 재등록 주기 / 한 번에 읽을 행 수 / 작업 하나의 행 수
+ENRICHMENT_PENDING_INTERVAL_SECONDS = int(os.getenv("ENRICHMENT_PENDING_INTERVAL_SECONDS", 300))
+ENRICHMENT_PENDING_PAGE_SIZE = 200
+ENRICHMENT_BATCH_SIZE = 50
+
+_executor = ThreadPoolExecutor(max_workers=ENRICHMENT_WORKERS, thread_name_prefix="enrichment")
+_inflight = set()  # 등록되어 아직 끝나지 않은 music_no (같은 행 중복 등록 방지)
+_inflight_lock = threading.Lock()
+_poller_started = False
+
+
+def enqueue(music_nos):
+    """보강 작업 등록 (바로 반환), 반환: Future 또는 None (새로 등록할 행 없음)"""
+    with _inflight_lock:
+        music_nos = [no for no in dict.fromkeys(music_nos) if no and no not in _inflight]
+        _inflight.update(music_nos)
+    if not music_nos:
+        return None
+    return _executor.submit(enrich_batch, music_nos)
+
+
+def enrich_batch(music_nos):
+    """
+    music_no 묶음의 preview_url / genre_no 채우기
+    - 조회가 끝난 행만 is_enriched = 1 ("없음" 결과 / 캐시된 "없음"도 완료)
+    - Spotify artists / Deezer 오류로 조회하지 못한 행은 is_enriched = 0 유지 → poller가 재시도
+    """
+    try:
+        rows = music_model.find_by_music_nos(music_nos, music_model.MUSIC_DETAIL_COLUMNS)
+
+        need_genre = [r for r in rows if r.get('genre_no') is None and r.get('spotify_artist_id')]
+        genre_nos, failed_artists = {}, set()
+        if need_genre:
+            sp = spotify_client.get_client()
+            genre_nos, failed_artists = genre_service.lookup_genre_nos_for_artists(
+                sp, [r['spotify_artist_id'] for r in need_genre]
+            )
+
+        pairs = [(r['track_name'] or '', r['artist_name'] or '') for r in rows if not r.get('preview_url')]
+        preview_urls, failed_pairs = preview_cache.lookup_preview_urls(pairs)
+
+        updates = []
+        for r in rows:
+            pair = (r['track_name'] or '', r['artist_name'] or '')
+            is_done = r.get('spotify_artist_id') not in failed_artists and pair not in failed_pairs
+            updates.append((r['music_no'], genre_nos.get(r.get('spotify_artist_id')), preview_urls.get(pair), is_done))
+        music_model.update_enrichment_many(updates)
+        done = sum(1 for update in updates if update[3])
+        print(f"  🧩 보강 완료: {done}곡 (재시도 대기 {len(updates) - done}곡)")
+    except Exception as e:
+        # is_enriched = 0 이 남아 있으므로 enqueue_pending()에서 다시 처리
+        print(f"보강 실패: {e}")
+    finally:
+        with _inflight_lock:
+            _inflight.difference_update(music_nos)
+
+
+def enqueue_pending(page_size=ENRICHMENT_PENDING_PAGE_SIZE):
+    """
+    보강되지 않고 남은 행 전체 재등록 (music_no 순 keyset 페이지)
+    페이지마다 등록한 작업이 끝날 때까지 기다림 → 대기 행이 많아도 큐가 한꺼번에 커지지 않음
+    반환: 등록한 행 수
+    """
+    after_music_no = 0
+    enqueued = 0
+    while True:
+        try:
+            music_nos = music_model.find_pending_enrichment_music_nos(page_size, after_music_no)
+        except Exception as e:
+            print(f"보강 대기 조회 실패: {e}")
+            return enqueued
+        if not music_nos:
+            return enqueued
+        after_music_no = music_nos[-1]
+
+        futures = []
+        for i in range(0, len(music_nos), ENRICHMENT_BATCH_SIZE):
+            future = enqueue(music_nos[i:i + ENRICHMENT_BATCH_SIZE])
+            if future is not None:
+                futures.append(future)
+        wait(futures)
+        enqueued += len(music_nos)
+
+
+def _pending_loop():
+    while True:
+        count = enqueue_pending()
+        if count:
+            print(f"🧩 보강 대기 재등록: {count}곡")
+        time.sleep(ENRICHMENT_PENDING_INTERVAL_SECONDS)
+
+
+def start_pending_poller():
+    """프로세스 시작 시 1회 호출: 보강 대기 행을 주기적으로 다시 등록하는 백그라운드 스레드"""
+    global _poller_started
+    with _inflight_lock:
+        if _poller_started:
+            return
+        _poller_started = True
+    threading.Thread(target=_pending_loop, name="enrichment-pending", daemon=True).start()
+
+
+def get_enrichment(music_nos):
+    """보강 상태 조회"""
+    if len(music_nos) > ENRICHMENT_POLL_LIMIT:
+        return None, f"music_nos는 최대 {ENRICHMENT_POLL_LIMIT}개까지 가능합니다."
+    try:
+        rows = music_model.find_enrichment_by_music_nos(music_nos)
+        for row in rows:
+            row['is_enriched'] = bool(row['is_enriched'])
+        return rows, None
+    except Exception as e:
+        return None, str(e)
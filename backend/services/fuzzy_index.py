@@ -0,0 +1,170 @@
+# backend/services/fuzzy_index.py
+"""
+track / artist 이름 오타 허용 검색 (trigram 색인, 프로세스 메모리)
+- services/catalog_index 공용 이름 표의 이름 id로 trigram → 이름 id 배열(array, 오름차순) 저장
+  (이름별 곡 목록 / KIND / popularity는 공용 표에서 읽음)
+- 조회: 검색어 trigram 중 posting이 짧은 것부터 공유 개수 집계(prefix filtering) → 공유가 많은 후보만
+  나머지 trigram을 이분 탐색으로 확인 → Jaccard 유사도로 정렬, 동점이면 popularity
+- warm-up / 저장 시 추가는 catalog_index가 index_names()로 전달 (이름 id가 계속 증가 → 배열 정렬 유지)
+"""
+
+from array import array
+from bisect import bisect_left
+from collections import Counter
+import heapq
+import math
+from operator import itemgetter
+import os
+import re
+import threading
+
+from services import catalog_index
+from services.catalog_search import normalize
+
+# 결과로 인정할 최소 Jaccard 유사도
+FUZZY_MIN_SIMILARITY = float(os.getenv("FUZZY_MIN_SIMILARITY", 0.3))
+# 검증할 최대 후보 이름 수 / 후보 생성 시 훑을 최대 posting 길이 합 (응답 시간 상한)
+FUZZY_MAX_CANDIDATES = int(os.getenv("FUZZY_MAX_CANDIDATES", 200))
+FUZZY_MAX_SCAN = int(os.getenv("FUZZY_MAX_SCAN", 15000))
+
+KIND_TRACK = catalog_index.KIND_TRACK
+KIND_ARTIST = catalog_index.KIND_ARTIST
+
+_SEPARATOR_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+_name_gram_counts = array("H")  # 공용 이름 id → trigram 수
+_grams = {}               # trigram → array("I", [이름 id, ...])
+_lock = threading.RLock()
+_ready = False
+_stats = {"queries": 0, "candidates": 0}
+
+
+def normalize_name(text):
+    """검색용 이름 정규화: NFKC + casefold, 기호/공백 → 공백 하나"""
+    return " ".join(_SEPARATOR_RE.sub(" ", normalize(text)).split())
+
+
+def trigrams(name):
+    """앞 두 칸, 뒤 한 칸 공백을 붙여 trigram 집합 생성 (짧은 이름/단어 경계도 반영)"""
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def is_ready():
+    return _ready
+
+
+def index_names(name_ids):
+    """catalog_index hook: 새 이름 trigram 색인 (이름 id 오름차순으로 들어옴)"""
+    with _lock:
+        for name_id in name_ids:
+            name = normalize_name(catalog_index.name_text(name_id))
+            grams = trigrams(name) if name else set()
+            while len(_name_gram_counts) < name_id:
+                _name_gram_counts.append(0)
+            _name_gram_counts.append(min(len(grams), 65535))
+            for gram in grams:
+                posting = _grams.get(gram)
+                if posting is None:
+                    _grams[gram] = array("I", [name_id])
+                else:
+                    posting.append(name_id)
+
+
+def _contains(posting, name_id):
+    i = bisect_left(posting, name_id)
+    return i < len(posting) and posting[i] == name_id
+
+
+def search_names(query, kinds=KIND_TRACK | KIND_ARTIST, limit=10, min_similarity=None):
+    """
+    반환: [(유사도, 이름 id), ...] 유사도 내림차순 (같으면 이름의 최고 popularity 순)
+    kinds: KIND_TRACK / KIND_ARTIST 비트
+    """
+    min_similarity = FUZZY_MIN_SIMILARITY if min_similarity is None else min_similarity
+    name = normalize_name(query)
+    if not name:
+        return []
+    query_grams = trigrams(name)
+    q = len(query_grams)
+    # Jaccard ≥ t 이려면 공유 trigram ≥ ceil(t × |Q|) → 가장 짧은 (|Q| - 필요 개수 + 1)개 posting 중 하나에는 있어야 함
+    required = max(1, math.ceil(min_similarity * q))
+
+    with _lock:
+        _stats["queries"] += 1
+        postings = sorted((_grams.get(gram) or array("I") for gram in query_grams), key=len)
+
+        # 짧은 posting부터 Counter로 한꺼번에 공유 개수 집계
+        # 아주 흔한 trigram(" th", "in " 등)만 공유하는 이름은 좋은 후보가 아님
+        # → 집계 길이가 FUZZY_MAX_SCAN을 넘으면 나머지 posting은 후보 검증(이분 탐색)에만 사용
+        counts = Counter()
+        scanned = 0
+        counted = 0
+        for posting in postings:
+            if counted and scanned + len(posting) > FUZZY_MAX_SCAN:
+                break
+            # 가장 짧은 posting도 너무 길면(흔한 trigram뿐인 검색어) 앞부분만 후보로 사용
+            counts.update(posting if counted else posting[:FUZZY_MAX_SCAN])
+            scanned += len(posting)
+            counted += 1
+        rest = postings[counted:]
+        _stats["candidates"] += len(counts)
+
+        # 나머지 posting에 모두 있어도 필요 개수에 못 미치는 이름은 제외, 공유가 많은 순으로 후보 제한
+        min_count = required - len(rest)
+        candidates = [item for item in counts.items() if item[1] >= min_count]
+        if len(candidates) > FUZZY_MAX_CANDIDATES:
+            candidates = heapq.nlargest(FUZZY_MAX_CANDIDATES, candidates, key=itemgetter(1))
+
+        results = []
+        for name_id, count in candidates:
+            if not catalog_index.name_kinds(name_id) & kinds:
+                continue
+            count += sum(1 for posting in rest if _contains(posting, name_id))
+            if count < required:
+                continue
+            similarity = count / (q + _name_gram_counts[name_id] - count)
+            if similarity >= min_similarity:
+                results.append((similarity, name_id))
+
+        results.sort(key=lambda r: (-r[0], -catalog_index.name_popularity(r[1])))
+        return [(round(sim, 4), name_id) for sim, name_id in results[:limit]]
+
+
+def search(query, kinds=KIND_TRACK | KIND_ARTIST, limit=12, offset=0):
+    """
+    오타 허용 검색 → (music_no 목록, 일치한 이름들의 곡 수 합)
+    이름 유사도 순, 같은 이름 안에서는 popularity 순
+    """
+    matched = search_names(query, kinds, limit=FUZZY_MAX_CANDIDATES)
+    music_nos, seen = [], set()
+    with _lock:
+        total = sum(catalog_index.name_music_count(name_id) for _, name_id in matched)
+        for _, name_id in matched:
+            if len(music_nos) >= offset + limit:
+                break
+            for music_no in catalog_index.ranked_musics(name_id):
+                if len(music_nos) >= offset + limit:
+                    break
+                if music_no not in seen:
+                    seen.add(music_no)
+                    music_nos.append(music_no)
+    return music_nos[offset:offset + limit], total
+
+
+def end_bulk(ok):
+    """catalog_index hook: warm-up 완료 → 검색 사용 시작"""
+    global _ready
+    _ready = _ready or ok
+
+
+def stats():
+    with _lock:
+        result = dict(_stats)
+        result.update({
+            "ready": _ready,
+            "names": len(_name_gram_counts),
+            "trigrams": len(_grams),
+            "postings": sum(len(p) for p in _grams.values()),
+        })
+    return result
@@ -0,0 +1,251 @@
+# backend/services/gateway.py
+"""
+외부 API(Spotify / Deezer) 공용 호출 게이트웨이
+- provider별 token bucket 호출량 제한
+- 지수 backoff + jitter 재시도 (재시도 가능한 오류만)
+- 429 Retry-After 준수 (길면 대기하지 않고 cooldown 동안 즉시 실패)
+- 연속 실패 시 circuit breaker로 빠르게 실패 → 멈춘 upstream이 worker를 붙잡지 않음
+- get_state()로 provider별 상태 모니터링
+"""
+
+import os
+import random
+import threading
+import time
+
+
+class GatewayError(Exception):
+    """게이트웨이가 upstream 호출 없이 거절한 경우"""
+
+
+class CircuitOpenError(GatewayError):
+    pass
+
+
+class RateLimitedError(GatewayError):
+    pass
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def acquire(self, max_wait):
+        """토큰 1개 획득, max_wait 안에 못 얻으면 False. 반환: (획득 여부, 대기 시간)"""
+        deadline = time.monotonic() + max_wait
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True, waited
+                wait = (1 - self._tokens) / self.rate
+            if now + wait > deadline:
+                return False, waited
+            time.sleep(wait)
+            waited += wait
+
+    def available(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            return round(self._tokens, 2)
+
+
+class CircuitBreaker:
+    """closed → (연속 실패 threshold회) open → reset_timeout 후 half_open(시험 호출 1개) → closed/open"""
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self._trial_in_flight = False
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def release(self):
+        """upstream 호출 전에 거절된 경우 (Retry-After 대기 / 호출량 제한) → 시험 호출 자리 반납"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def snapshot(self):
+        with self._lock:
+            retry_in = None
+            if self.state == "open":
+                retry_in = round(max(self.reset_timeout - (time.monotonic() - self.opened_at), 0), 1)
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "retry_in": retry_in,
+            }
+
+
+class ProviderGateway:
+    def __init__(self, name, classify, rate, burst, max_retries=2, backoff_base=0.5,
+                 backoff_max=8.0, max_wait=5.0, failure_threshold=5, reset_timeout=30):
+        """
+        classify(exc) → (재시도 가능 여부, Retry-After 초 | None)
+        재시도 불가능한 오류(404 등)는 circuit breaker 실패로 세지 않음
+        """
+        self.name = name
+        self.classify = classify
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_wait = max_wait
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self._cooldown_until = 0.0
+        self._lock = threading.Lock()
+        self._stats = {
+            "calls": 0, "successes": 0, "failures": 0, "retries": 0,
+            "rejected_circuit_open": 0, "rejected_rate_limited": 0, "throttle_wait_seconds": 0.0,
+        }
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def _backoff(self, attempt):
+        # full jitter: 0 ~ min(max, base * 2^attempt)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _wait_cooldown(self):
+        with self._lock:
+            remaining = self._cooldown_until - time.monotonic()
+        if remaining <= 0:
+            return
+        if remaining > self.max_wait:
+            self._count("rejected_rate_limited")
+            raise RateLimitedError(f"{self.name}: Retry-After 대기 중 ({remaining:.0f}초 남음)")
+        time.sleep(remaining)
+
+    def call(self, fn, *args, **kwargs):
+        self._count("calls")
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                self._count("rejected_circuit_open")
+                raise CircuitOpenError(f"{self.name}: circuit open (upstream 장애로 호출 차단)")
+
+            try:
+                self._wait_cooldown()
+                acquired, waited = self.bucket.acquire(self.max_wait)
+                self._count("throttle_wait_seconds", waited)
+                if not acquired:
+                    self._count("rejected_rate_limited")
+                    raise RateLimitedError(f"{self.name}: 호출량 제한 초과")
+            except BaseException:
+                # upstream을 호출하지 않았으므로 성공/실패 기록 없음 → half_open 시험 자리를 잡은 채로 남지 않게
+                self.breaker.release()
+                raise
+
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                retryable, retry_after = self.classify(e)
+                if not retryable:
+                    # 요청 자체의 문제 (404 등) → upstream은 정상
+                    self.breaker.record_success()
+                    raise
+
+                self.breaker.record_failure()
+                if retry_after is not None:
+                    with self._lock:
+                        self._cooldown_until = max(self._cooldown_until, time.monotonic() + retry_after)
+
+                if attempt >= self.max_retries or (retry_after or 0) > self.max_wait:
+                    self._count("failures")
+                    raise
+
+                attempt += 1
+                self._count("retries")
+                time.sleep(retry_after if retry_after is not None else self._backoff(attempt))
+                continue
+
+            self.breaker.record_success()
+            self._count("successes")
+            return result
+
+    def state(self):
+        with self._lock:
+            stats = dict(self._stats)
+            cooldown = max(self._cooldown_until - time.monotonic(), 0)
+        stats["throttle_wait_seconds"] = round(stats["throttle_wait_seconds"], 3)
+        return {
+            "circuit": self.breaker.snapshot(),
+            "tokens_available": self.bucket.available(),
+            "retry_after_remaining": round(cooldown, 1),
+            **stats,
+        }
+
+
+def parse_retry_after(headers, default=1.0):
+    try:
+        return float((headers or {}).get("Retry-After"))
+    except (TypeError, ValueError):
+        return default
+
+
+_gateways = {}
+_gateways_lock = threading.Lock()
+
+
+def register(name, classify, prefix):
+    """provider 게이트웨이 생성 (설정: {PREFIX}_RATE_PER_SEC / _BURST / _MAX_RETRIES / ...)"""
+    with _gateways_lock:
+        if name not in _gateways:
+            _gateways[name] = ProviderGateway(
+                name,
+                classify,
+                rate=float(os.getenv(f"{prefix}_RATE_PER_SEC", 10)),
+                burst=int(os.getenv(f"{prefix}_BURST", 20)),
+                max_retries=int(os.getenv(f"{prefix}_MAX_RETRIES", 2)),
+                max_wait=float(os.getenv(f"{prefix}_MAX_WAIT_SECONDS", 5)),
+                failure_threshold=int(os.getenv(f"{prefix}_CIRCUIT_THRESHOLD", 5)),
+                reset_timeout=float(os.getenv(f"{prefix}_CIRCUIT_RESET_SECONDS", 30)),
+            )
+        return _gateways[name]
+
+
+def get_state():
+    """모든 provider 게이트웨이 상태 (모니터링용)"""
+    with _gateways_lock:
+        gateways = dict(_gateways)
+    return {name: gw.state() for name, gw in gateways.items()}
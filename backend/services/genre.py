@@ -0,0 +1,285 @@
+# backend/services/genre.py
+"""
+Spotify artist 장르 → 우리 DB genre_no 매핑
+- 페이지 단위 artist 일괄 조회 (sp.artists 50개씩) + artist_genre_cache TTL 캐시
+- 장르 분류: 규칙 패턴 전체를 미리 컴파일한 정규식 하나로 매칭, 마지막 단어(중심어) 기준
+  ("korean r&b" → R&B, "garage rock" → Rock, "soul jazz" → Jazz, "electropop" → Pop ...)
+- genre 테이블은 메모리에 한 번 올려두고 사용 (TTL / invalidate_genre_table()로 갱신)
+"""
+
+from collections import Counter
+import os
+import re
+import threading
+import time
+
+from model import artist_genre as artist_genre_model
+from model import genre as genre_model
+from model import music as music_model
+from services import spotify_client
+
+# 분류 규칙 (위에 있을수록 우선순위 높음 → artist 장르 목록의 득표가 같을 때 사용)
+# 패턴은 단어 경계 기준으로 매칭 → "rock"은 "modern rock", "k-rock"에는 맞고 "rockabilly"에는 맞지 않음
+# 장르 문자열 하나 안에서는 가장 뒤에 일치한 패턴(중심어)이 장르를 정함, 같은 위치에서는 긴 패턴 우선
+# → 수식어가 앞에 오는 예외("electro swing", "indie pop")는 여러 단어 패턴으로 등록
+GENRE_RULES = [
+    ("Metal", ["metal", "metalcore", "deathcore", "djent", "grindcore"]),
+    ("Hip-Hop", ["hip hop", "hip-hop", "hiphop", "rap", "k-rap", "trap", "drill", "grime", "boom bap"]),
+    ("R&B", ["r&b", "rnb", "k-r&b", "soul", "neo soul", "funk", "new jack swing"]),
+    ("Jazz", ["jazz", "bebop", "swing", "bossa nova", "big band"]),
+    ("Classical", ["classical", "orchestra", "orchestral", "baroque", "opera", "chamber music",
+                   "romantic era", "early music", "choral"]),
+    ("Electronic", ["edm", "electronic", "electronica", "electro", "house", "techno", "trance",
+                    "dubstep", "drum and bass", "dnb", "future bass", "garage", "synthwave", "lo-fi",
+                    "lofi", "ambient", "idm", "electro swing"]),
+    ("Rock", ["rock", "k-rock", "punk", "grunge", "emo", "shoegaze", "post-rock", "britpop"]),
+    ("Indie", ["indie", "k-indie", "indie pop", "bedroom pop", "dream pop", "singer-songwriter", "folk"]),
+    ("K-Pop", ["k-pop", "kpop", "korean pop", "k-pop boy group", "k-pop girl group",
+               "korean idol", "k-ballad", "korean ost", "trot"]),
+    ("Pop", ["pop", "dance pop", "j-pop", "c-pop", "mandopop", "europop", "teen pop", "boy band",
+             "girl group", "idol", "ballad"]),
+]
+
+# 붙여 쓴 합성어 장르 → 뒤쪽 어근의 장르 ("electropop", "synthpop" → Pop, "krautrock" → Rock)
+# 규칙에 명시된 패턴("britpop", "kpop", "mandopop")이 먼저
+GENRE_COMPOUND_SUFFIXES = [("pop", "Pop"), ("rock", "Rock")]
+
+# sp.artists()가 한 번에 받을 수 있는 최대 artist 수
+SPOTIFY_ARTISTS_BATCH_SIZE = 50
+
+# artist → 장르 캐시 유효 기간 (기본 30일)
+ARTIST_GENRE_TTL_SECONDS = int(os.getenv("ARTIST_GENRE_TTL_SECONDS", 60 * 60 * 24 * 30))
+
+# 메모리 genre 테이블 재조회 주기
+GENRE_TABLE_TTL_SECONDS = int(os.getenv("GENRE_TABLE_TTL_SECONDS", 600))
+
+
+def _compile_rules(rules, compound_suffixes):
+    """
+    규칙 전체를 alternation 하나로 컴파일
+    - 명시 패턴은 규칙과 관계없이 긴 것부터 → 같은 위치에서는 "k-pop boy group"이 "k-pop"보다,
+      "electro swing"이 "electro"보다 먼저 시도됨
+    - 붙여 쓴 합성어(…pop / …rock)는 맨 마지막 대안
+    반환: (정규식, {패턴: (우선순위, 장르 이름)}, {합성어 어근: (우선순위, 장르 이름)})
+    """
+    priorities = {genre_name: priority for priority, (genre_name, _) in enumerate(rules)}
+    patterns = {}
+    for genre_name, genre_patterns in rules:
+        for p in genre_patterns:
+            patterns.setdefault(p, (priorities[genre_name], genre_name))
+    suffixes = {suffix: (priorities[genre_name], genre_name) for suffix, genre_name in compound_suffixes}
+
+    escaped = [re.escape(p) for p in sorted(patterns, key=len, reverse=True)]
+    compound = "|".join(re.escape(suffix) for suffix in suffixes)
+    pattern = re.compile(
+        r"(?<![a-z0-9])(?:" + "|".join(escaped) + rf"|[a-z0-9]+(?P<suffix>{compound}))(?![a-z0-9])"
+    )
+    return pattern, patterns, suffixes
+
+
+_GENRE_PATTERN, _GENRE_PATTERNS, _GENRE_SUFFIXES = _compile_rules(GENRE_RULES, GENRE_COMPOUND_SUFFIXES)
+
+_genre_table = {}
+_genre_table_loaded_at = 0.0
+_genre_table_lock = threading.Lock()
+
+
+def classify_spotify_genre(spotify_genre):
+    """
+    Spotify 장르 문자열 하나 → (우선순위, 우리 장르 이름) | None
+    가장 뒤에 일치한 패턴 기준 ("funk rock" → Rock, "pop rap" → Hip-Hop)
+    """
+    text = " ".join((spotify_genre or "").lower().split())
+    last = None
+    for last in _GENRE_PATTERN.finditer(text):
+        pass
+    if last is None:
+        return None
+    if last.group("suffix"):
+        return _GENRE_SUFFIXES[last.group("suffix")]
+    return _GENRE_PATTERNS[last.group(0)]
+
+
+def classify_spotify_genres(spotify_genres):
+    """
+    artist의 Spotify 장르 목록 → 우리 장르 이름 | None
+    장르 문자열별 분류 결과 중 가장 많이 나온 장르, 같으면 우선순위 높은 장르
+    """
+    votes = Counter()
+    priorities = {}
+    for g in spotify_genres or []:
+        result = classify_spotify_genre(g)
+        if result:
+            priority, genre_name = result
+            votes[genre_name] += 1
+            priorities[genre_name] = priority
+
+    if not votes:
+        return None
+    return min(votes, key=lambda name: (-votes[name], priorities[name]))
+
+
+def invalidate_genre_table():
+    """genre 테이블 변경 시 호출 → 다음 조회 때 다시 로드"""
+    global _genre_table_loaded_at
+    with _genre_table_lock:
+        _genre_table_loaded_at = 0.0
+
+
+def get_genre_table():
+    """메모리 genre 테이블 {name: genre_no}"""
+    global _genre_table, _genre_table_loaded_at
+    with _genre_table_lock:
+        if time.monotonic() - _genre_table_loaded_at > GENRE_TABLE_TTL_SECONDS or not _genre_table_loaded_at:
+            try:
+                _genre_table = {row['name']: row['genre_no'] for row in genre_model.find_all()}
+                _genre_table_loaded_at = time.monotonic()
+            except Exception as e:
+                # 로드 실패 시 이전 테이블 유지
+                print(f"genre 테이블 로드 실패: {e}")
+        return _genre_table
+
+
+def genre_no_by_name(genre_name):
+    """우리 장르 이름 → genre_no (대소문자 무시, 메모리 테이블)"""
+    table = get_genre_table()
+    if genre_name in table:
+        return table[genre_name]
+    folded = (genre_name or "").casefold()
+    return next((no for name, no in table.items() if name.casefold() == folded), None)
+
+
+def genre_no_from_spotify_genres(spotify_genres):
+    """Spotify genres 목록 → 우리 DB genre_no (DB 조회 없이 메모리에서 처리)"""
+    genre_name = classify_spotify_genres(spotify_genres)
+    if not genre_name:
+        return None
+    return get_genre_table().get(genre_name)
+
+
+def extract_genre_no(sp, artist_id):
+    """Spotify artist → genres → 우리 DB genre_no"""
+    try:
+        artist = sp.artist(artist_id)
+        spotify_genres = artist.get("genres", [])
+    except Exception:
+        spotify_genres = []
+
+    return genre_no_from_spotify_genres(spotify_genres)
+
+
+def first_artist_id(track):
+    artists = track.get("artists") or []
+    return artists[0].get("id") if artists else None
+
+
+def lookup_artist_genre_nos(sp, tracks):
+    """
+    한 페이지 분량 트랙의 (첫 번째) artist 장르를 한 번에 조회
+    - 반환: ({artist_id: genre_no}, 조회에 실패한 artist_id 집합)
+    """
+    artist_ids = []
+    for track in tracks:
+        artist_id = first_artist_id(track or {})
+        if artist_id and artist_id not in artist_ids:
+            artist_ids.append(artist_id)
+
+    return lookup_genre_nos_for_artists(sp, artist_ids)
+
+
+def resolve_genre_nos_for_artists(sp, artist_ids):
+    """lookup_genre_nos_for_artists()의 장르만 → {artist_id: genre_no}"""
+    return lookup_genre_nos_for_artists(sp, artist_ids)[0]
+
+
+def lookup_genre_nos_for_artists(sp, artist_ids):
+    """
+    artist_id 목록의 장르 일괄 조회
+    - artist_genre_cache(TTL 이내)에 있으면 API 호출 없음
+    - 나머지는 sp.artists()로 50개씩 묶어서 조회 후 캐시에 저장
+    - 반환: ({artist_id: genre_no}, sp.artists() 오류로 조회하지 못한 artist_id 집합)
+      Spotify에 없는 artist / 분류되지 않는 장르는 조회 완료 (genre_no None)
+    """
+    artist_ids = list(dict.fromkeys(a for a in artist_ids if a))
+    if not artist_ids:
+        return {}, set()
+
+    try:
+        cached = artist_genre_model.find_fresh_by_artist_ids(artist_ids, ARTIST_GENRE_TTL_SECONDS)
+    except Exception as e:
+        print(f"artist 장르 캐시 조회 실패: {e}")
+        cached = {}
+
+    # 캐시된 원본 장르를 다시 분류 → 규칙이 바뀌어도 바로 반영 (메모리 연산)
+    genre_nos = {
+        artist_id: genre_no_from_spotify_genres(entry["genres"])
+        for artist_id, entry in cached.items()
+    }
+    missing = [artist_id for artist_id in artist_ids if artist_id not in cached]
+
+    entries = []
+    failed = set()
+    for i in range(0, len(missing), SPOTIFY_ARTISTS_BATCH_SIZE):
+        batch = missing[i:i + SPOTIFY_ARTISTS_BATCH_SIZE]
+        try:
+            artists = sp.artists(batch).get("artists") or []
+        except Exception as e:
+            # 실패한 배치는 캐시하지 않음 → 다음 요청에서 재시도
+            print(f"Spotify artists 조회 실패: {e}")
+            failed.update(batch)
+            continue
+
+        for artist in artists:
+            if not artist:
+                continue
+            spotify_genres = artist.get("genres") or []
+            genre_no = genre_no_from_spotify_genres(spotify_genres)
+            genre_nos[artist["id"]] = genre_no
+            entries.append((artist["id"], spotify_genres, genre_no))
+
+    artist_genre_model.upsert_many(entries)
+    return genre_nos, failed
+
+
+def backfill_missing_genres(sp, batch_size=200):
+    """
+    genre_no가 NULL인 music 행 채우기
+    - spotify_artist_id가 없는 예전 행은 sp.tracks()로 artist id부터 조회 (50개씩)
+    - artist 장르는 resolve_genre_nos_for_artists() (캐시 → 나머지 일괄 조회)
+    - 반환: {"scanned": n, "updated": n}
+    """
+    stats = {"scanned": 0, "updated": 0}
+    after_music_no = 0
+    while True:
+        rows = music_model.find_missing_genre(after_music_no, batch_size)
+        if not rows:
+            return stats
+        after_music_no = rows[-1]['music_no']
+        stats["scanned"] += len(rows)
+
+        # artist id가 없는 행: track id → artist id
+        need_artist = {}
+        for row in rows:
+            if not row.get('spotify_artist_id'):
+                track_id = row.get('spotify_track_id') or spotify_client.track_id_from_url(row.get('spotify_url'))
+                if track_id:
+                    need_artist[track_id] = row
+        track_ids = list(need_artist)
+        for i in range(0, len(track_ids), SPOTIFY_ARTISTS_BATCH_SIZE):
+            try:
+                tracks = sp.tracks(track_ids[i:i + SPOTIFY_ARTISTS_BATCH_SIZE]).get('tracks') or []
+            except Exception as e:
+                print(f"Spotify tracks 조회 실패: {e}")
+                continue
+            for track in tracks:
+                if track and track.get('id') in need_artist:
+                    need_artist[track['id']]['spotify_artist_id'] = first_artist_id(track)
+
+        genre_nos = resolve_genre_nos_for_artists(sp, [r.get('spotify_artist_id') for r in rows])
+        updates = [
+            (row['music_no'], genre_nos.get(row['spotify_artist_id']), row['spotify_artist_id'])
+            for row in rows
+            if row.get('spotify_artist_id')
+        ]
+        stats["updated"] += music_model.update_genre_many(updates)
+        print(f"  🏷️  장르 backfill: {stats['updated']}/{stats['scanned']}곡")
@@ -0,0 +1,110 @@
+# backend/services/hangul.py
+"""
+한글 검색 정규화
+- 음절 분해: "방탄" → "ㅂㅏㅇㅌㅏㄴ" (겹모음/겹받침도 입력 순서대로 분해 → 입력 중인 글자도 접두어 일치)
+- 초성: "방탄소년단" → "ㅂㅌㅅㄴㄷ"
+- 로마자: 국어의 로마자 표기법 기준 글자 단위 변환 (발음 변화 규칙은 적용하지 않음) "방탄" → "bangtan"
+- 호환용 자모(ㄱ, ㅏ ...)로 통일, 공백 제거한 compact 형태 사용 ("좋은날" = "좋은 날")
+"""
+
+import re
+import unicodedata
+
+SYLLABLE_BASE = 0xAC00
+SYLLABLE_LAST = 0xD7A3
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+             "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+
+# 겹모음 / 겹받침 → 입력 순서 자모
+COMPOUND_JAMO = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+
+ROMAN_CHOSEONG = ["g", "kk", "n", "d", "tt", "r", "m", "b", "pp", "s", "ss", "", "j", "jj", "ch", "k", "t", "p", "h"]
+ROMAN_JUNGSEONG = ["a", "ae", "ya", "yae", "eo", "e", "yeo", "ye", "o", "wa", "wae", "oe", "yo", "u", "wo",
+                   "we", "wi", "yu", "eu", "ui", "i"]
+ROMAN_JONGSEONG = ["", "k", "k", "k", "n", "n", "n", "t", "l", "k", "m", "l", "l", "l", "p", "l", "m", "p",
+                   "p", "t", "t", "ng", "t", "t", "k", "t", "p", "t"]
+
+# 첫가끝 조합형 자모(U+1100 ~) → 호환용 자모
+_CONJOINING_TO_COMPAT = {0x1100 + i: c for i, c in enumerate(CHOSEONG)}
+_CONJOINING_TO_COMPAT.update({0x1161 + i: c for i, c in enumerate(JUNGSEONG)})
+_CONJOINING_TO_COMPAT.update({0x11A8 + i: c for i, c in enumerate(JONGSEONG[1:])})
+
+_COMPAT_CONSONANTS = set(CHOSEONG) | set(j for j in JONGSEONG if j)
+_COMPAT_JAMO = _COMPAT_CONSONANTS | set(JUNGSEONG)
+_SEPARATOR_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def _split_syllable(ch):
+    """음절 → (초성, 중성, 종성) 인덱스, 한글 음절이 아니면 None"""
+    code = ord(ch)
+    if not SYLLABLE_BASE <= code <= SYLLABLE_LAST:
+        return None
+    code -= SYLLABLE_BASE
+    return code // 588, (code % 588) // 28, code % 28
+
+
+def normalize(text):
+    """NFC + casefold + 조합형 자모 → 호환용 자모 (NFKC는 호환용 자모를 조합형으로 바꾸므로 사용하지 않음)"""
+    return unicodedata.normalize("NFC", text or "").casefold().translate(_CONJOINING_TO_COMPAT)
+
+
+def words(text):
+    """정규화 후 기호/공백 기준 단어 목록"""
+    return _SEPARATOR_RE.sub(" ", normalize(text)).split()
+
+
+def has_hangul(text):
+    return any(_split_syllable(ch) or ch in _COMPAT_JAMO for ch in text or "")
+
+
+def is_choseong_query(text):
+    """초성(자음) 검색어인지 ("ㅂㅌㅅ", 영문/숫자가 섞인 "ㅇㅇㅇiu"도 포함, 음절/모음이 있으면 아님)"""
+    chars = [ch for ch in normalize(text) if not ch.isspace()]
+    return (any(ch in _COMPAT_CONSONANTS for ch in chars)
+            and not any(_split_syllable(ch) or ch in JUNGSEONG for ch in chars))
+
+
+def decompose(text):
+    """음절/겹자모 → 입력 순서 자모열, 한글이 아닌 문자는 그대로"""
+    out = []
+    for ch in text:
+        parts = _split_syllable(ch)
+        if parts is None:
+            out.append(COMPOUND_JAMO.get(ch, ch))
+            continue
+        cho, jung, jong = parts
+        out.append(CHOSEONG[cho])
+        vowel = JUNGSEONG[jung]
+        out.append(COMPOUND_JAMO.get(vowel, vowel))
+        final = JONGSEONG[jong]
+        out.append(COMPOUND_JAMO.get(final, final))
+    return "".join(out)
+
+
+def choseong(text):
+    """음절 → 초성, 한글이 아닌 문자는 그대로 ("방탄 BTS" → "ㅂㅌbts" 형태는 normalize 후 사용)"""
+    out = []
+    for ch in text:
+        parts = _split_syllable(ch)
+        out.append(CHOSEONG[parts[0]] if parts else ch)
+    return "".join(out)
+
+
+def romanize(text):
+    """음절 → 로마자 (글자 단위 변환), 한글이 아닌 문자는 그대로"""
+    out = []
+    for ch in text:
+        parts = _split_syllable(ch)
+        if parts is None:
+            out.append(ch)
+            continue
+        cho, jung, jong = parts
+        out.append(ROMAN_CHOSEONG[cho] + ROMAN_JUNGSEONG[jung] + ROMAN_JONGSEONG[jong])
+    return "".join(out)
@@ -0,0 +1,182 @@
+# backend/services/hangul_index.py
+"""
+한글 track / artist 이름 접두어 검색 (프로세스 메모리 정렬 배열 + 이분 탐색)
+- 한글이 들어간 이름만 색인, 이름의 각 단어 위치부터 끝까지를 공백 없이 이어 붙인 키 저장
+  ("방탄 소년단" → "방탄소년단", "소년단")
+- 키 종류 (services/hangul 참고)
+    j: 자모 분해  → "방ㅌ", "방탄소" 처럼 입력 중인 검색어도 접두어 일치
+    c: 초성       → "ㅂㅌㅅ"
+    r: 로마자     → "bangtan"
+- 조회: 검색어 형태로 키 종류 선택 → bisect로 접두어 범위 탐색 → 정확 일치 / 이름 시작 일치 / popularity 순
+- 키 배열은 정렬된 본 배열 + 정렬된 추가분 배열 (추가분이 커지면 본 배열에 합침)
+- 이름 id / 곡 목록 / KIND / popularity는 services/catalog_index 공용 이름 표 사용
+  (warm-up, 저장 시 추가도 catalog_index가 index_names()로 전달)
+"""
+
+from bisect import bisect_left, insort
+import os
+import threading
+
+from services import catalog_index
+from services import hangul
+
+# 접두어 범위에서 확인할 최대 키 수 (한두 글자 검색어의 응답 시간 상한)
+HANGUL_MAX_SCAN = int(os.getenv("HANGUL_MAX_SCAN", 2000))
+# 이름 하나에서 만들 최대 단어 위치 수
+HANGUL_MAX_WORDS = 8
+# 추가분 배열을 본 배열에 합치는 최소 크기 (본 배열 크기 / 32 와 비교해 큰 값)
+HANGUL_PENDING_MIN = 1024
+
+KIND_TRACK = catalog_index.KIND_TRACK
+KIND_ARTIST = catalog_index.KIND_ARTIST
+
+_keys = []                # 정렬된 (키, 공용 이름 id, 단어 위치)
+_pending = []             # 정렬된 추가분 (키, 공용 이름 id, 단어 위치)
+_names = 0                # 색인한 한글 이름 수
+_lock = threading.RLock()
+_ready = False
+_bulk = False             # warm-up 중에는 추가분을 합치지 않고 끝난 뒤 한 번에 정렬
+_stats = {"queries": 0, "merges": 0}
+
+
+def is_ready():
+    return _ready
+
+
+def name_keys(name):
+    """이름 → [(키, 단어 위치), ...]"""
+    words = hangul.words(name)[:HANGUL_MAX_WORDS]
+    keys = []
+    for pos in range(len(words)):
+        compact = "".join(words[pos:])
+        keys.append(("j:" + hangul.decompose(compact), pos))
+        keys.append(("c:" + hangul.choseong(compact), pos))
+        keys.append(("r:" + hangul.romanize(compact), pos))
+    return keys
+
+
+def query_key(query):
+    """
+    검색어 → 조회할 키 접두어
+    - 한글 없음 → 로마자 ("bangtan")
+    - 한글 음절/모음 없이 자음만 (+ 영문/숫자) → 초성 ("ㅂㅌㅅ", "ㅇㅇㅇiu")
+    - 그 외 → 자모 분해 ("방탄", "방ㅌ")
+    """
+    compact = "".join(hangul.words(query))
+    if not compact:
+        return None
+    if not hangul.has_hangul(compact):
+        return "r:" + compact
+    if hangul.is_choseong_query(compact):
+        return "c:" + compact
+    return "j:" + hangul.decompose(compact)
+
+
+def _merge_pending():
+    global _keys, _pending
+    _keys.extend(_pending)
+    _keys.sort()  # 정렬된 두 구간 → timsort가 한 번의 병합으로 처리
+    _pending = []
+    _stats["merges"] += 1
+
+
+def index_names(name_ids):
+    """catalog_index hook: 새 이름 중 한글이 들어간 이름만 키 추가"""
+    global _names
+    with _lock:
+        for name_id in name_ids:
+            name = hangul.normalize(catalog_index.name_text(name_id))
+            if not hangul.has_hangul(name):
+                continue
+            _names += 1
+            for key, pos in name_keys(name):
+                if _bulk:
+                    _pending.append((key, name_id, pos))
+                else:
+                    insort(_pending, (key, name_id, pos))
+        if not _bulk and len(_pending) >= max(HANGUL_PENDING_MIN, len(_keys) // 32):
+            _merge_pending()
+
+
+def _scan(keys, prefix, kinds, matched, budget):
+    """정렬 배열에서 prefix 범위를 훑어 matched[이름 id] = (정확 일치 여부, 단어 위치) 최솟값 기록"""
+    scanned = 0
+    i = bisect_left(keys, (prefix,))
+    while i < len(keys) and scanned < budget:
+        key, name_id, pos = keys[i]
+        if not key.startswith(prefix):
+            break
+        scanned += 1
+        i += 1
+        if not catalog_index.name_kinds(name_id) & kinds:
+            continue
+        rank = (key != prefix, pos)
+        if name_id not in matched or rank < matched[name_id]:
+            matched[name_id] = rank
+    return scanned
+
+
+def search_names(query, kinds=KIND_TRACK | KIND_ARTIST, limit=10):
+    """
+    반환: [이름 id, ...] 정확 일치 → 이름 시작 일치 → 이름의 최고 popularity 순
+    kinds: KIND_TRACK / KIND_ARTIST 비트
+    """
+    prefix = query_key(query)
+    if not prefix:
+        return []
+    with _lock:
+        _stats["queries"] += 1
+        matched = {}
+        scanned = _scan(_pending, prefix, kinds, matched, HANGUL_MAX_SCAN)
+        _scan(_keys, prefix, kinds, matched, HANGUL_MAX_SCAN - scanned)
+        ranked = sorted(matched, key=lambda name_id: (matched[name_id], -catalog_index.name_popularity(name_id)))
+    return ranked[:limit]
+
+
+def search(query, kinds=KIND_TRACK | KIND_ARTIST, limit=12, offset=0):
+    """
+    한글 접두어 / 초성 / 로마자 검색 → (music_no 목록, 일치한 이름들의 곡 수 합)
+    이름 순위 순, 같은 이름 안에서는 popularity 순
+    """
+    matched = search_names(query, kinds, limit=HANGUL_MAX_SCAN)
+    music_nos, seen = [], set()
+    with _lock:
+        total = sum(catalog_index.name_music_count(name_id) for name_id in matched)
+        for name_id in matched:
+            if len(music_nos) >= offset + limit:
+                break
+            for music_no in catalog_index.ranked_musics(name_id):
+                if len(music_nos) >= offset + limit:
+                    break
+                if music_no not in seen:
+                    seen.add(music_no)
+                    music_nos.append(music_no)
+    return music_nos[offset:offset + limit], total
+
+
+def begin_bulk():
+    """catalog_index hook: warm-up 시작 → 추가분은 정렬하지 않고 모아 둠"""
+    global _bulk
+    with _lock:
+        _bulk = True
+
+
+def end_bulk(ok):
+    """catalog_index hook: warm-up 끝 → 한 번에 정렬, 성공했으면 검색 사용 시작"""
+    global _bulk, _ready
+    with _lock:
+        _bulk = False
+        _merge_pending()
+    _ready = _ready or ok
+
+
+def stats():
+    with _lock:
+        result = dict(_stats)
+        result.update({
+            "ready": _ready,
+            "names": _names,
+            "keys": len(_keys),
+            "pending": len(_pending),
+        })
+    return result
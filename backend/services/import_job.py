@@ -0,0 +1,188 @@
+# backend/services/import_job.py
+"""
+비동기 bulk import 작업
+- POST /music/bulk-import 는 작업만 등록하고 job_no를 바로 반환
+- 실제 import는 백그라운드 worker pool에서 페이지 단위로 진행
+- 페이지마다 진행 상황을 import_job 테이블에 저장 → 프로세스가 죽어도 마지막 완료 페이지부터 재개
+- 실행권은 lease_token으로 구분: 실행 중에는 heartbeat로 갱신, 진행 저장 / 종료는 토큰이 같을 때만
+  (느린 페이지 때문에 다른 worker가 다시 가져가도 두 worker가 같은 작업을 이어 쓰지 않음)
+- 실패한 페이지는 offset을 올리지 않고 IMPORT_JOB_PAGE_RETRIES회까지 다시 시도, 넘으면 failed
+"""
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from model import import_job as import_job_model
+from services import music as music_service
+
+IMPORT_JOB_WORKERS = int(os.getenv("IMPORT_JOB_WORKERS", 2))
+# running 상태인데 이 시간 동안 heartbeat가 없으면 죽은 작업으로 보고 다시 실행
+IMPORT_JOB_STALE_SECONDS = int(os.getenv("IMPORT_JOB_STALE_SECONDS", 300))
+IMPORT_JOB_HEARTBEAT_SECONDS = int(os.getenv("IMPORT_JOB_HEARTBEAT_SECONDS", 30))
+# 같은 페이지 연속 실패 허용 횟수 (넘으면 failed, offset은 실패한 페이지에 그대로)
+IMPORT_JOB_PAGE_RETRIES = int(os.getenv("IMPORT_JOB_PAGE_RETRIES", 3))
+# 작업 하나에 저장하는 최대 오류 메시지 수
+IMPORT_JOB_MAX_ERRORS = 50
+
+_executor = ThreadPoolExecutor(max_workers=IMPORT_JOB_WORKERS, thread_name_prefix="import-job")
+_runner_started = False
+_runner_lock = threading.Lock()
+
+
+def _serialize(job):
+    for key in ('created_at', 'updated_at', 'finished_at'):
+        if job.get(key):
+            job[key] = job[key].isoformat() if hasattr(job[key], 'isoformat') else str(job[key])
+    total = job.get('total_count') or 0
+    job['progress'] = round(min(job['processed_count'] / total, 1.0) * 100, 1) if total else 0.0
+    return job
+
+
+def create_bulk_import_job(query, total_count):
+    """bulk import 작업 등록 후 백그라운드 실행"""
+    try:
+        job_no = import_job_model.insert_job(query, total_count)
+        _executor.submit(run_job, job_no)
+        return job_no, None
+    except Exception as e:
+        return None, str(e)
+
+
+def get_job(job_no):
+    """작업 상태/진행률 조회"""
+    try:
+        job = import_job_model.find_by_job_no(job_no)
+        if not job:
+            return None, "존재하지 않는 작업"
+        return _serialize(job), None
+    except Exception as e:
+        return None, str(e)
+
+
+def retry_job(job_no):
+    """실패한 작업을 마지막 완료 페이지부터 다시 실행"""
+    try:
+        if not import_job_model.requeue_job(job_no):
+            return False, "재시도할 수 없는 작업입니다 (failed 상태만 가능)"
+        _executor.submit(run_job, job_no)
+        return True, "작업을 다시 시작했습니다."
+    except Exception as e:
+        return False, str(e)
+
+
+def _heartbeat_loop(job_no, lease_token, stop, lost):
+    """실행 중 IMPORT_JOB_HEARTBEAT_SECONDS마다 updated_at 갱신, 실행권을 잃으면 lost 설정"""
+    while not stop.wait(IMPORT_JOB_HEARTBEAT_SECONDS):
+        try:
+            if not import_job_model.heartbeat(job_no, lease_token):
+                lost.set()
+                return
+        except Exception as e:
+            print(f"import job #{job_no} heartbeat 실패: {e}")
+
+
+def run_job(job_no):
+    """작업 실행 (다른 worker가 이미 실행 중이면 아무것도 하지 않음)"""
+    lease_token = uuid.uuid4().hex
+    if not import_job_model.claim_job(job_no, IMPORT_JOB_STALE_SECONDS, lease_token):
+        return
+
+    stop, lost = threading.Event(), threading.Event()
+    threading.Thread(
+        target=_heartbeat_loop, args=(job_no, lease_token, stop, lost),
+        name=f"import-job-{job_no}-heartbeat", daemon=True
+    ).start()
+    try:
+        _run_claimed_job(job_no, lease_token, lost)
+    finally:
+        stop.set()
+
+
+def _run_claimed_job(job_no, lease_token, lost):
+    job = import_job_model.find_by_job_no(job_no)
+    offset = job['next_offset']
+    processed = job['processed_count']
+    new_count = job['new_count']
+    existing_count = job['existing_count']
+    errors = job['errors']
+    print(f"📥 import job #{job_no} 시작: '{job['query']}' (offset {offset})")
+
+    attempts = 0
+    while True:
+        try:
+            sp = music_service.get_spotify_client()
+            pages = music_service.iter_bulk_import_pages(
+                sp, job['query'], job['total_count'], offset=offset, imported=processed
+            )
+            for next_offset, page in pages:
+                page_new = page_existing = 0
+                for music, is_new in page:
+                    if not music:
+                        errors.append(f"offset {offset}: track id 없는 항목 건너뜀")
+                        continue
+                    if is_new:
+                        page_new += 1
+                    else:
+                        page_existing += 1
+
+                errors = errors[-IMPORT_JOB_MAX_ERRORS:]
+                saved = not lost.is_set() and import_job_model.update_progress(
+                    job_no, lease_token, next_offset, processed + page_new + page_existing,
+                    new_count + page_new, existing_count + page_existing, errors
+                )
+                if not saved:
+                    print(f"⚠️ import job #{job_no}: 다른 worker가 실행권을 가져감 → 중단")
+                    return
+                offset = next_offset
+                processed += page_new + page_existing
+                new_count += page_new
+                existing_count += page_existing
+                attempts = 0
+            break
+
+        except Exception as e:
+            # 실패한 페이지는 offset을 올리지 않음 → 같은 페이지부터 다시 시도
+            attempts += 1
+            errors = (errors + [f"offset {offset}: {e}"])[-IMPORT_JOB_MAX_ERRORS:]
+            if attempts > IMPORT_JOB_PAGE_RETRIES or lost.is_set():
+                # 마지막 완료 페이지까지는 저장되어 있으므로 retry_job으로 이어서 실행 가능
+                import_job_model.finish_job(job_no, lease_token, 'failed', errors)
+                print(f"❌ import job #{job_no} 실패 (offset {offset}): {e}")
+                return
+            print(f"⚠️ import job #{job_no} offset {offset} 재시도 {attempts}/{IMPORT_JOB_PAGE_RETRIES}: {e}")
+            time.sleep(min(2 ** attempts, 30))
+
+    if import_job_model.finish_job(job_no, lease_token, 'done', errors):
+        print(f"✅ import job #{job_no} 완료: {processed}곡 (신규 {new_count}곡)")
+
+
+def resume_pending_jobs():
+    """대기 중이거나 중단된 작업을 다시 worker pool에 등록"""
+    try:
+        job_nos = import_job_model.find_resumable_job_nos(IMPORT_JOB_STALE_SECONDS)
+    except Exception as e:
+        print(f"import job 재개 조회 실패: {e}")
+        return 0
+
+    for job_no in job_nos:
+        _executor.submit(run_job, job_no)
+    return len(job_nos)
+
+
+def start_job_runner():
+    """프로세스 시작 시 1회 호출: 주기적으로 중단된 작업을 찾아 재개"""
+    global _runner_started
+    with _runner_lock:
+        if _runner_started:
+            return
+        _runner_started = True
+
+    def loop():
+        while True:
+            resume_pending_jobs()
+            time.sleep(IMPORT_JOB_STALE_SECONDS)
+
+    threading.Thread(target=loop, name="import-job-runner", daemon=True).start()
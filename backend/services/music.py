@@ -1,212 +1,504 @@
+from model import genre_stats as genre_stats_model
 from model import music as music_model
-from spotipy import Spotify
-from spotipy.oauth2 import SpotifyClientCredentials
-from services import deezer
+from services import catalog_index
+from services import catalog_search
+from services import enrichment
+from services import fuzzy_index
+from services import hangul_index
+from services import genre as genre_service
+from services import preview_cache
+from services import spotify_client
+from services import suggest_index
+from services import track_filter
+from cache import LRUCache
+from concurrent.futures import ThreadPoolExecutor
+import base64
+import binascii
+import json
 import os
-
-GENRE_MAP = {
-    "k-pop": "K-Pop",
-    "korean pop": "K-Pop",
-    "dance pop": "Pop",
-    "pop": "Pop",
-    "hip hop": "Hip-Hop",
-    "hip-hop": "Hip-Hop",
-    "r&b": "R&B",
-    "jazz": "Jazz",
-    "electronic": "Electronic",
-    "edm": "Electronic",
-    "rock": "Rock",
-    "metal": "Metal",
-    "indie": "Indie",
-}
+import threading
 
 # Spotify 글로벌 Top 50 플레이리스트 ID
 GLOBAL_TOP_50_PLAYLIST_ID = "37i9dQZEVXbMDoHDwVN2tF"
 
+# Spotify 검색 market
+SPOTIFY_MARKET = "KR"
 
-def get_spotify_client():
-    # ✅ app.py와 동일한 환경변수 이름으로 통일
-    client_id = os.getenv("SPOTIFY_CLIENT_ID")
-    client_secret = os.getenv("SPOTIFY_CLIENT_SECRET")
+# /music/search 결과 캐시 (query, category, page, size, market → music_no 목록)
+SEARCH_CACHE = LRUCache(
+    maxsize=int(os.getenv("SEARCH_CACHE_MAXSIZE", 2000)),
+    ttl=int(os.getenv("SEARCH_CACHE_TTL_SECONDS", 600)),
+    stale_ttl=int(os.getenv("SEARCH_CACHE_STALE_SECONDS", 3600))
+)
+# mode=local 검색: 로컬 결과가 이 수(또는 size) 이상이면 Spotify 호출 생략
+LOCAL_SEARCH_MIN_HITS = int(os.getenv("LOCAL_SEARCH_MIN_HITS", 5))
+# /music/suggest 최대 개수 (자동완성 상위 목록 크기와 같게 → 목록 조회만으로 응답)
+SUGGEST_MAX_LIMIT = suggest_index.SUGGEST_TOP_K
 
-    if not client_id or not client_secret:
-        raise RuntimeError("Spotify 환경변수(SPOTIFY_CLIENT_ID/SECRET)가 설정되지 않았습니다.")
+# GET /music 페이지 크기 (기본 / 최대)
+MUSIC_LIST_DEFAULT_SIZE = int(os.getenv("MUSIC_LIST_DEFAULT_SIZE", 50))
+MUSIC_LIST_MAX_SIZE = int(os.getenv("MUSIC_LIST_MAX_SIZE", 100))
 
-    return Spotify(
-        auth_manager=SpotifyClientCredentials(
-            client_id=client_id,
-            client_secret=client_secret
-        )
-    )
-
-
-def extract_genre_no(sp, artist_id):
-    """Spotify artist → genres → 우리 DB genre_no"""
-    try:
-        artist = sp.artist(artist_id)
-        spotify_genres = artist.get("genres", [])
-    except Exception:
-        spotify_genres = []
+_search_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="search-refresh")
+_search_refreshing = set()
+_search_refreshing_lock = threading.Lock()
 
-    for g in spotify_genres:
-        key = (g or "").lower()
-        if key in GENRE_MAP:
-            genre_name = GENRE_MAP[key]
-            return music_model.find_genre_no_by_name(genre_name)
-
-    return None
+def get_spotify_client():
+    """프로세스 공유 Spotify 클라이언트 (토큰 캐시/갱신은 services/spotify_client)"""
+    return spotify_client.get_client()
 
 
-def save_track_if_not_exists(sp, track):
-    """트랙이 DB에 없으면 저장, 있으면 기존 데이터 반환 (preview_url 없으면 업데이트)"""
-    spotify_url = track.get("external_urls", {}).get("spotify")
-    if not spotify_url:
-        return None, False
-
-    # 중복 체크
-    existing = music_model.find_by_spotify_url(spotify_url)
-    if existing:
-        # preview_url이 없으면 Deezer에서 가져와서 업데이트
-        if not existing.get('preview_url'):
-            track_name = existing.get('track_name', '')
-            artist_name = existing.get('artist_name', '')
-            preview_url = deezer.get_preview_url(track_name, artist_name)
-            if preview_url:
-                music_model.update_preview_url(existing['music_no'], preview_url)
-                existing['preview_url'] = preview_url
-        return existing, False  # 이미 존재
-
-    # 새로 저장
+def _build_music(track, track_id, genre_no, preview_url, is_enriched=True):
     artists = track.get("artists") or []
-    artist_id = artists[0].get("id") if artists else None
     artist_name = artists[0].get("name") if artists else ""
-
-    genre_no = extract_genre_no(sp, artist_id) if artist_id else None
+    artist_id = artists[0].get("id") if artists else None
 
     album = track.get("album") or {}
     images = album.get("images") or []
     album_image_url = images[0].get("url") if images else None
 
-    music = {
+    return {
         "track_name": track.get("name") or "",
         "artist_name": artist_name,
         "album_name": album.get("name") or "",
         "album_image_url": album_image_url,
         "duration_ms": track.get("duration_ms") or 0,
         "popularity": track.get("popularity") or 0,
-        "spotify_url": spotify_url,
+        "spotify_url": (track.get("external_urls") or {}).get("spotify")
+                       or f"https://open.spotify.com/track/{track_id}",
+        "spotify_track_id": track_id,
         "genre_no": genre_no,
-        "preview_url": deezer.get_preview_url(track.get("name") or "", artist_name)  # Deezer에서 30초 미리듣기 URL
+        "preview_url": preview_url,  # Deezer에서 30초 미리듣기 URL
+        "spotify_artist_id": artist_id,
+        "is_enriched": 1 if is_enriched else 0
     }
 
-    music_no = music_model.insert_music(music)
-    if music_no:
-        music["music_no"] = music_no
-        return music, True
 
-    return None, False
+def save_tracks(sp, tracks, defer_enrichment=False):
+    """
+    한 페이지 분량 트랙 저장 파이프라인
+    - DB에 없으면 저장, 있으면 기존 데이터 반환 (preview_url 없으면 업데이트)
+    - 트랙 식별은 spotify_track_id (유니크 인덱스), track_filter로 먼저 거르고 나머지만 IN 조회
+    - artist 장르는 genre.lookup_artist_genre_nos()로 일괄 조회
+      (Spotify / Deezer 조회가 실패한 신규 트랙은 is_enriched = 0 으로 저장 → 보강 poller가 재시도)
+    - Deezer preview는 필요한 트랙만 모아서 조회 (preview 캐시 → 나머지 동시 조회)
+    - 신규 트랙은 upsert_music_many()로 페이지당 한 번에 저장 (실패하면 예외 그대로 전달)
+    - defer_enrichment=True: 장르/preview 조회 없이 기본 정보만 저장하고
+      services/enrichment 백그라운드 보강에 맡김 (is_enriched = 0)
+    - 반환: 입력 순서대로 [(music, is_new), ...]
+    """
+    track_ids = [spotify_client.track_id_of(track) for track in tracks]
+
+    # 중복 체크: 트랙 필터에서 확실히 신규인 곡은 DB 조회 생략, 나머지는 IN 조회 한 번
+    # (필터는 힌트 → 다른 프로세스가 이미 저장한 곡은 upsert 결과로 기존 행 처리)
+    unique_ids = list(dict.fromkeys(track_id for track_id in track_ids if track_id))
+    definitely_new, maybe_ids = track_filter.split_known(unique_ids)
+    found = music_model.find_by_spotify_track_ids(maybe_ids)
+    if track_filter.is_ready():
+        track_filter.record_false_positives(len(maybe_ids) - len(found))
+    existing_by_id = {track_id: found.get(track_id) for track_id in unique_ids}
+
+    new_tracks = []
+    preview_pairs = []
+    for track, track_id in zip(tracks, track_ids):
+        if not track_id:
+            continue
+        existing = existing_by_id[track_id]
+        if existing:
+            if not existing.get('preview_url'):
+                preview_pairs.append((existing.get('track_name', ''), existing.get('artist_name', '')))
+        else:
+            new_tracks.append(track)
+            artists = track.get("artists") or []
+            preview_pairs.append((track.get("name") or "", artists[0].get("name") if artists else ""))
+
+    if defer_enrichment:
+        artist_genre_nos, failed_artists = {}, set()
+        preview_urls, failed_pairs = {}, set()
+    else:
+        artist_genre_nos, failed_artists = genre_service.lookup_artist_genre_nos(sp, new_tracks)
+        preview_urls, failed_pairs = preview_cache.lookup_preview_urls(preview_pairs)
+
+    # 신규 트랙은 페이지 단위로 한 번에 upsert
+    new_musics = {}
+    for track, track_id in zip(tracks, track_ids):
+        if not track_id or existing_by_id[track_id] or track_id in new_musics:
+            continue
+
+        artist_id = genre_service.first_artist_id(track)
+        if defer_enrichment or not artist_id or artist_id in failed_artists:
+            genre_no = None  # 조회 실패 → 보강 poller가 다시 채움
+        elif artist_id in artist_genre_nos:
+            genre_no = artist_genre_nos[artist_id]
+        else:
+            genre_no = genre_service.extract_genre_no(sp, artist_id)
+
+        artists = track.get("artists") or []
+        key = (track.get("name") or "", artists[0].get("name") if artists else "")
+        is_enriched = not defer_enrichment and artist_id not in failed_artists and key not in failed_pairs
+        new_musics[track_id] = _build_music(track, track_id, genre_no, preview_urls.get(key), is_enriched)
+
+    upserted = {}
+    if new_musics:
+        # 저장 실패(deadlock 재시도 후에도 실패 등)는 호출한 쪽으로 전달 → 페이지를 조용히 버리지 않음
+        musics = list(new_musics.values())
+        for music, row in zip(musics, music_model.upsert_music_many(musics)):
+            if row["music_no"]:
+                music["music_no"] = row["music_no"]
+                music["preview_url"] = row["preview_url"]  # 기존 행이면 저장된 값
+                upserted[music["spotify_track_id"]] = (music, row["is_new"])
+        try:
+            track_filter.add(upserted)
+            track_filter.record_stale_misses(
+                sum(1 for track_id in definitely_new if track_id in upserted and not upserted[track_id][1])
+            )
+            # 신규 곡 색인 + 기존 곡은 새 popularity 반영
+            catalog_index.add([music for music, _ in upserted.values()])
+        except Exception as e:
+            print(f"  ⚠️ 트랙 필터 / 검색 색인 반영 실패: {e}")
+
+    results = []
+    seen_new = set()
+    to_enrich = []
+    for track_id in track_ids:
+        if not track_id:
+            results.append((None, False))
+            continue
+
+        existing = existing_by_id[track_id]
+        if existing:
+            # preview_url이 없으면 Deezer 결과로 업데이트
+            if not existing.get('preview_url') and defer_enrichment:
+                to_enrich.append(existing['music_no'])
+            elif not existing.get('preview_url'):
+                key = (existing.get('track_name', ''), existing.get('artist_name', ''))
+                preview_url = preview_urls.get(key)
+                if preview_url:
+                    music_model.update_preview_url(existing['music_no'], preview_url)
+                    existing['preview_url'] = preview_url
+            results.append((existing, False))  # 이미 존재
+            continue
+
+        if track_id not in upserted:
+            results.append((None, False))
+            continue
+
+        # 같은 페이지에 같은 트랙이 다시 나오면 기존 데이터로 처리
+        music, is_new = upserted[track_id]
+        results.append((music, is_new and track_id not in seen_new))
+        seen_new.add(track_id)
+        # 신규 행 / 필터가 신규로 봤지만 이미 있던 행 중 preview_url이 비어 있는 행 → 보강
+        if defer_enrichment and (is_new or not music.get("preview_url")):
+            to_enrich.append(music["music_no"])
+
+    if to_enrich:
+        enrichment.enqueue(to_enrich)
+
+    return results
+
+
+def save_track_if_not_exists(sp, track):
+    """트랙이 DB에 없으면 저장, 있으면 기존 데이터 반환 (preview_url 없으면 업데이트)"""
+    return save_tracks(sp, [track])[0]
+
+
+def _search_live(keyword, category, page, size, defer_enrichment=False):
+    """Spotify 검색 + 저장 → (musics, total)"""
+    sp = get_spotify_client()
+    offset = (page - 1) * size
+
+    # category 처리(원하는 방식으로 확장 가능)
+    # - category=artist: artist 필드 중심으로 검색되게 쿼리 강화
+    if category == "artist":
+        q = f"artist:{keyword}"
+    else:
+        q = keyword
+
+    results = sp.search(
+        q=q,
+        type="track",
+        limit=size,
+        offset=offset,
+        market=SPOTIFY_MARKET
+    )
+
+    tracks_obj = results.get("tracks") or {}
+    total = tracks_obj.get("total") or 0
+    items = tracks_obj.get("items") or []
+
+    musics = []
+    for music, is_new in save_tracks(sp, items, defer_enrichment):
+        if music:
+            music["is_new"] = is_new
+            musics.append(music)
+
+    return musics, total
+
+
+def _search_cache_key(keyword, category, page, size):
+    return (" ".join(keyword.lower().split()), category or "", page, size, SPOTIFY_MARKET)
+
+
+def _refresh_search_cache(key, keyword, category, page, size):
+    try:
+        musics, total = _search_live(keyword, category, page, size)
+        SEARCH_CACHE.set(key, {"music_nos": [m["music_no"] for m in musics], "total": total})
+    except Exception as e:
+        # 갱신 실패 시 기존(stale) 결과를 계속 사용
+        print(f"검색 캐시 갱신 실패: {e}")
+    finally:
+        with _search_refreshing_lock:
+            _search_refreshing.discard(key)
+
+
+def _schedule_search_refresh(key, keyword, category, page, size):
+    """같은 키의 갱신은 한 번만 진행"""
+    with _search_refreshing_lock:
+        if key in _search_refreshing:
+            return
+        _search_refreshing.add(key)
+    _search_refresh_executor.submit(_refresh_search_cache, key, keyword, category, page, size)
+
+
+def resolve_fields(fields):
+    """?fields= → (조회 컬럼 튜플, error), 없으면 목록 카드 컬럼"""
+    try:
+        return music_model.resolve_columns(fields), None
+    except ValueError as e:
+        return None, str(e)
+
+
+def _project(musics, columns):
+    """Spotify 검색 직후 만든 행 → 요청 컬럼만 (is_new 유지)"""
+    if musics is None or columns is None:
+        return musics
+    keep = set(columns) | {"is_new"}
+    return [{k: v for k, v in music.items() if k in keep} for music in musics]
+
+
+def _load_cached_search(entry, columns=music_model.MUSIC_CARD_COLUMNS):
+    musics = music_model.find_by_music_nos(entry["music_nos"], columns)
+    for music in musics:
+        music["is_new"] = False
+    return musics, entry["total"], None
 
 
-def search_and_save_music(keyword, category, page, size):
+def search_and_save_music(keyword, category, page, size, defer_enrichment=False,
+                         columns=music_model.MUSIC_CARD_COLUMNS):
     """
     ✅ /music/search?q=...&category=...&page=1&size=12
     - Spotify에서 track 검색
     - DB에 저장(중복 제외)
+    - (query, category, page, size, market) 결과의 music_no 목록을 캐시
+      · fresh → DB에서 바로 조회 / stale → 바로 응답 + 백그라운드 갱신
+      · Spotify 오류 시 남아 있는 캐시가 있으면 그 결과로 응답
+    - defer_enrichment=True: preview/장르 조회 없이 바로 응답 (백그라운드 보강)
+    - columns: 응답 컬럼 (resolve_fields 결과)
     - 반환: (musics, total, error)
     """
+    # page/size 안전 처리
+    page = max(int(page or 1), 1)
+    size = max(int(size or 12), 1)
+
+    key = _search_cache_key(keyword, category, page, size)
     try:
-        sp = get_spotify_client()
+        entry, is_fresh = SEARCH_CACHE.get(key)
+        if entry is not None:
+            if not is_fresh:
+                _schedule_search_refresh(key, keyword, category, page, size)
+            return _load_cached_search(entry, columns)
+    except Exception as e:
+        print(f"검색 캐시 조회 실패: {e}")
 
-        # page/size 안전 처리
-        page = max(int(page or 1), 1)
-        size = max(int(size or 12), 1)
-        offset = (page - 1) * size
+    try:
+        musics, total = _search_live(keyword, category, page, size, defer_enrichment)
+        SEARCH_CACHE.set(key, {"music_nos": [m["music_no"] for m in musics], "total": total})
+        return _project(musics, columns), total, None
 
-        # category 처리(원하는 방식으로 확장 가능)
-        # - category=artist: artist 필드 중심으로 검색되게 쿼리 강화
-        if category == "artist":
-            q = f"artist:{keyword}"
-        else:
-            q = keyword
+    except Exception as e:
+        fallback = SEARCH_CACHE.peek(key)
+        if fallback is not None:
+            try:
+                return _load_cached_search(fallback, columns)
+            except Exception:
+                pass
+        return None, 0, str(e)
+
+
+def search_local_first(keyword, category, page, size, defer_enrichment=False,
+                       columns=music_model.MUSIC_CARD_COLUMNS, source=None):
+    """
+    ✅ /music/search?q=...&mode=local
+    - 저장된 카탈로그 로컬 색인에서 먼저 검색 (services/catalog_search)
+    - 일치 수가 적으면 한글 접두어/초성/로마자 검색 (services/hangul_index), 오타 허용 trigram 검색 (services/fuzzy_index)
+    - 그래도 적거나 색인이 준비되지 않았으면 Spotify 검색(search_and_save_music)으로 대체
+    - 출처는 현재 페이지 결과 수가 아니라 전체 일치 수(total)로 정함 → 같은 검색어의 모든 페이지가 같은 출처
+      source: 이전 페이지 응답의 source를 넘기면 그 출처로 고정 (페이지 사이에 색인이 바뀌어도 유지)
+    - 반환: (musics, total, source, error), source는 "local" / "hangul" / "fuzzy" / "spotify"
+    """
+    page = max(int(page or 1), 1)
+    size = max(int(size or 12), 1)
+    offset = (page - 1) * size
+    min_hits = min(size, LOCAL_SEARCH_MIN_HITS)
+
+    catalog_index.ensure_started()  # 준비 전에는 아래 is_ready()가 False → Spotify 검색
+    searches = []
+    if catalog_search.is_ready():
+        fields = ("artist_name",) if category == "artist" else catalog_search.FIELDS
+        searches.append(("local", lambda: catalog_search.search(keyword, fields, limit=size, offset=offset)))
+    if hangul_index.is_ready():
+        hangul_kinds = (hangul_index.KIND_ARTIST if category == "artist"
+                        else hangul_index.KIND_TRACK | hangul_index.KIND_ARTIST)
+        searches.append(("hangul", lambda: hangul_index.search(keyword, hangul_kinds, limit=size, offset=offset)))
+    if fuzzy_index.is_ready():
+        kinds = fuzzy_index.KIND_ARTIST if category == "artist" else fuzzy_index.KIND_TRACK | fuzzy_index.KIND_ARTIST
+        searches.append(("fuzzy", lambda: fuzzy_index.search(keyword, kinds, limit=size, offset=offset)))
+
+    pinned = [entry for entry in searches if entry[0] == source]
+    if source != "spotify":
+        for name, run in pinned or searches:
+            try:
+                music_nos, total = run()
+                if pinned or total >= min_hits:
+                    musics = music_model.find_by_music_nos(music_nos, columns)
+                    for music in musics:
+                        music["is_new"] = False
+                    return musics, total, name, None
+            except Exception as e:
+                print(f"{name} 검색 실패: {e}")
+
+    musics, total, error = search_and_save_music(keyword, category, page, size, defer_enrichment, columns)
+    return musics, total, "spotify", error
+
+
+def suggest_music(keyword, category=None, limit=10):
+    """
+    ✅ /music/suggest?q=...
+    - 입력 중인 검색어 자동완성, 메모리 색인만 사용 (services/suggest_index, Spotify/MySQL 조회 없음)
+    - category=artist → 아티스트 이름만, category=track → 곡 이름만
+    - 색인 warm-up 전에는 빈 목록 (lazy 모드면 첫 요청이 warm-up 시작)
+    """
+    keyword = (keyword or "").strip()
+    if not keyword:
+        return None, "검색어(q)가 필요합니다."
+    limit = min(max(int(limit or 10), 1), SUGGEST_MAX_LIMIT)
+    kinds = {
+        "artist": suggest_index.KIND_ARTIST,
+        "track": suggest_index.KIND_TRACK,
+    }.get(category, suggest_index.KIND_TRACK | suggest_index.KIND_ARTIST)
+    catalog_index.ensure_started()
+    if not suggest_index.is_ready():
+        return [], None
+    return suggest_index.suggest(keyword, kinds, limit), None
 
+
+BULK_IMPORT_PAGE_SIZE = 50
+
+
+def iter_bulk_import_pages(sp, query, total_count, offset=0, imported=0):
+    """
+    bulk import 페이지 단위 진행
+    - offset/imported: 이어서 실행할 때의 시작 위치와 이미 가져온 곡 수
+    - yield: (다음 offset, 해당 페이지 save_tracks() 결과)
+    """
+    while imported < total_count:
         results = sp.search(
-            q=q,
-            type="track",
-            limit=size,
+            q=query,
+            type='track',
+            limit=BULK_IMPORT_PAGE_SIZE,
             offset=offset,
-            market="KR"
+            market=SPOTIFY_MARKET
         )
+        tracks = (results.get('tracks') or {}).get('items') or []
+        if not tracks:
+            return
 
-        tracks_obj = results.get("tracks") or {}
-        total = tracks_obj.get("total") or 0
-        items = tracks_obj.get("items") or []
-
-        musics = []
-        for track in items:
-            music, is_new = save_track_if_not_exists(sp, track)
-            if music:
-                music["is_new"] = is_new
-                musics.append(music)
-
-        return musics, total, None
+        tracks = tracks[:total_count - imported]
+        page = save_tracks(sp, tracks)
+        imported += sum(1 for music, _ in page if music)
 
-    except Exception as e:
-        return None, 0, str(e)
+        offset += BULK_IMPORT_PAGE_SIZE
+        yield offset, page
 
 
 def bulk_import_music(query, total_count=100):
     """대량 음악 데이터 가져오기"""
     sp = get_spotify_client()
     all_tracks = []
-    limit = 50
-    offset = 0
 
     try:
-        while len(all_tracks) < total_count:
-            results = sp.search(
-                q=query,
-                type='track',
-                limit=limit,
-                offset=offset,
-                market='KR'
-            )
-            tracks = (results.get('tracks') or {}).get('items') or []
-            if not tracks:
-                break
-
-            for track in tracks:
-                if len(all_tracks) >= total_count:
-                    break
-
-                music, is_new = save_track_if_not_exists(sp, track)
+        for _, page in iter_bulk_import_pages(sp, query, total_count):
+            for music, is_new in page:
                 if music:
                     music['is_new'] = is_new
                     all_tracks.append(music)
 
-            offset += limit
-
         return all_tracks, None
 
     except Exception as e:
         return None, str(e)
 
 
+def iter_bulk_import_events(query, total_count=100, progress_every=10):
+    """
+    bulk import 스트리밍용 이벤트 generator (목록을 메모리에 모으지 않음)
+    - {"type": "track", "data": music}: 저장/확인된 곡마다
+    - {"type": "progress", ...}: progress_every곡마다 + 페이지 끝마다
+    - {"type": "done", ...} / {"type": "error", "message": ...}: 마지막 1회
+    """
+    processed = new_count = 0
+    last_reported = 0
+
+    def progress(kind):
+        return {
+            "type": kind,
+            "processed": processed,
+            "total": total_count,
+            "new": new_count,
+            "existing": processed - new_count,
+        }
+
+    try:
+        sp = get_spotify_client()
+        for _, page in iter_bulk_import_pages(sp, query, total_count):
+            for music, is_new in page:
+                if not music:
+                    continue
+                music['is_new'] = is_new
+                processed += 1
+                new_count += 1 if is_new else 0
+                yield {"type": "track", "data": music}
+
+                if processed - last_reported >= progress_every:
+                    last_reported = processed
+                    yield progress("progress")
+
+            if processed != last_reported:
+                last_reported = processed
+                yield progress("progress")
+
+        yield progress("done")
+
+    except Exception as e:
+        yield {**progress("error"), "message": str(e)}
+
+
 def get_global_top_50():
-    """Spotify 글로벌 Top 50 가져와서 저장"""
+    """Spotify 글로벌 Top 50 가져와서 저장 (각 곡에 chart_rank = 플레이리스트 위치)"""
     sp = get_spotify_client()
 
     try:
         playlist = sp.playlist_tracks(GLOBAL_TOP_50_PLAYLIST_ID, limit=50)
         items = playlist.get('items') or []
 
+        # 차트 순위 = 플레이리스트 위치 (저장 못 한 곡이 있어도 뒤 순위가 당겨지지 않음)
+        ranked = [(rank, item['track']) for rank, item in enumerate(items, start=1) if item.get('track')]
+
         saved = []
-        for item in items:
-            track = item.get('track')
-            if not track:
-                continue
-            music, is_new = save_track_if_not_exists(sp, track)
+        for (rank, _), (music, is_new) in zip(ranked, save_tracks(sp, [track for _, track in ranked])):
             if music:
                 music['is_new'] = is_new
+                music['chart_rank'] = rank
                 saved.append(music)
 
         return saved, None
@@ -215,14 +507,94 @@ def get_global_top_50():
         return None, str(e)
 
 
-def get_music_list(category=None, value=None):
-    return music_model.find_all(category, value), None
+def _encode_cursor(row):
+    raw = json.dumps([row['popularity'], row['music_no']], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor):
+    """opaque cursor → (popularity, music_no), 형식이 잘못되면 ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        popularity, music_no = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise ValueError(str(e))
+    if not isinstance(popularity, int) or not isinstance(music_no, int):
+        raise ValueError("cursor 값 형식 오류")
+    return popularity, music_no
+
+
+def get_music_list(category=None, value=None, cursor=None, size=None, with_total=False,
+                   columns=music_model.MUSIC_CARD_COLUMNS):
+    """
+    카탈로그 목록 (popularity DESC, music_no DESC keyset 페이지)
+    - cursor: 이전 응답의 next_cursor (없으면 첫 페이지), size는 MUSIC_LIST_MAX_SIZE로 제한
+    - columns: 응답 컬럼 (resolve_fields 결과, music_no / popularity는 cursor 때문에 항상 포함)
+    - with_total: 전체는 테이블 통계 추정치, 장르 필터는 인덱스 COUNT
+    - 반환: ({"items", "next_cursor", "size", ["total", "total_approx"]}, error)
+    """
+    size = min(max(size or MUSIC_LIST_DEFAULT_SIZE, 1), MUSIC_LIST_MAX_SIZE)
+    try:
+        after = _decode_cursor(cursor) if cursor else None
+    except ValueError:
+        return None, "잘못된 cursor입니다."
+
+    genre_no = None
+    if category == "genre":
+        genre_no = genre_service.genre_no_by_name(value)
+        if genre_no is None:
+            return None, f"존재하지 않는 장르입니다: {value}"
+
+    stats = genre_stats_model.find_by_genre_no(genre_no) if genre_no is not None else None
+    top = genre_stats_model.parse_top(stats['top_music_nos']) if stats else []
+
+    # 한 건 더 읽어서 다음 페이지 존재 여부 판단
+    # 장르 첫 페이지: 집계된 상위 목록으로 조회 (목록이 한 페이지보다 길거나 장르 전체일 때, 정렬 없음)
+    if after is None and stats and (len(top) > size or len(top) >= stats['track_count']):
+        rows = music_model.find_by_music_nos(top[:size + 1], columns)
+    else:
+        rows = music_model.find_all(genre_no, after, size + 1, columns)
+    items = rows[:size]
+    result = {
+        "items": items,
+        "next_cursor": _encode_cursor(items[-1]) if len(rows) > size else None,
+        "size": size,
+    }
+    if with_total:
+        if genre_no is None:
+            result["total"], result["total_approx"] = music_model.count_all_approx(), True
+        elif stats:
+            result["total"], result["total_approx"] = stats['track_count'], False
+        else:
+            result["total"], result["total_approx"] = music_model.count_by_genre_no(genre_no), False
+    return result, None
+
+
+def get_genre_facets(top=0, columns=music_model.MUSIC_CARD_COLUMNS):
+    """
+    ✅ /music/genres
+    - 장르별 곡 수 (genre_stats 집계, 곡 수 많은 순)
+    - top > 0: 장르마다 popularity 상위 top곡 (집계된 music_no 목록 → 행 캐시), 최대 GENRE_TOP_N
+    - 반환: ([{"genre_no", "name", "track_count", ["top"]}, ...], error)
+    """
+    try:
+        top = min(max(int(top or 0), 0), genre_stats_model.GENRE_TOP_N)
+        genres = []
+        for row in genre_stats_model.find_all():
+            genre = {"genre_no": row['genre_no'], "name": row['name'], "track_count": row['track_count']}
+            if top:
+                music_nos = genre_stats_model.parse_top(row['top_music_nos'])[:top]
+                genre["top"] = music_model.find_by_music_nos(music_nos, columns)
+            genres.append(genre)
+        return genres, None
+    except Exception as e:
+        return None, str(e)
 
 
 def get_fresh_preview_url(track_name, artist_name):
-    """실시간으로 Deezer에서 preview URL 가져오기"""
+    """Deezer preview URL 가져오기 (만료되지 않은 캐시가 있으면 캐시 사용)"""
     try:
-        preview_url = deezer.get_preview_url(track_name, artist_name)
+        preview_url = preview_cache.get_preview_url(track_name, artist_name)
         if preview_url:
             return preview_url, None
         return None, "Deezer에서 미리듣기를 찾을 수 없습니다."
@@ -0,0 +1,122 @@
+# backend/services/preview_cache.py
+"""
+Deezer preview URL 영속 캐시
+- 키: 정규화된 (track_name, artist_name)
+- Deezer 서명 URL의 exp 값으로 만료 시점 판단
+- "미리듣기 없음" 결과도 저장 (연속 miss마다 TTL을 늘리는 backoff)
+"""
+
+import hashlib
+import os
+import re
+import unicodedata
+from datetime import datetime, timedelta
+from urllib.parse import unquote
+
+from model import preview_cache as preview_cache_model
+from services import deezer
+
+# URL에 exp가 없을 때 기본 유효 기간
+PREVIEW_DEFAULT_TTL_SECONDS = int(os.getenv("PREVIEW_DEFAULT_TTL_SECONDS", 60 * 60 * 12))
+# 만료 직전 URL을 내주지 않기 위한 여유 시간
+PREVIEW_EXPIRY_MARGIN_SECONDS = int(os.getenv("PREVIEW_EXPIRY_MARGIN_SECONDS", 60 * 5))
+# "미리듣기 없음" 캐시: 첫 miss TTL, miss가 반복될 때마다 2배 (최대값까지)
+PREVIEW_MISS_TTL_SECONDS = int(os.getenv("PREVIEW_MISS_TTL_SECONDS", 60 * 60 * 6))
+PREVIEW_MISS_MAX_TTL_SECONDS = int(os.getenv("PREVIEW_MISS_MAX_TTL_SECONDS", 60 * 60 * 24 * 7))
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_EXP_RE = re.compile(r"(?:^|[?&~=])exp=(\d+)")
+
+
+def normalize(text):
+    """대소문자/공백/유니코드 표기 차이를 없앤 비교용 문자열"""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def make_cache_key(track_name, artist_name):
+    raw = f"{normalize(track_name)}\x1f{normalize(artist_name)}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def parse_expiry(preview_url):
+    """Deezer 서명 URL(hdnea=exp=...~acl=...)에서 만료 시각 추출, 없으면 None"""
+    match = _EXP_RE.search(unquote(preview_url or ""))
+    if not match:
+        return None
+    return datetime.fromtimestamp(int(match.group(1)))
+
+
+def _hit_expires_at(preview_url, now):
+    expires_at = parse_expiry(preview_url)
+    if expires_at is None:
+        return now + timedelta(seconds=PREVIEW_DEFAULT_TTL_SECONDS)
+    return expires_at - timedelta(seconds=PREVIEW_EXPIRY_MARGIN_SECONDS)
+
+
+def _miss_expires_at(miss_count, now):
+    ttl = PREVIEW_MISS_TTL_SECONDS * (2 ** max(miss_count - 1, 0))
+    return now + timedelta(seconds=min(ttl, PREVIEW_MISS_MAX_TTL_SECONDS))
+
+
+def lookup_preview_urls(pairs):
+    """
+    (track_name, artist_name) 목록의 preview URL 조회 (캐시 우선)
+    - 유효한 캐시 → 그대로 사용 (없음 결과 포함, HTTP 호출 없음)
+    - 나머지 → Deezer 동시 조회 후 캐시에 저장 (네트워크 오류는 저장하지 않음)
+    - 반환: ({(track_name, artist_name): preview_url | None}, 네트워크 오류로 조회하지 못한 pair 집합)
+      "없음" 결과(캐시 포함)는 조회 완료로 봄
+    """
+    pairs = list(dict.fromkeys(pairs))
+    if not pairs:
+        return {}, set()
+
+    keys = {pair: make_cache_key(*pair) for pair in pairs}
+    now = datetime.now()
+
+    try:
+        cached = preview_cache_model.find_by_keys(list(set(keys.values())))
+    except Exception as e:
+        print(f"preview 캐시 조회 실패: {e}")
+        cached = {}
+
+    preview_urls = {}
+    stale = []
+    for pair in pairs:
+        row = cached.get(keys[pair])
+        if row and row['expires_at'] > now:
+            preview_urls[pair] = row['preview_url']
+        else:
+            stale.append(pair)
+
+    entries = []
+    failed = set()
+    for result in deezer.resolve_preview_urls(stale):
+        pair = (result["track_name"], result["artist_name"])
+        preview_urls[pair] = result["preview_url"]
+        if result["error"]:
+            failed.add(pair)
+            continue
+
+        key = keys[pair]
+        if result["preview_url"]:
+            entries.append((key, pair[0], pair[1], result["preview_url"], 0,
+                            _hit_expires_at(result["preview_url"], now)))
+        else:
+            previous = cached.get(key)
+            miss_count = (previous['miss_count'] or 0) + 1 if previous and not previous['preview_url'] else 1
+            entries.append((key, pair[0], pair[1], None, miss_count,
+                            _miss_expires_at(miss_count, now)))
+
+    preview_cache_model.upsert_many(entries)
+    return preview_urls, failed
+
+
+def get_preview_urls(pairs):
+    """lookup_preview_urls()의 URL만 → {(track_name, artist_name): preview_url | None}"""
+    return lookup_preview_urls(pairs)[0]
+
+
+def get_preview_url(track_name, artist_name):
+    """단건 preview URL 조회 (캐시 우선)"""
+    return get_preview_urls([(track_name, artist_name)]).get((track_name, artist_name))
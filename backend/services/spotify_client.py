@@ -0,0 +1,193 @@
+# backend/services/spotify_client.py
+"""
+프로세스 단위 공유 Spotify 클라이언트
+- Spotify / SpotifyClientCredentials를 요청마다 만들지 않고 하나만 사용 (thread-safe)
+- client credentials 토큰은 메모리에 캐시, 만료 전에 백그라운드에서 미리 갱신
+- requests.Session 커넥션 풀을 요청 간에 재사용
+- 모든 API 호출은 services/gateway 의 "spotify" 게이트웨이를 거침 (호출량 제한/재시도/circuit breaker)
+- 토큰 갱신/API 호출 횟수 카운터 제공 (get_stats)
+"""
+
+import os
+import re
+import threading
+import time
+
+import requests
+from spotipy import Spotify
+from spotipy.cache_handler import MemoryCacheHandler
+from spotipy.exceptions import SpotifyException
+from spotipy.oauth2 import SpotifyClientCredentials
+
+from services import gateway
+
+# 만료 몇 초 전에 토큰을 미리 갱신할지
+SPOTIFY_TOKEN_REFRESH_MARGIN_SECONDS = int(os.getenv("SPOTIFY_TOKEN_REFRESH_MARGIN_SECONDS", 300))
+# 갱신 사이 최소 간격 (margin이 토큰 수명 이상이어도 토큰 엔드포인트를 연속 호출하지 않음)
+SPOTIFY_TOKEN_REFRESH_MIN_INTERVAL = 30
+# Spotify API 커넥션 풀 크기
+SPOTIFY_POOL_SIZE = int(os.getenv("SPOTIFY_POOL_SIZE", 10))
+# API / 토큰 주소 (부하 테스트 시 fake_upstream.py 로 지정)
+SPOTIFY_API_BASE = os.getenv("SPOTIFY_API_BASE", "https://api.spotify.com/v1/")
+SPOTIFY_TOKEN_URL = os.getenv("SPOTIFY_TOKEN_URL", "https://accounts.spotify.com/api/token")
+
+_client = None
+_client_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {
+    "token_refreshes": 0,
+    "token_refresh_failures": 0,
+    "api_calls": 0,
+    "api_errors": 0,
+}
+
+
+def _count(key):
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def _classify_error(e):
+    """gateway 재시도 판단: 429(Retry-After), 5xx, 네트워크 오류만 재시도"""
+    if isinstance(e, SpotifyException):
+        if e.http_status == 429:
+            return True, gateway.parse_retry_after(e.headers)
+        return (e.http_status or 0) >= 500, None
+    if isinstance(e, (requests.ConnectionError, requests.Timeout)):
+        return True, None
+    return False, None
+
+
+_gateway = gateway.register("spotify", _classify_error, "SPOTIFY")
+
+
+class _SharedClientCredentials(SpotifyClientCredentials):
+    """토큰 조회/갱신을 lock으로 직렬화하고 갱신 횟수를 세는 client credentials 매니저"""
+
+    OAUTH_TOKEN_URL = SPOTIFY_TOKEN_URL
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._token_lock = threading.Lock()
+
+    def get_access_token(self, as_dict=False, check_cache=True):
+        with self._token_lock:
+            return super().get_access_token(as_dict=as_dict, check_cache=check_cache)
+
+    def _request_access_token(self):
+        try:
+            token_info = super()._request_access_token()
+        except Exception:
+            _count("token_refresh_failures")
+            raise
+        _count("token_refreshes")
+        return token_info
+
+    def seconds_until_expiry(self):
+        token_info = self.cache_handler.get_cached_token()
+        if not token_info:
+            return 0
+        return token_info["expires_at"] - int(time.time())
+
+
+class _CountingSpotify(Spotify):
+    """gateway를 거쳐 호출하고 API 호출 횟수를 세는 Spotify 클라이언트"""
+
+    def _internal_call(self, method, url, payload, params):
+        internal_call = super()._internal_call
+
+        def attempt():
+            _count("api_calls")
+            try:
+                # 재시도 시 params가 다시 쓰일 수 있도록 복사본 전달
+                return internal_call(method, url, payload, dict(params))
+            except Exception:
+                _count("api_errors")
+                raise
+
+        return _gateway.call(attempt)
+
+
+def _build_session():
+    """풀 크기를 지정한 공유 Session (재시도는 gateway가 담당하므로 adapter 재시도 없음)"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=SPOTIFY_POOL_SIZE,
+        max_retries=0
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _refresh_loop(auth_manager):
+    """만료 SPOTIFY_TOKEN_REFRESH_MARGIN_SECONDS 전에 토큰을 미리 갱신"""
+    while True:
+        remaining = auth_manager.seconds_until_expiry()
+        if remaining <= SPOTIFY_TOKEN_REFRESH_MARGIN_SECONDS:
+            try:
+                auth_manager.get_access_token(check_cache=False)
+                remaining = auth_manager.seconds_until_expiry()
+            except Exception as e:
+                print(f"Spotify 토큰 갱신 실패: {e}")
+                time.sleep(SPOTIFY_TOKEN_REFRESH_MIN_INTERVAL)
+                continue
+        time.sleep(max(remaining - SPOTIFY_TOKEN_REFRESH_MARGIN_SECONDS, SPOTIFY_TOKEN_REFRESH_MIN_INTERVAL))
+
+
+def get_client():
+    """공유 Spotify 클라이언트 (최초 호출 시 생성 + 토큰 갱신 스레드 시작)"""
+    global _client
+    if _client is not None:
+        return _client
+
+    with _client_lock:
+        if _client is None:
+            client_id = os.getenv("SPOTIFY_CLIENT_ID")
+            client_secret = os.getenv("SPOTIFY_CLIENT_SECRET")
+
+            if not client_id or not client_secret:
+                raise RuntimeError("Spotify 환경변수(SPOTIFY_CLIENT_ID/SECRET)가 설정되지 않았습니다.")
+
+            auth_manager = _SharedClientCredentials(
+                client_id=client_id,
+                client_secret=client_secret,
+                cache_handler=MemoryCacheHandler()
+            )
+            client = _CountingSpotify(
+                auth_manager=auth_manager,
+                requests_session=_build_session()
+            )
+            client.prefix = SPOTIFY_API_BASE.rstrip("/") + "/"
+            threading.Thread(
+                target=_refresh_loop, args=(auth_manager,),
+                name="spotify-token-refresh", daemon=True
+            ).start()
+            _client = client
+    return _client
+
+
+def get_stats():
+    """토큰 갱신/API 호출 카운터 + 현재 토큰 남은 시간"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["initialized"] = _client is not None
+    stats["token_expires_in"] = _client.auth_manager.seconds_until_expiry() if _client else None
+    return stats
+
+
+# Spotify track id: base62 22자 (대소문자 구분)
+_TRACK_ID_RE = re.compile(r"track[/:]([A-Za-z0-9]{22})")
+
+
+def track_id_from_url(spotify_url):
+    """https://open.spotify.com/track/{id} (또는 spotify:track:{id}) → id, 형식이 다르면 None"""
+    match = _TRACK_ID_RE.search(spotify_url or "")
+    return match.group(1) if match else None
+
+
+def track_id_of(track):
+    """Spotify track 객체 → track id (id 필드가 없으면 external_urls에서 추출)"""
+    track = track or {}
+    return track.get("id") or track_id_from_url((track.get("external_urls") or {}).get("spotify"))
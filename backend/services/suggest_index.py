@@ -0,0 +1,229 @@
+# backend/services/suggest_index.py
+"""
+검색어 자동완성 (프로세스 메모리 접두어 색인, MySQL 조회 없음)
+- 이름 id / 표시용 이름 / KIND / 최고 popularity / 대표 곡은 services/catalog_index 공용 이름 표 사용
+- 키: 공백 없이 이어 붙인 정규화 이름의 자모 분해 ("좋은 날" → "ㅈㅗㅎㅇㅡㄴㄴㅏㄹ", "IU" → "iu")
+  한글 이름은 초성 키도 추가 ("ㅈㅇㄴ")
+- (접두어, KIND 비트)마다 popularity 상위 SUGGEST_TOP_K개 목록 유지 → dict 조회 한 번
+  · 짧은 접두어(SUGGEST_TOP_PREFIX_LEN 이하)는 warm-up 때 KIND 조합별로 미리 생성
+  · 긴 접두어는 정렬 배열(본 배열 + 정렬된 추가분)의 bisect 범위가 SUGGEST_MAX_SCAN 이하면 범위 전체를 바로 탐색,
+    더 크면 범위 전체 탐색 결과를 목록으로 저장 (최대 SUGGEST_CACHE_PREFIXES개, 오래된 것부터 삭제)
+  · 목록은 항상 정확한 상위 K개: 꽉 찬 목록에서 popularity가 내려가 맨 뒤로 밀린 이름이 있으면
+    목록을 지우고 다음 조회 때 범위 전체로 다시 계산
+- warm-up / 저장 시 추가는 catalog_index가 index_names()로 전달 (상위 목록도 바로 갱신)
+  popularity나 KIND가 바뀐 이름은 update_names()로 상위 목록에 다시 반영
+"""
+
+from bisect import bisect_left, insort
+import heapq
+import os
+import threading
+
+from services import catalog_index
+from services import hangul
+
+# 목록 크기 = 요청 최대 limit (services/music.py SUGGEST_MAX_LIMIT) → limit이 커도 목록 조회 한 번
+SUGGEST_TOP_K = int(os.getenv("SUGGEST_TOP_K", 20))
+SUGGEST_TOP_PREFIX_LEN = int(os.getenv("SUGGEST_TOP_PREFIX_LEN", 3))
+SUGGEST_MAX_SCAN = int(os.getenv("SUGGEST_MAX_SCAN", 3000))
+SUGGEST_CACHE_PREFIXES = int(os.getenv("SUGGEST_CACHE_PREFIXES", 5000))
+SUGGEST_PENDING_MIN = 1024
+
+KIND_TRACK = catalog_index.KIND_TRACK
+KIND_ARTIST = catalog_index.KIND_ARTIST
+KIND_NAMES = {KIND_TRACK: "track", KIND_ARTIST: "artist"}
+KIND_MASKS = (KIND_TRACK, KIND_ARTIST, KIND_TRACK | KIND_ARTIST)
+
+_top = {}                 # (짧은 접두어, KIND 비트) → popularity 순 공용 이름 id 목록 (최대 SUGGEST_TOP_K)
+_scanned = {}             # (긴 접두어, KIND 비트) → 범위 전체 탐색으로 만든 목록 (삽입 순서 = 오래된 순)
+_keys = []                # 정렬된 (키, 공용 이름 id)
+_pending = []             # 정렬된 추가분 (키, 공용 이름 id)
+_names = 0                # 색인한 이름 수
+_lock = threading.RLock()
+_ready = False
+_bulk = False             # warm-up 중에는 추가분을 합치지 않고 끝난 뒤 한 번에 정렬
+_stats = {"queries": 0, "top_hits": 0, "scans": 0, "full_scans": 0, "dropped": 0, "merges": 0}
+
+
+def is_ready():
+    return _ready
+
+
+def name_keys(name):
+    """정규화 이름 → 자모 분해 키 (+ 한글이면 초성 키)"""
+    compact = "".join(hangul.words(name))
+    if not compact:
+        return []
+    keys = [hangul.decompose(compact)]
+    if hangul.has_hangul(compact):
+        keys.append(hangul.choseong(compact))
+    return keys
+
+
+def query_key(query):
+    return hangul.decompose("".join(hangul.words(query)))
+
+
+def _offer(lists, key, name_id):
+    """
+    상위 목록에 이름 반영 (이미 있으면 재정렬)
+    꽉 찬 목록에서 이미 있던 이름이 맨 뒤로 밀리면 (popularity 하락) 목록 밖 이름이 더 높을 수 있음 → 목록 삭제
+    """
+    top = lists.get(key)
+    if top is None:
+        if _bulk and lists is _top:
+            lists[key] = [name_id]
+        return  # 없는 목록은 다음 조회 때 범위 전체로 계산
+    popularity = catalog_index.name_popularity(name_id)
+    existing = name_id in top
+    if not existing:
+        if len(top) >= SUGGEST_TOP_K and popularity <= catalog_index.name_popularity(top[-1]):
+            return
+        top.append(name_id)
+    top.sort(key=lambda i: -catalog_index.name_popularity(i))
+    if existing and len(top) >= SUGGEST_TOP_K and top[-1] == name_id:
+        del lists[key]
+        _stats["dropped"] += 1
+        return
+    del top[SUGGEST_TOP_K:]
+
+
+def _merge_pending():
+    global _pending
+    _keys.extend(_pending)
+    _keys.sort()  # 정렬된 두 구간 → timsort가 한 번의 병합으로 처리
+    _pending = []
+    _stats["merges"] += 1
+
+
+def _offer_all(name_id, keys):
+    """이름의 모든 접두어 × 해당 KIND 비트 상위 목록에 이름 반영"""
+    kinds = catalog_index.name_kinds(name_id)
+    masks = [mask for mask in KIND_MASKS if kinds & mask]
+    max_len = SUGGEST_TOP_PREFIX_LEN if not _scanned else None  # 긴 접두어 목록이 없으면 짧은 접두어만
+    prefixes = {key[:length] for key in keys for length in range(1, len(key[:max_len]) + 1)}
+    for prefix in prefixes:
+        lists = _top if len(prefix) <= SUGGEST_TOP_PREFIX_LEN else _scanned
+        for mask in masks:
+            _offer(lists, (prefix, mask), name_id)
+
+
+def index_names(name_ids):
+    """catalog_index hook: 새 이름 키 추가 + 짧은 접두어 상위 목록 갱신"""
+    global _names
+    with _lock:
+        for name_id in name_ids:
+            keys = name_keys(catalog_index.name_text(name_id))
+            if not keys:
+                continue
+            _names += 1
+            for key in keys:
+                if _bulk:
+                    _pending.append((key, name_id))
+                else:
+                    insort(_pending, (key, name_id))
+            _offer_all(name_id, keys)
+        if not _bulk and len(_pending) >= max(SUGGEST_PENDING_MIN, len(_keys) // 32):
+            _merge_pending()
+
+
+def update_names(name_ids):
+    """catalog_index hook: popularity / KIND가 바뀐 이름 → 상위 목록에 다시 반영"""
+    with _lock:
+        for name_id in name_ids:
+            _offer_all(name_id, name_keys(catalog_index.name_text(name_id)))
+
+
+def _range(keys, prefix):
+    """prefix로 시작하는 키의 [시작, 끝) 위치"""
+    return bisect_left(keys, (prefix,)), bisect_left(keys, (prefix + "\U0010ffff",))
+
+
+def _top_names(prefix, kinds, limit):
+    """접두어 범위 전체 탐색 → popularity 상위 limit개 이름 id"""
+    matched = set()
+    for keys in (_pending, _keys):
+        start, end = _range(keys, prefix)
+        matched.update(name_id for _, name_id in keys[start:end])
+    return heapq.nlargest(
+        limit, (i for i in matched if catalog_index.name_kinds(i) & kinds), key=catalog_index.name_popularity
+    )
+
+
+def _kind_names(name_id, kinds):
+    return [KIND_NAMES[kind] for kind in (KIND_ARTIST, KIND_TRACK) if catalog_index.name_kinds(name_id) & kinds & kind]
+
+
+def suggest(query, kinds=KIND_TRACK | KIND_ARTIST, limit=10):
+    """
+    반환: [{"text", "type", "types", "popularity", "music_no"}, ...] popularity 내림차순
+    kinds: KIND_TRACK / KIND_ARTIST 비트, limit은 SUGGEST_TOP_K까지
+    type: 곡 이름이면서 아티스트 이름이면 "artist" (types에 둘 다)
+    """
+    prefix = query_key(query)
+    if not prefix:
+        return []
+    limit = min(limit, SUGGEST_TOP_K)
+    key = (prefix, kinds)
+    with _lock:
+        _stats["queries"] += 1
+        lists = _top if len(prefix) <= SUGGEST_TOP_PREFIX_LEN else _scanned
+        top = lists.get(key)
+        if top is not None and (len(top) >= limit or len(top) < SUGGEST_TOP_K):
+            # 목록이 꽉 차지 않았으면 해당 접두어 이름 전체
+            _stats["top_hits"] += 1
+            candidates = top
+        elif top is None and sum(end - start for start, end in (_range(_pending, prefix), _range(_keys, prefix))) \
+                <= SUGGEST_MAX_SCAN:
+            _stats["scans"] += 1
+            candidates = _top_names(prefix, kinds, limit)
+        else:
+            # 범위가 큼 → 범위 전체 탐색 후 상위 목록 저장
+            _stats["full_scans"] += 1
+            candidates = _top_names(prefix, kinds, SUGGEST_TOP_K)
+            if lists is _scanned:
+                _scanned.pop(key, None)
+                while len(_scanned) >= SUGGEST_CACHE_PREFIXES:
+                    del _scanned[next(iter(_scanned))]
+            lists[key] = candidates[:SUGGEST_TOP_K]
+        return [
+            {
+                "text": catalog_index.name_text(i),
+                "type": _kind_names(i, kinds)[0],
+                "types": _kind_names(i, kinds),
+                "popularity": catalog_index.name_popularity(i),
+                "music_no": catalog_index.name_music(i),
+            }
+            for i in candidates[:limit]
+        ]
+
+
+def begin_bulk():
+    """catalog_index hook: warm-up 시작 → 추가분은 정렬하지 않고 모아 둠"""
+    global _bulk
+    with _lock:
+        _bulk = True
+
+
+def end_bulk(ok):
+    """catalog_index hook: warm-up 끝 → 한 번에 정렬, 성공했으면 자동완성 사용 시작"""
+    global _bulk, _ready
+    with _lock:
+        _bulk = False
+        _merge_pending()
+        _scanned.clear()
+    _ready = _ready or ok
+
+
+def stats():
+    with _lock:
+        result = dict(_stats)
+        result.update({
+            "ready": _ready,
+            "names": _names,
+            "keys": len(_keys),
+            "pending": len(_pending),
+            "prefixes": len(_top),
+            "scanned_prefixes": len(_scanned),
+        })
+    return result
@@ -0,0 +1,132 @@
+# backend/services/top50.py
+"""
+글로벌 Top 50 스냅샷
+- 스케줄러가 주기적으로 Spotify에서 가져와 순위/가져온 시각과 함께 저장
+- GET /music/top50 은 저장된 최신 스냅샷만 조회 (ETag 지원)
+  ETag = 스냅샷 번호 + 응답 곡 목록 해시 → 스냅샷이 같아도 곡 정보(preview_url 등)가 바뀌면 달라짐
+- 여러 worker/노드 중 MySQL named lock을 잡은 하나만 갱신
+  스냅샷이 하나도 없을 때 요청은 TOP50_REQUEST_WAIT_SECONDS까지 잠금을 기다림
+  (시작 직후 스케줄러가 갱신 중이면 그 결과를 받아서 응답)
+- 순위는 차트(플레이리스트) 위치 그대로 저장 → 저장 못 한 곡이 있어도 순위가 당겨지지 않음
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from db import named_lock
+from model import top50_snapshot as snapshot_model
+from services import music as music_service
+
+TOP50_REFRESH_INTERVAL_SECONDS = int(os.getenv("TOP50_REFRESH_INTERVAL_SECONDS", 60 * 60 * 6))
+TOP50_REQUEST_WAIT_SECONDS = int(os.getenv("TOP50_REQUEST_WAIT_SECONDS", 15))
+TOP50_LOCK_NAME = "listify:top50_refresh"
+TOP50_NOT_READY = "Top 50 스냅샷이 아직 준비되지 않았습니다."
+
+_scheduler_started = False
+_scheduler_lock = threading.Lock()
+
+
+def _serialize_snapshot(snapshot):
+    if snapshot.get('fetched_at') and hasattr(snapshot['fetched_at'], 'isoformat'):
+        snapshot['fetched_at'] = snapshot['fetched_at'].isoformat()
+    return snapshot
+
+
+def _etag(snapshot_no, musics):
+    body = json.dumps(musics, sort_keys=True, default=str, ensure_ascii=False)
+    return f"top50-{snapshot_no}-{hashlib.sha1(body.encode('utf-8')).hexdigest()[:16]}"
+
+
+def refresh_snapshot(force=False, lock_timeout=0):
+    """
+    스냅샷 갱신 (다른 노드가 갱신 중이거나, 최근 스냅샷이 아직 유효하면 건너뜀)
+    lock_timeout: 다른 노드가 갱신 중일 때 기다릴 시간(초) → 잠금을 얻었을 때 그쪽이 방금 저장했으면 건너뜀
+    반환: (snapshot_no | None, error)
+    """
+    with named_lock(TOP50_LOCK_NAME, lock_timeout) as acquired:
+        if not acquired:
+            return None, None
+
+        age = snapshot_model.seconds_since_latest()
+        if not force and age is not None and age < TOP50_REFRESH_INTERVAL_SECONDS:
+            return None, None
+
+        musics, error = music_service.get_global_top_50()
+        if error:
+            print(f"❌ Top 50 스냅샷 갱신 실패: {error}")
+            return None, error
+
+        ranked = [(m['chart_rank'], m['music_no']) for m in musics]
+        snapshot_no = snapshot_model.insert_snapshot(music_service.GLOBAL_TOP_50_PLAYLIST_ID, ranked)
+        print(f"✅ Top 50 스냅샷 #{snapshot_no} 저장 ({len(ranked)}곡)")
+        return snapshot_no, None
+
+
+def _load(snapshot):
+    musics = snapshot_model.find_items(snapshot['snapshot_no'])
+    snapshot = _serialize_snapshot(snapshot)
+    snapshot['etag'] = _etag(snapshot['snapshot_no'], musics)
+    return snapshot, musics
+
+
+def get_latest():
+    """
+    최신 스냅샷 조회 → (snapshot, musics, error)
+    아직 없으면 한 번 즉시 갱신 (스케줄러 / 다른 노드가 갱신 중이면 TOP50_REQUEST_WAIT_SECONDS까지 기다린 뒤 그 결과 사용)
+    """
+    try:
+        snapshot = snapshot_model.find_latest()
+        if not snapshot:
+            _, error = refresh_snapshot(lock_timeout=TOP50_REQUEST_WAIT_SECONDS)
+            if error:
+                return None, None, error
+            snapshot = snapshot_model.find_latest()
+            if not snapshot:
+                return None, None, TOP50_NOT_READY
+
+        snapshot, musics = _load(snapshot)
+        return snapshot, musics, None
+    except Exception as e:
+        return None, None, str(e)
+
+
+def get_snapshot(snapshot_no):
+    """지난 스냅샷 조회 → (snapshot, musics, error)"""
+    try:
+        snapshot = snapshot_model.find_by_snapshot_no(snapshot_no)
+        if not snapshot:
+            return None, None, "존재하지 않는 스냅샷"
+        snapshot, musics = _load(snapshot)
+        return snapshot, musics, None
+    except Exception as e:
+        return None, None, str(e)
+
+
+def list_snapshots(limit=20, offset=0):
+    try:
+        return [_serialize_snapshot(s) for s in snapshot_model.list_snapshots(limit, offset)], None
+    except Exception as e:
+        return None, str(e)
+
+
+def start_scheduler():
+    """프로세스 시작 시 1회 호출: 주기적으로 스냅샷 갱신 시도"""
+    global _scheduler_started
+    with _scheduler_lock:
+        if _scheduler_started:
+            return
+        _scheduler_started = True
+
+    def loop():
+        while True:
+            try:
+                refresh_snapshot()
+            except Exception as e:
+                print(f"Top 50 스케줄러 오류: {e}")
+            # 모든 노드가 같은 시각에 깨어나지 않도록 짧게 나눠서 확인
+            time.sleep(min(TOP50_REFRESH_INTERVAL_SECONDS, 600))
+
+    threading.Thread(target=loop, name="top50-scheduler", daemon=True).start()
@@ -0,0 +1,189 @@
+# backend/services/track_filter.py
+"""
+카탈로그 트랙 존재 여부 Bloom filter (프로세스 메모리)
+- 키는 spotify_track_id, 서버 시작 시 music 테이블에서 백그라운드 warm-up, 저장할 때마다 추가
+- might_contain() False → "확실히 신규" (DB 조회 생략)
+- True → "있을 수도 있음" → 페이지 단위 IN (...) 조회 한 번으로 확인
+- 다른 프로세스가 저장한 트랙은 TRACK_FILTER_REFRESH_SECONDS마다 마지막 music_no 근처부터 읽어 추가
+  AUTO_INCREMENT 순서와 commit 순서는 다름 → 직전 갱신 시점의 마지막 music_no와
+  TRACK_FILTER_REFRESH_OVERLAP개 아래 중 더 앞에서부터 다시 읽음 (늦게 commit된 낮은 번호 포함, 다시 추가해도 무해)
+  그 사이에는 신규로 볼 수 있으므로 "확실히 신규"는 힌트로만 사용
+  (upsert_music_many()가 유니크 키로 기존 행을 찾아 is_new를 판정, 관측 횟수는 stale_misses)
+- 이론/관측 false positive 비율과 메모리 사용량을 stats()로 제공
+"""
+
+import hashlib
+import math
+import os
+import threading
+import time
+
+from model import music as music_model
+
+TRACK_FILTER_CAPACITY = int(os.getenv("TRACK_FILTER_CAPACITY", 1_000_000))
+TRACK_FILTER_FP_RATE = float(os.getenv("TRACK_FILTER_FP_RATE", 0.01))
+TRACK_FILTER_REFRESH_SECONDS = int(os.getenv("TRACK_FILTER_REFRESH_SECONDS", 300))
+TRACK_FILTER_REFRESH_OVERLAP = int(os.getenv("TRACK_FILTER_REFRESH_OVERLAP", 1000))
+
+
+class BloomFilter:
+    def __init__(self, capacity, fp_rate):
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.num_bits = max(8, int(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        # double hashing: h1 + i * h2
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        new = False
+        for pos in self._positions(key):
+            byte, bit = divmod(pos, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                new = True
+        if new:
+            self.count += 1
+
+    def might_contain(self, key):
+        for pos in self._positions(key):
+            byte, bit = divmod(pos, 8)
+            if not self.bits[byte] & (1 << bit):
+                return False
+        return True
+
+    def estimated_fp_rate(self):
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+
+_filter = BloomFilter(TRACK_FILTER_CAPACITY, TRACK_FILTER_FP_RATE)
+_lock = threading.Lock()
+_ready = False
+_warm_started = False
+_loaded_music_no = 0  # 필터에 반영된 가장 큰 music_no
+_rescan_after = 0     # 다음 갱신 시작 위치 후보 (직전 갱신 시작 때의 _loaded_music_no)
+_stats = {"lookups": 0, "definitely_new": 0, "maybe_existing": 0, "false_positives": 0,
+          "stale_misses": 0, "refreshes": 0}
+
+
+def is_ready():
+    return _ready
+
+
+def add(keys):
+    with _lock:
+        for key in keys:
+            if key:
+                _filter.add(key)
+
+
+def split_known(keys):
+    """
+    키 목록 → (확실히 신규, 있을 수도 있음)
+    warm-up 전에는 전부 "있을 수도 있음"으로 취급
+    """
+    if not _ready:
+        return [], list(keys)
+
+    definitely_new, maybe = [], []
+    with _lock:
+        for key in keys:
+            (maybe if _filter.might_contain(key) else definitely_new).append(key)
+        _stats["lookups"] += len(definitely_new) + len(maybe)
+        _stats["definitely_new"] += len(definitely_new)
+        _stats["maybe_existing"] += len(maybe)
+    return definitely_new, maybe
+
+
+def record_false_positives(count):
+    """"있을 수도 있음"이었지만 DB에 없던 키 수 (관측 false positive)"""
+    with _lock:
+        _stats["false_positives"] += count
+
+
+def record_stale_misses(count):
+    """"확실히 신규"였지만 upsert 때 이미 있던 키 수 (다른 프로세스가 저장, 아직 갱신 전)"""
+    with _lock:
+        _stats["stale_misses"] += count
+
+
+def _load_after(batch_size, after_music_no):
+    """after_music_no 이후 행의 spotify_track_id 추가 → 읽은 수"""
+    global _loaded_music_no
+    loaded = 0
+    for rows in music_model.iter_spotify_track_ids(batch_size, after_music_no):
+        add(row['spotify_track_id'] for row in rows)
+        _loaded_music_no = max(_loaded_music_no, rows[-1]['music_no'])
+        loaded += len(rows)
+    return loaded
+
+
+def warm_up(batch_size=5000):
+    """music 테이블의 모든 spotify_track_id 로드 → 완료 후 필터 사용 시작"""
+    global _ready, _rescan_after
+    try:
+        loaded = _load_after(batch_size, 0)
+        _rescan_after = _loaded_music_no
+        _ready = True
+        print(f"✅ 트랙 필터 warm-up 완료: {loaded}곡")
+    except Exception as e:
+        # 준비되지 않은 상태로 두면 모든 트랙을 DB에서 확인 (기존 동작)
+        print(f"트랙 필터 warm-up 실패: {e}")
+
+
+def refresh(batch_size=5000):
+    """warm-up 이후 (다른 프로세스 포함) 저장된 행 추가 (겹치는 구간은 다시 읽음)"""
+    global _rescan_after
+    try:
+        started_at = _loaded_music_no
+        loaded = _load_after(batch_size, max(min(_rescan_after, started_at - TRACK_FILTER_REFRESH_OVERLAP), 0))
+        _rescan_after = started_at
+        with _lock:
+            _stats["refreshes"] += 1
+        return loaded
+    except Exception as e:
+        print(f"트랙 필터 갱신 실패: {e}")
+        return 0
+
+
+def _refresh_loop():
+    warm_up()
+    while True:
+        time.sleep(TRACK_FILTER_REFRESH_SECONDS)
+        if _ready:
+            refresh()
+        else:
+            warm_up()  # 시작 시 warm-up이 실패했으면 다시 시도
+
+
+def start_warm_up():
+    """프로세스 시작 시 1회 호출 (warm-up 후 주기적으로 갱신)"""
+    global _warm_started
+    with _lock:
+        if _warm_started:
+            return
+        _warm_started = True
+    threading.Thread(target=_refresh_loop, name="track-filter-warmup", daemon=True).start()
+
+
+def stats():
+    with _lock:
+        result = dict(_stats)
+        result.update({
+            "ready": _ready,
+            "items": _filter.count,
+            "capacity": _filter.capacity,
+            "num_hashes": _filter.num_hashes,
+            "memory_bytes": len(_filter.bits),
+            "estimated_fp_rate": round(_filter.estimated_fp_rate(), 6),
+        })
+    maybe = result["maybe_existing"]
+    result["observed_fp_rate"] = round(result["false_positives"] / maybe, 6) if maybe else 0.0
+    return result
@@ -3,6 +3,8 @@
 
 import pymysql
 
+import migrate
+
 # Railway MySQL 연결 정보
 config = {
     'host': 'switchyard.proxy.rlwy.net',
@@ -43,18 +45,22 @@ CREATE TABLE IF NOT EXISTS genre (
 -- music 테이블
 CREATE TABLE IF NOT EXISTS music (
   music_no INT PRIMARY KEY AUTO_INCREMENT,
-  spotify_track_id VARCHAR(50),
+  spotify_track_id CHAR(22) CHARACTER SET ascii COLLATE ascii_bin,
   album_image_url VARCHAR(1000),
   album_name VARCHAR(500),
   artist_name VARCHAR(500),
   duration_ms INT,
-  popularity INT,
+  popularity INT NOT NULL DEFAULT 0,
   spotify_url VARCHAR(255),
   track_name VARCHAR(500),
   release_date DATE,
   release_year INT,
   genre_no INT,
-  preview_url VARCHAR(500)
+  preview_url VARCHAR(500),
+  spotify_artist_id VARCHAR(50),
+  is_enriched TINYINT(1) NOT NULL DEFAULT 1,
+  UNIQUE KEY uq_music_spotify_url (spotify_url),
+  UNIQUE KEY uq_music_spotify_track_id (spotify_track_id)
 );
 
 -- playlist 테이블
@@ -83,6 +89,9 @@ CREATE TABLE IF NOT EXISTS notice (
   created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
   updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
 );
+
+-- artist_genre_cache / preview_cache / import_job / top50_snapshot(_item) / genre_stats는
+-- migrate.py 버전별 마이그레이션에서 생성
 """
 
 # 기본 데이터
@@ -96,6 +105,14 @@ INSERT IGNORE INTO genre (name) VALUES
 ('Electronic'), ('Rock'), ('Metal'), ('Indie'), ('Classical');
 """
 
+def _statements(sql):
+    """SQL 묶음 → 실행할 문장 목록 (앞에 붙은 -- 주석 줄 제거, 주석만 있는 조각은 제외)"""
+    for chunk in sql.split(';'):
+        statement = "\n".join(line for line in chunk.splitlines() if not line.strip().startswith('--')).strip()
+        if statement:
+            yield statement
+
+
 def main():
     print("🔌 Railway MySQL 연결 중...")
     conn = pymysql.connect(**config)
@@ -104,22 +121,21 @@ def main():
         with conn.cursor() as cursor:
             # 테이블 생성
             print("📦 테이블 생성 중...")
-            for statement in TABLES.split(';'):
-                statement = statement.strip()
-                if statement and not statement.startswith('--'):
-                    cursor.execute(statement)
+            for statement in _statements(TABLES):
+                cursor.execute(statement)
             
-            # 기본 데이터 삽입
+            # 기본 데이터 삽입 (마이그레이션 전 → 3번 장르 집계에 기본 장르 포함)
             print("🌱 기본 데이터 삽입 중...")
-            for statement in SEED.split(';'):
-                statement = statement.strip()
-                if statement and not statement.startswith('--'):
-                    try:
-                        cursor.execute(statement)
-                    except pymysql.err.IntegrityError:
-                        pass  # 이미 존재하는 데이터 무시
-            
+            for statement in _statements(SEED):
+                try:
+                    cursor.execute(statement)
+                except pymysql.err.IntegrityError:
+                    pass  # 이미 존재하는 데이터 무시
             conn.commit()
+
+            # 새 테이블 / 컬럼 / 인덱스는 버전 관리 마이그레이션으로 적용 (migrate.py)
+            print("🔑 마이그레이션 적용 중...")
+            migrate.migrate(conn)
             print("✅ 완료!")
             
             # 테이블 목록 확인
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+외부 API 게이트웨이 (token bucket / Retry-After / circuit breaker) 테스트 (네트워크 호출 없음)
+실행: python test_gateway.py
+"""
+
+import sys
+import io
+import time
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from services.gateway import CircuitOpenError, ProviderGateway, RateLimitedError
+
+
+class FakeRateLimit(Exception):
+    """429 + Retry-After"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"429 Retry-After {retry_after}")
+        self.retry_after = retry_after
+
+
+def classify(exc):
+    if isinstance(exc, FakeRateLimit):
+        return True, exc.retry_after
+    return False, None
+
+
+def test_half_open_trial_released_when_rejected_before_upstream():
+    """
+    429(Retry-After가 max_wait보다 김) → circuit open → reset 후 half_open 시험 호출이
+    Retry-After 대기 중이라 upstream 전에 거절 → cooldown이 끝나면 다시 호출 가능해야 함
+    """
+    gw = ProviderGateway(
+        "test", classify, rate=100, burst=10, max_retries=0,
+        max_wait=0.5, failure_threshold=1, reset_timeout=0.3
+    )
+    calls = []
+
+    def upstream(fail):
+        calls.append(fail)
+        if fail:
+            raise FakeRateLimit(1.5)
+        return "ok"
+
+    try:
+        gw.call(upstream, True)
+        assert False, "429가 그대로 전달되어야 함"
+    except FakeRateLimit:
+        pass
+    assert gw.breaker.state == "open"
+
+    time.sleep(0.4)  # reset_timeout 지남, Retry-After는 아직 남음
+    try:
+        gw.call(upstream, False)
+        assert False, "Retry-After 대기 중에는 거절되어야 함"
+    except RateLimitedError:
+        pass
+    assert len(calls) == 1, "upstream 전에 거절되어야 함"
+
+    time.sleep(1.2)  # Retry-After 지남
+    assert gw.call(upstream, False) == "ok"
+    assert gw.breaker.state == "closed"
+
+
+def test_circuit_open_rejects_without_upstream():
+    gw = ProviderGateway(
+        "test", classify, rate=100, burst=10, max_retries=0,
+        max_wait=5, failure_threshold=1, reset_timeout=60
+    )
+    try:
+        gw.call(lambda: (_ for _ in ()).throw(FakeRateLimit(0)))
+    except FakeRateLimit:
+        pass
+    try:
+        gw.call(lambda: "ok")
+        assert False, "circuit open 동안은 거절되어야 함"
+    except CircuitOpenError:
+        pass
+
+
+if __name__ == "__main__":
+    test_half_open_trial_released_when_rejected_before_upstream()
+    test_circuit_open_rejects_without_upstream()
+    print("✅ 게이트웨이 테스트 통과 (2건)")
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Spotify 장르 문자열 → 우리 장르 분류 테스트 (DB / Spotify 호출 없음)
+실행: python test_genre.py
+"""
+
+import sys
+import io
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from services.genre import classify_spotify_genre, classify_spotify_genres
+
+# (Spotify 장르 문자열, 기대하는 우리 장르 이름 | None)
+CASES = [
+    # 마지막 단어(중심어) 기준
+    ("garage rock", "Rock"),
+    ("funk rock", "Rock"),
+    ("soul jazz", "Jazz"),
+    ("pop rap", "Hip-Hop"),
+    ("rap metal", "Metal"),
+    ("uk garage", "Electronic"),
+    ("modern rock", "Rock"),
+    ("southern hip hop", "Hip-Hop"),
+    # 수식어가 앞에 오는 여러 단어 패턴
+    ("electro swing", "Electronic"),
+    ("indie pop", "Indie"),
+    ("neo soul", "R&B"),
+    ("k-pop boy group", "K-Pop"),
+    # 붙여 쓴 합성어
+    ("electropop", "Pop"),
+    ("synthpop", "Pop"),
+    ("synth-pop", "Pop"),
+    ("krautrock", "Rock"),
+    # 명시 패턴이 합성어 규칙보다 우선
+    ("britpop", "Rock"),
+    ("kpop", "K-Pop"),
+    ("mandopop", "Pop"),
+    # 단어 경계
+    ("korean r&b", "R&B"),
+    ("k-rap", "Hip-Hop"),
+    ("rockabilly", None),
+    ("latin", None),
+    ("", None),
+]
+
+# (artist 장르 목록, 기대하는 우리 장르 이름 | None) → 득표 수, 같으면 규칙 우선순위
+LIST_CASES = [
+    (["k-pop", "k-pop boy group", "pop"], "K-Pop"),
+    (["garage rock", "funk rock", "soul jazz"], "Rock"),
+    (["electropop", "dance pop"], "Pop"),
+    (["rap", "pop"], "Hip-Hop"),
+    ([], None),
+]
+
+
+def test_classify_spotify_genre():
+    for spotify_genre, expected in CASES:
+        result = classify_spotify_genre(spotify_genre)
+        actual = result[1] if result else None
+        assert actual == expected, f"{spotify_genre!r}: {actual!r} != {expected!r}"
+
+
+def test_classify_spotify_genres():
+    for spotify_genres, expected in LIST_CASES:
+        actual = classify_spotify_genres(spotify_genres)
+        assert actual == expected, f"{spotify_genres!r}: {actual!r} != {expected!r}"
+
+
+if __name__ == "__main__":
+    test_classify_spotify_genre()
+    test_classify_spotify_genres()
+    print(f"✅ 장르 분류 테스트 통과 ({len(CASES) + len(LIST_CASES)}건)")
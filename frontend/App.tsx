@@ -12,7 +12,7 @@ import {
 } from 'lucide-react';
 
 import { Music, Playlist, AppView, User } from './types';
-import { searchMusic, getAllMusic, getTop50Music, getMusicByGenre, getPreviewUrl } from './services/musicService';
+import { searchMusic, suggestMusic, MusicSuggestion, getAllMusic, getTop50Music, getMusicByGenre, getGenreFacets, GenreFacet, getPreviewUrl } from './services/musicService';
 import { login, register, logout as logoutApi, getToken, verifyToken } from './services/authService';
 import { getUserPlaylists, createPlaylist, updatePlaylist, deletePlaylist, addMusicToPlaylist, removeMusicFromPlaylist, getPlaylistMusic } from './services/playlistService';
 import { MOCK_NOTICES, MOCK_STATS } from './constants';
@@ -33,18 +33,30 @@ import { NoticesPage } from './pages/NoticesPage';
 
 type AuthView = 'login' | 'register' | null;
 
+const DEFAULT_GENRES = ['K-Pop', 'Pop', 'Rock', 'Hip-Hop', 'Jazz', 'Electronic'];
+const GENRE_BUTTON_COUNT = 12;
+
 function App() {
   const [user, setUser] = useState<User | null>(null);
   const [authView, setAuthView] = useState<AuthView>('login');
   const [view, setView] = useState<AppView>('home');
 
   const [songs, setSongs] = useState<Music[]>([]);
+  const [songsCursor, setSongsCursor] = useState<string | null>(null);
   const [playlists, setPlaylists] = useState<Playlist[]>([]);
   const [playlistCount, setPlaylistCount] = useState(0);
 
   const [searchQuery, setSearchQuery] = useState('');
   const [searchResults, setSearchResults] = useState<Music[]>([]);
   const [isSearching, setIsSearching] = useState(false);
+  const [suggestions, setSuggestions] = useState<MusicSuggestion[]>([]);
+  // 장르 검색 결과의 다음 페이지 (일반 검색은 페이지 없음)
+  const [searchGenre, setSearchGenre] = useState<string | null>(null);
+  const [searchCursor, setSearchCursor] = useState<string | null>(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
+  // 새 검색을 시작하면 증가 → 이전 검색의 더 보기 응답은 버림
+  const searchSeqRef = useRef(0);
+  const [genres, setGenres] = useState<GenreFacet[]>([]);
 
   const [cart, setCart] = useState<Music[]>([]);
   const [isCartOpen, setIsCartOpen] = useState(false);
@@ -168,9 +180,13 @@ function App() {
   useEffect(() => {
     const init = async () => {
       try {
-        const response = await getAllMusic();
+        const [response, genreRes] = await Promise.all([getAllMusic(), getGenreFacets()]);
         if (response.success && response.data) {
           setSongs(response.data);
+          setSongsCursor(response.next_cursor ?? null);
+        }
+        if (genreRes.success && genreRes.data) {
+          setGenres(genreRes.data);
         }
       } catch (e) {
         console.error(e);
@@ -179,12 +195,36 @@ function App() {
     init();
   }, []);
 
+  // ⌨️ 검색어 자동완성 (입력이 멈추고 200ms 뒤 조회, #장르 검색은 제외)
+  useEffect(() => {
+    const keyword = searchQuery.trim();
+    if (!keyword || keyword.startsWith('#')) {
+      setSuggestions([]);
+      return;
+    }
+
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      const res = await suggestMusic(keyword, 8);
+      if (!cancelled) {
+        setSuggestions(res.success && res.data ? res.data : []);
+      }
+    }, 200);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchQuery]);
+
   // 백엔드 API로 음악 검색
   const handleSearch = async (e: React.FormEvent) => {
     e.preventDefault();
     if (!searchQuery.trim()) return;
 
     setIsSearching(true);
+    setSearchGenre(null);
+    setSearchCursor(null);
+    searchSeqRef.current += 1;
 
     try {
       // ✅ 1. #으로 시작하면 "장르 검색"
@@ -237,6 +277,8 @@ function App() {
 
         if (res.success && res.data) {
           setSearchResults(res.data);
+          setSearchGenre(genre);
+          setSearchCursor(res.next_cursor ?? null);
         } else {
           setSearchResults([]);
         }
@@ -263,11 +305,16 @@ function App() {
   const handleSearchByGenre = async (genre: string) => {
     setSearchQuery(genre);
     setIsSearching(true);
+    setSearchGenre(null);
+    setSearchCursor(null);
+    searchSeqRef.current += 1;
 
     try {
       const res = await getMusicByGenre(genre);
       if (res.success && res.data) {
         setSearchResults(res.data);
+        setSearchGenre(genre);
+        setSearchCursor(res.next_cursor ?? null);
       } else {
         setSearchResults([]);
       }
@@ -279,10 +326,49 @@ function App() {
     }
   };
 
+  // 📄 더 보기 → next_cursor로 다음 페이지 이어 붙이기
+  const handleLoadMoreSongs = async () => {
+    if (!songsCursor || isLoadingMore) return;
+    setIsLoadingMore(true);
+    try {
+      const res = await getAllMusic(songsCursor);
+      if (res.success && res.data) {
+        setSongs(prev => [...prev, ...res.data!]);
+        setSongsCursor(res.next_cursor ?? null);
+      }
+    } catch (err) {
+      console.error('음악 목록 추가 조회 실패:', err);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
+  const handleLoadMoreResults = async () => {
+    if (!searchGenre || !searchCursor || isLoadingMore) return;
+    const seq = searchSeqRef.current;
+    setIsLoadingMore(true);
+    try {
+      const res = await getMusicByGenre(searchGenre, searchCursor);
+      if (seq === searchSeqRef.current && res.success && res.data) {
+        setSearchResults(prev => [...prev, ...res.data!]);
+        setSearchCursor(res.next_cursor ?? null);
+      }
+    } catch (err) {
+      console.error('장르 검색 추가 조회 실패:', err);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
 
 
 
 
+  // 🏷️ 장르 버튼: /music/genres 곡 수 많은 순 (조회 전/실패 시 기본 장르)
+  const genreButtons: { name: string; track_count?: number }[] = genres.length > 0
+    ? genres.filter(g => g.track_count > 0).slice(0, GENRE_BUTTON_COUNT)
+    : DEFAULT_GENRES.map(name => ({ name }));
+
   const toggleCart = (song: Music) => {
     const isInCart = cart.some(c => c.spotify_url === song.spotify_url);
     if (isInCart) {
@@ -680,7 +766,7 @@ function App() {
                   </button>
                 </div>
                 <div className="grid grid-cols-2 md:grid-cols-3 lg:grid-cols-5 gap-6">
-                  {songs.slice(0, showAllTracks ? 50 : 10).map((song, i) => (
+                  {(showAllTracks ? songs : songs.slice(0, 10)).map((song, i) => (
                     <div key={i} className="bg-zinc-900/40 p-4 rounded-xl border border-zinc-800/50 hover:bg-zinc-800/60 hover:border-zinc-700 transition-all group relative">
                       <div className="relative mb-3 aspect-square rounded-lg overflow-hidden">
                         <img src={song.album_image_url} className="w-full h-full object-cover group-hover:scale-110 transition-transform duration-500" />
@@ -708,6 +794,17 @@ function App() {
                     </div>
                   ))}
                 </div>
+                {showAllTracks && songsCursor && (
+                  <div className="flex justify-center mt-6">
+                    <button
+                      onClick={handleLoadMoreSongs}
+                      disabled={isLoadingMore}
+                      className="px-6 py-2 rounded-full text-sm font-medium bg-zinc-800 text-zinc-300 hover:bg-zinc-700 hover:text-white transition-colors disabled:opacity-50"
+                    >
+                      {isLoadingMore ? '불러오는 중...' : '더 보기'}
+                    </button>
+                  </div>
+                )}
               </section>
             </div>
           )}
@@ -724,20 +821,34 @@ function App() {
                     className="w-full bg-zinc-900 border border-zinc-800 rounded-full py-4 pl-12 pr-4 text-lg focus:outline-none focus:border-primary focus:ring-1 focus:ring-primary/30 transition-all shadow-xl"
                     value={searchQuery}
                     onChange={(e) => setSearchQuery(e.target.value)}
+                    list="music-suggestions"
+                    autoComplete="off"
                   />
+                  <datalist id="music-suggestions">
+                    {suggestions.map((s) => (
+                      <option
+                        key={`${s.text}-${s.type}`}
+                        value={s.text}
+                        label={s.types.map((t) => (t === 'artist' ? '아티스트' : '곡')).join(' · ')}
+                      />
+                    ))}
+                  </datalist>
                   {isSearching && <Loader2 className="absolute right-4 top-1/2 -translate-y-1/2 w-5 h-5 text-primary animate-spin" />}
                 </form>
 
                 {/* Genre Buttons */}
                 <div className="flex flex-wrap gap-2 justify-center">
-                  {['K-Pop', 'Pop', 'Rock', 'Hip-Hop', 'Jazz', 'Electronic'].map((genre) => (
+                  {genreButtons.map((genre) => (
                     <button
-                      key={genre}
+                      key={genre.name}
                       type="button"
-                      onClick={() => handleSearchByGenre(genre)}
+                      onClick={() => handleSearchByGenre(genre.name)}
                       className="px-4 py-1.5 rounded-full text-sm bg-zinc-800 text-zinc-300 hover:bg-primary hover:text-black transition-colors"
                     >
-                      #{genre}
+                      #{genre.name}
+                      {genre.track_count !== undefined && (
+                        <span className="ml-1 text-xs opacity-60">{genre.track_count.toLocaleString()}</span>
+                      )}
                     </button>
                   ))}
                 </div>
@@ -775,6 +886,17 @@ function App() {
                       </div>
                     ))}
                   </div>
+                  {searchGenre && searchCursor && (
+                    <div className="flex justify-center">
+                      <button
+                        onClick={handleLoadMoreResults}
+                        disabled={isLoadingMore}
+                        className="px-6 py-2 rounded-full text-sm font-medium bg-zinc-800 text-zinc-300 hover:bg-zinc-700 hover:text-white transition-colors disabled:opacity-50"
+                      >
+                        {isLoadingMore ? '불러오는 중...' : '더 보기'}
+                      </button>
+                    </div>
+                  )}
                 </div>
               ) : !isSearching && searchQuery && (
                 <div className="py-20 text-center text-zinc-500">
@@ -47,30 +47,93 @@ export const searchMusic = async (
   }
 };
 
-// 📚 전체 음악 조회
-export const getAllMusic = async (): Promise<ApiResponse<Music[]>> => {
+// ⌨️ 검색어 자동완성 (서버 메모리 색인, Spotify 호출 없음)
+export interface MusicSuggestion {
+  text: string;
+  // 곡 이름이면서 아티스트 이름이면 'artist' (types에 둘 다)
+  type: 'track' | 'artist';
+  types: ('track' | 'artist')[];
+  popularity: number;
+  music_no: number;
+}
+
+export const suggestMusic = async (
+  keyword: string,
+  limit = 10
+): Promise<ApiResponse<MusicSuggestion[]>> => {
   try {
-    const res = await authFetch('/music');
+    const res = await authFetch(
+      `/music/suggest?q=${encodeURIComponent(keyword)}&limit=${limit}`
+    );
     return await res.json();
+  } catch (e) {
+    return { success: false, message: '자동완성 조회 실패' };
+  }
+};
+
+// 📄 GET /music 은 keyset 페이지 응답 → 다음 페이지는 next_cursor를 넘겨서 조회 (끝이면 null)
+export interface MusicPage extends ApiResponse<Music[]> {
+  size?: number;
+  next_cursor?: string | null;
+}
+
+// 백엔드 MUSIC_LIST_MAX_SIZE와 같은 값
+const MUSIC_PAGE_SIZE = 100;
+
+const fetchMusicPage = async (
+  params: Record<string, string> = {},
+  cursor?: string | null
+): Promise<MusicPage> => {
+  const query = new URLSearchParams({ ...params, size: String(MUSIC_PAGE_SIZE) });
+  if (cursor) {
+    query.set('cursor', cursor);
+  }
+  const res = await authFetch(`/music?${query.toString()}`);
+  return await res.json();
+};
+
+// 📚 전체 음악 조회 (한 페이지씩)
+export const getAllMusic = async (
+  cursor?: string | null
+): Promise<MusicPage> => {
+  try {
+    return await fetchMusicPage({}, cursor);
   } catch (e) {
     return { success: false, message: '음악 목록 조회 실패' };
   }
 };
 
-// 🔥 장르 검색 (DB)
+// 🔥 장르 검색 (DB, 한 페이지씩)
 export const getMusicByGenre = async (
-  genre: string
-): Promise<ApiResponse<Music[]>> => {
+  genre: string,
+  cursor?: string | null
+): Promise<MusicPage> => {
   try {
-    const res = await authFetch(
-      `/music?category=genre&value=${encodeURIComponent(genre)}`
-    );
-    return await res.json();
+    return await fetchMusicPage({ category: 'genre', value: genre }, cursor);
   } catch (e) {
     return { success: false, message: '장르 검색 실패' };
   }
 };
 
+// 🗂️ 장르별 곡 수 (+ 장르별 인기곡 top개)
+export interface GenreFacet {
+  genre_no: number;
+  name: string;
+  track_count: number;
+  top?: Music[];
+}
+
+export const getGenreFacets = async (
+  top = 0
+): Promise<ApiResponse<GenreFacet[]>> => {
+  try {
+    const res = await authFetch(`/music/genres?top=${top}`);
+    return await res.json();
+  } catch (e) {
+    return { success: false, message: '장르 목록 조회 실패' };
+  }
+};
+
 // 🌍 Top 50
 export const getTop50Music = async (): Promise<ApiResponse<Music[]>> => {
   try {